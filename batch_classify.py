@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Batch HS code classification for bulk invoice line items
+Reads product descriptions from CSV or JSONL, scores them in vectorized
+chunks against hs-codes-database.json and streams the top-k codes out.
+Input is read and written one chunk at a time, so memory stays bounded by
+the chunk size and the number of chunks in flight, not by the file size.
+With --server the rows are classified by a running server.js instead
+(local search, then its micro-batched LLM fallback) through hs_client, and
+with --mode vector by the offline hashed n-gram vectors of vector_search
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from hs_client import classify_remote, response_matches
+from hs_search import BM25Index
+from query_cache import QueryCache, normalize_query, read_database_version
+from vector_search import VectorIndex
+
+INDEX_TYPES = {"bm25": BM25Index, "vector": VectorIndex}
+
+_worker_index = None
+
+def _init_worker(database_path, mode="bm25"):
+    """Load the search index once per worker process"""
+    global _worker_index
+    _worker_index = INDEX_TYPES[mode].load(database_path)
+
+def _classify_chunk(descriptions, k):
+    return _worker_index.search_batch(descriptions, k)
+
+def read_descriptions(path, input_format, column, id_column="id"):
+    """Yield (row id, description) from a CSV or JSONL file ("-" for stdin)"""
+    f = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8', newline='')
+    try:
+        if input_format == "jsonl":
+            for line_num, line in enumerate(f, 1):
+                if line.strip():
+                    row = json.loads(line)
+                    yield row.get(id_column, line_num), str(row.get(column, ""))
+        else:
+            reader = csv.DictReader(f)
+            if column not in (reader.fieldnames or []):
+                raise ValueError(f"CSV has no '{column}' column (found: {reader.fieldnames})")
+            for row_num, row in enumerate(reader, 1):
+                yield row.get(id_column, row_num), row[column] or ""
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def iter_chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _cache_lookup(chunk, cache):
+    """({position: cached results}, descriptions that still need scoring, {position: pending index})
+
+    Descriptions repeated within the chunk are scored once: every position
+    of a normalized query maps to the same pending index.
+    """
+    if cache is None:
+        return {}, [description for _, description in chunk], {}
+    cached = {}
+    pending = []
+    slots = {}
+    first_slot = {}
+    for position, (_, description) in enumerate(chunk):
+        key = normalize_query(description)
+        if key in first_slot:
+            slots[position] = first_slot[key]
+            continue
+        results = cache.get(description)
+        if results is None:
+            slots[position] = first_slot[key] = len(pending)
+            pending.append(description)
+        else:
+            cached[position] = results
+    return cached, pending, slots
+
+def _join_chunk(chunk, cached, scored, slots, cache):
+    """Yield (row id, description, results) for a chunk, caching new results"""
+    if cache is None:
+        scored = iter(scored)
+        for row_id, description in chunk:
+            yield row_id, description, next(scored)
+        return
+    stored = set()
+    for position, (row_id, description) in enumerate(chunk):
+        results = cached.get(position)
+        if results is None:
+            slot = slots[position]
+            results = scored[slot]
+            if slot in stored:
+                # A repeat of a query scored for this chunk: served from the cache
+                results = cache.get(description, results)
+            else:
+                stored.add(slot)
+                cache.put(description, results)
+        yield row_id, description, results
+
+def classify_stream(rows, database_path, k=3, chunk_size=256, workers=1, cache=None, mode="bm25"):
+    """Yield (row id, description, results) in input order.
+
+    With workers > 1 chunks are scored in a process pool, keeping at most
+    two chunks per worker in flight. Descriptions found in the optional
+    QueryCache, or repeated within a chunk, are not scored again.
+    """
+    chunks = iter_chunks(rows, chunk_size)
+
+    if workers <= 1:
+        _init_worker(database_path, mode)
+        for chunk in chunks:
+            cached, pending, slots = _cache_lookup(chunk, cache)
+            yield from _join_chunk(chunk, cached, _classify_chunk(pending, k) if pending else [],
+                                   slots, cache)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(database_path, mode)) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            cached, pending, slots = _cache_lookup(chunk, cache)
+            future = executor.submit(_classify_chunk, pending, k) if pending else None
+            in_flight.append((chunk, cached, future, slots))
+            if len(in_flight) >= workers * 2:
+                done_chunk, done_cached, done_future, done_slots = in_flight.popleft()
+                yield from _join_chunk(done_chunk, done_cached,
+                                       done_future.result() if done_future else [], done_slots, cache)
+        while in_flight:
+            done_chunk, done_cached, done_future, done_slots = in_flight.popleft()
+            yield from _join_chunk(done_chunk, done_cached,
+                                   done_future.result() if done_future else [], done_slots, cache)
+
+def classify_via_server(rows, base_url, k=3, concurrency=16):
+    """Yield (row id, description, results) in input order from server.js"""
+    failed = 0
+    for row_id, description, (status, _, response) in classify_remote(rows, base_url, concurrency):
+        if status != 200:
+            failed += 1
+        yield row_id, description, response_matches(response)[:k] if status == 200 else []
+    if failed:
+        print(f"⚠️ {failed} descriptions failed on the server", file=sys.stderr)
+
+def write_results(results, path, output_format, k):
+    """Stream classified rows to CSV or JSONL ("-" for stdout); returns the row count"""
+    f = sys.stdout if path == "-" else open(path, 'w', encoding='utf-8', newline='')
+    count = 0
+    try:
+        if output_format == "csv":
+            writer = csv.writer(f)
+            header = ["id", "description"]
+            for rank in range(1, k + 1):
+                header += [f"code_{rank}", f"score_{rank}"]
+            writer.writerow(header)
+            for row_id, description, row_results in results:
+                row = [row_id, description]
+                for result in row_results:
+                    row += [result["code"], result["score"]]
+                writer.writerow(row)
+                count += 1
+        else:
+            for row_id, description, row_results in results:
+                f.write(json.dumps({
+                    "id": row_id,
+                    "description": description,
+                    "matches": [{"code": r["code"], "score": r["score"]} for r in row_results]
+                }, ensure_ascii=False) + "\n")
+                count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return count
+
+def _format_for(path, explicit):
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify product descriptions in bulk")
+    parser.add_argument("input", help="CSV or JSONL file of descriptions ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file, CSV or JSONL (default: stdout)")
+    parser.add_argument("--database", default="hs-codes-database.json", help="path to the JSON database")
+    parser.add_argument("--column", default="description", help="CSV column / JSONL field to classify")
+    parser.add_argument("--id-column", default="id", help="CSV column / JSONL field identifying a row "
+                        "(default: id, falling back to the row number)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("-k", type=int, default=3, help="codes per description (default: 3)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="descriptions scored per batch")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="repeated descriptions served from an LRU cache of this size (0: off)")
+    parser.add_argument("--mode", choices=sorted(INDEX_TYPES), default="bm25",
+                        help="local index: BM25 keywords or hashed n-gram vectors (default: bm25)")
+    parser.add_argument("--server", metavar="URL",
+                        help="classify with a running server.js (e.g. http://127.0.0.1:3000) "
+                        "instead of the local BM25 index")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="requests in flight with --server (default: 16)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = read_descriptions(args.input, _format_for(args.input, args.input_format),
+                              args.column, args.id_column)
+    cache = None
+    if args.server:
+        results = classify_via_server(rows, args.server.rstrip('/'), args.k, max(1, args.concurrency))
+    else:
+        if args.cache_size > 0:
+            cache = QueryCache(args.cache_size, ttl=float("inf"), version=read_database_version(args.database))
+        results = classify_stream(rows, args.database, args.k, max(1, args.chunk_size), args.workers,
+                                  cache, args.mode)
+    count = write_results(results, args.output, _format_for(args.output, args.output_format), args.k)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Classified {count} descriptions in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:,.0f}/sec)", file=sys.stderr)
+    if cache:
+        stats = cache.stats()
+        print(f"♻️  Cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency of micro-batched LLM classification
+Spawns server.js against the local LLM stub once per batch window (0 =
+batching off) and sends distinct low-confidence descriptions through the
+asyncio client, reporting requests/sec, latency percentiles, upstream LLM
+calls and prompt volume, and the server's mean batch size
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+import urllib.request
+from bench_suite import latency_summary, spawn_server, wait_for_server
+from hs_client import classify_remote
+from llm_stub_server import StubSettings, start_stub_server
+
+def llm_bound_queries(codes, count, seed=7):
+    """One tariff word plus a nonsense word: a weak local match that goes to the LLM"""
+    rng = random.Random(seed)
+    words = sorted({word for item in codes
+                    for word in re.findall(r'[a-z]{5,}', item["description"].lower())})
+    return [f"{rng.choice(words)} qzv{i}xk" for i in range(count)]
+
+def mean_batch_size(base_url):
+    """Mean of hs_llm_batch_size from the server's /metrics (None when unbatched)"""
+    with urllib.request.urlopen(f"{base_url}/metrics", timeout=5) as response:
+        text = response.read().decode('utf-8')
+    total = re.search(r'^hs_llm_batch_size_sum (\S+)$', text, re.MULTILINE)
+    count = re.search(r'^hs_llm_batch_size_count (\S+)$', text, re.MULTILINE)
+    if not total or not count or float(count.group(1)) == 0:
+        return None
+    return round(float(total.group(1)) / float(count.group(1)), 2)
+
+def bench_window(args, window_ms, queries):
+    settings = StubSettings(args.llm_delay_ms, args.llm_per_kchar_ms)
+    stub, llm_url = start_stub_server(settings=settings)
+    process = spawn_server(args.port, llm_url, {
+        "LLM_BATCH_WINDOW_MS": str(window_ms),
+        "LLM_BATCH_MAX_ITEMS": str(args.max_items),
+        "LLM_MAX_CONCURRENCY": str(args.llm_concurrency)
+    })
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        if not wait_for_server(base_url, args.startup_timeout):
+            raise SystemExit(f"❌ server.js did not become ready at {base_url}")
+        start = time.perf_counter()
+        results = list(classify_remote(((i, query) for i, query in enumerate(queries)),
+                                       base_url, args.concurrency))
+        elapsed = time.perf_counter() - start
+        latencies = [latency for _, _, (_, latency, _) in results]
+        return {
+            "window_ms": window_ms,
+            "requests": len(queries),
+            "errors": sum(1 for _, _, (status, _, _) in results if status != 200),
+            "requests_per_sec": round(len(queries) / elapsed, 2),
+            **latency_summary(latencies),
+            "llm_calls": settings.requests,
+            "llm_prompt_chars": settings.prompt_chars,
+            "mean_batch_size": mean_batch_size(base_url)
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        stub.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched LLM classification")
+    parser.add_argument("--database", default="hs-codes-database.json")
+    parser.add_argument("--windows", default="0,5,20", help="comma-separated batch windows in ms")
+    parser.add_argument("--max-items", type=int, default=8, help="LLM_BATCH_MAX_ITEMS")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32, help="client requests in flight")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument("--llm-delay-ms", type=float, default=300.0)
+    parser.add_argument("--llm-per-kchar-ms", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=3102)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        queries = llm_bound_queries(json.load(f)["codes"], args.requests)
+
+    print(f"  {'window':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'llm calls':>11}{'prompt kB':>11}{'batch':>7}{'errors':>8}")
+    results = []
+    for window_ms in (int(window) for window in args.windows.split(',')):
+        result = bench_window(args, window_ms, queries)
+        results.append(result)
+        batch = result["mean_batch_size"]
+        print(f"  {window_ms:>6}ms{result['requests_per_sec']:>10.1f}{result.get('p50_ms', 0):>10.1f}"
+              f"{result.get('p95_ms', 0):>10.1f}{result.get('p99_ms', 0):>10.1f}"
+              f"{result['llm_calls']:>11}{result['llm_prompt_chars'] / 1000:>11.1f}"
+              f"{batch if batch is not None else '-':>7}{result['errors']:>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
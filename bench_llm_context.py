@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-tariff LLM prompts vs candidate-pruned prompts
+Builds the server's classification prompt both ways for a query mix drawn
+from hs-codes-database.json, sends each to the local LLM stub and reports
+prompt size, end-to-end latency and how often the shortlist still contains
+the expected code
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import urllib.request
+from hs_search import BM25Index, format_tariff_context, shortlist
+from llm_stub_server import StubSettings, start_stub_server
+
+PROMPT_TEMPLATE = """You are an expert customs classifier with 50+ years of experience.
+
+PRODUCT: "{description}"
+
+HS CODES TO SEARCH FROM:
+{context}
+
+TASK (STRICT RULES):
+1. Find the BEST matching 8-digit HS code
+2. Provide 3 reasons (reference the tariff code descriptions)
+3. List 2 related codes
+4. Rate confidence (0-100)
+
+FORMAT (ONLY this JSON, nothing else):
+{{"hsCode": "12345678", "description": "...", "confidence": 85, "reasons": [], "relatedCodes": []}}"""
+
+def build_prompt(description, context):
+    return PROMPT_TEMPLATE.format(description=description, context=context)
+
+def post_completion(base_url, prompt, model="llama-3.3-70b-versatile"):
+    body = json.dumps({"model": model, "messages": [{"role": "user", "content": prompt}],
+                       "temperature": 0.2, "max_tokens": 1200}).encode('utf-8')
+    request = urllib.request.Request(f"{base_url}/openai/v1/chat/completions", data=body,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+def query_mix(codes, count, seed=7):
+    """(query, expected code) pairs built from each record's keywords"""
+    rng = random.Random(seed)
+    pairs = []
+    for item in rng.sample(codes, min(count, len(codes))):
+        words = item.get("keywords") or item["description"].split()[:2]
+        pairs.append((' '.join(rng.sample(words, min(2, len(words)))), item["code"]))
+    return pairs
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_mode(name, queries, make_context, base_url):
+    prompt_chars = []
+    latencies = []
+    for query, _ in queries:
+        start = time.perf_counter()
+        prompt = build_prompt(query, make_context(query))
+        post_completion(base_url, prompt)
+        latencies.append((time.perf_counter() - start) * 1000)
+        prompt_chars.append(len(prompt))
+    return {
+        "mode": name,
+        "queries": len(queries),
+        "prompt_chars_mean": round(statistics.mean(prompt_chars)),
+        "prompt_tokens_est_mean": round(statistics.mean(prompt_chars) / 4),
+        "latency_ms_p50": round(percentile(latencies, 50), 2),
+        "latency_ms_p95": round(percentile(latencies, 95), 2),
+        "latency_ms_mean": round(statistics.mean(latencies), 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full-tariff and shortlisted LLM prompts")
+    parser.add_argument("--database", default="hs-codes-database.json")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--shortlist", type=int, default=20, help="top-N codes before siblings")
+    parser.add_argument("--base-delay-ms", type=float, default=20.0, help="stub delay per request")
+    parser.add_argument("--per-kchar-ms", type=float, default=2.0, help="stub delay per 1k prompt chars")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    index = BM25Index.load(args.database)
+    queries = query_mix(index.codes, args.queries)
+    full_context = format_tariff_context(index.codes)
+
+    server, base_url = start_stub_server(settings=StubSettings(args.base_delay_ms, args.per_kchar_ms))
+    try:
+        full = run_mode("full_tariff", queries, lambda query: full_context, base_url)
+        pruned = run_mode("shortlist", queries,
+                          lambda query: format_tariff_context(shortlist(index, query, args.shortlist)),
+                          base_url)
+    finally:
+        server.shutdown()
+
+    recall = sum(1 for query, code in queries
+                 if code in {item["code"] for item in shortlist(index, query, args.shortlist)})
+    pruned["expected_code_in_shortlist"] = round(recall / len(queries), 4)
+
+    print("=" * 70)
+    print(f"LLM CONTEXT BENCHMARK ({len(index.codes)} codes, {len(queries)} queries)")
+    print("=" * 70)
+    for result in (full, pruned):
+        print(f"  {result['mode']:<12} prompt {result['prompt_chars_mean']:>8,} chars "
+              f"(~{result['prompt_tokens_est_mean']:,} tokens)  "
+              f"p50 {result['latency_ms_p50']:>8.1f} ms  p95 {result['latency_ms_p95']:>8.1f} ms")
+    print(f"📉 Prompt size reduced {full['prompt_chars_mean'] / pruned['prompt_chars_mean']:.1f}x, "
+          f"p50 latency {full['latency_ms_p50'] / pruned['latency_ms_p50']:.1f}x faster")
+    print(f"🎯 Expected code in shortlist: {pruned['expected_code_in_shortlist']:.0%}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"codes": len(index.codes), "results": [full, pruned]}, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
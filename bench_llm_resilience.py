@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Checks of the server's upstream LLM guards against the local LLM stub
+Spawns server.js pointed at llm_stub_server.py and reports, per scenario, how
+many Groq calls reached the stub:
+  coalescing  - identical low-confidence queries sent at once share one call
+  limiter     - distinct queries never exceed LLM_MAX_CONCURRENCY in flight
+  breaker     - with the primary model failing, it stops being tried after
+                LLM_BREAKER_FAILURES failures and requests go to the backup
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bench_suite import _get_json, post_search, spawn_server, wait_for_server
+from llm_stub_server import StubSettings, start_stub_server
+
+PRIMARY_MODEL = "llama-3.3-70b-versatile"
+
+def low_confidence_query(i):
+    """A description with no tariff vocabulary, so the server escalates to the LLM"""
+    return f"zorblax quenterwidget {i}"
+
+def run_scenario(args, settings, extra_env, queries, concurrency):
+    """Send queries through a fresh server; (statuses, wall ms, stub stats, health)"""
+    stub, llm_url = start_stub_server(settings=settings)
+    env = {"LLM_MAX_CONCURRENCY": str(args.max_concurrency),
+           "LLM_BREAKER_FAILURES": str(args.breaker_failures), **extra_env}
+    process = spawn_server(args.port, llm_url, env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        if not wait_for_server(base_url, args.startup_timeout):
+            raise SystemExit(f"❌ server.js did not become ready at {base_url}")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda query: post_search(base_url, query), queries))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        statuses = {}
+        for status, _, _ in results:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        return statuses, elapsed_ms, _get_json(f"{llm_url}/stats"), _get_json(f"{base_url}/api/health")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        stub.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise LLM coalescing, limiting and circuit breaking")
+    parser.add_argument("--port", type=int, default=3101)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--llm-delay-ms", type=float, default=300.0)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--breaker-failures", type=int, default=3)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    report = {}
+
+    statuses, elapsed_ms, stats, _ = run_scenario(
+        args, StubSettings(args.llm_delay_ms, 0.0), {},
+        [low_confidence_query(0)] * args.requests, args.requests)
+    report["coalescing"] = {"requests": args.requests, "statuses": statuses,
+                            "llm_calls": stats["requests"], "wall_ms": round(elapsed_ms, 1)}
+    print(f"🔗 coalescing: {args.requests} identical requests -> {stats['requests']} LLM call(s) "
+          f"in {elapsed_ms:,.0f} ms, statuses {statuses}")
+
+    queries = [low_confidence_query(i) for i in range(args.requests)]
+    statuses, elapsed_ms, stats, _ = run_scenario(
+        args, StubSettings(args.llm_delay_ms, 0.0), {}, queries, args.requests)
+    # With a fixed stub delay, the wall time is bounded below by the number of waves
+    waves = -(-args.requests // args.max_concurrency)
+    report["limiter"] = {"requests": args.requests, "statuses": statuses,
+                         "llm_calls": stats["requests"], "wall_ms": round(elapsed_ms, 1),
+                         "min_wall_ms": waves * args.llm_delay_ms}
+    print(f"🚦 limiter: {args.requests} distinct requests, {stats['requests']} LLM calls in "
+          f"{elapsed_ms:,.0f} ms (>= {waves} waves of {args.llm_delay_ms:.0f} ms at "
+          f"concurrency {args.max_concurrency}), statuses {statuses}")
+
+    statuses, elapsed_ms, stats, health = run_scenario(
+        args, StubSettings(args.llm_delay_ms / 10, 0.0, [PRIMARY_MODEL]), {}, queries, 1)
+    primary_calls = stats["models"].get(PRIMARY_MODEL, 0)
+    report["breaker"] = {"requests": args.requests, "statuses": statuses,
+                         "models": stats["models"], "breakers": health.get("llm", {}).get("breakers")}
+    print(f"🔌 breaker: primary failing, {args.requests} sequential requests -> "
+          f"{primary_calls} primary call(s) (SDK retries included), "
+          f"per model {stats['models']}, statuses {statuses}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick phrase matching vs per-keyword substring tests
+Times, per query, (a) the server's current scorer loop of `word in
+description` tests over every code, (b) finding the database's keyword
+phrases with one `in` test per phrase and (c) the single-pass automaton of
+phrase_matcher.py, checks that (b) and (c) agree, and reports how often the
+ranking puts a code carrying a multi-word query phrase first, with and
+without the phrase features
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from bench_llm_context import percentile
+from bench_scaling import linear_scan
+from phrase_matcher import PhraseMatcher, build_phrase_table, normalize_text, phrase_weight
+
+def per_keyword_features(phrase_table, query):
+    """Phrase features found with one substring test per phrase"""
+    text = normalize_text(query)
+    scores = {}
+    for phrase, code_ids in phrase_table["phrases"].items():
+        if f" {phrase} " in text:
+            for code_id in code_ids:
+                scores[code_id] = scores.get(code_id, 0) + phrase_weight(phrase)
+    return scores
+
+def ranked_with_phrases(codes, matcher, query):
+    """linear_scan scores plus phrase features, best first"""
+    features = matcher.features(query)
+    query_lower = query.lower()
+    keywords = query_lower.split()
+    scored = []
+    for code_id, item in enumerate(codes):
+        description = item["description"].lower()
+        score = features.get(code_id, 0) + (100 if query_lower in description else 0)
+        score += 10 * sum(1 for keyword in keywords if keyword in description)
+        scored.append((score - len(item["description"]) / 100, item["code"]))
+    scored.sort(reverse=True)
+    return scored[:10]
+
+def phrase_queries(codes, phrase_table, count, seed):
+    """(query, codes carrying its phrase): a multi-word keyword plus a filler word"""
+    rng = random.Random(seed)
+    phrases = [phrase for phrase in phrase_table["phrases"] if " " in phrase]
+    fillers = ["bulk", "imported", "packed", "fresh", "premium", "grade"]
+    queries = []
+    for _ in range(count):
+        phrase = rng.choice(phrases)
+        expected = {codes[code_id]["code"] for code_id in phrase_table["phrases"][phrase]}
+        queries.append((f"{rng.choice(fillers)} {phrase}", expected))
+    return queries
+
+def time_per_query(func, queries, repeat):
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            func(query)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return {"p50_us": round(percentile(latencies, 50), 2),
+            "p95_us": round(percentile(latencies, 95), 2),
+            "mean_us": round(statistics.mean(latencies), 2)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the keyword phrase automaton")
+    parser.add_argument("--database", default="hs-codes-database.json")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        codes = json.load(f)["codes"]
+    phrase_table = build_phrase_table(codes)
+    start = time.perf_counter()
+    matcher = PhraseMatcher(phrase_table)
+    build_ms = (time.perf_counter() - start) * 1000
+    multi_word = sum(1 for phrase in phrase_table["phrases"] if " " in phrase)
+    print(f"🔧 {len(matcher.phrases)} keyword phrases ({multi_word} multi-word), "
+          f"{len(matcher.goto)} automaton states, built in {build_ms:.1f} ms")
+
+    labelled = phrase_queries(codes, phrase_table, args.queries, args.seed)
+    queries = [query for query, _ in labelled]
+
+    disagreements = sum(1 for query in queries
+                        if per_keyword_features(phrase_table, query) != matcher.features(query))
+    timings = {
+        "scorer_includes_loop": time_per_query(lambda query: linear_scan(codes, query), queries, args.repeat),
+        "per_keyword_includes": time_per_query(lambda query: per_keyword_features(phrase_table, query),
+                                               queries, args.repeat),
+        "aho_corasick": time_per_query(matcher.features, queries, args.repeat)
+    }
+    print(f"  {'matcher':<24}{'p50 us':>10}{'p95 us':>10}{'mean us':>10}")
+    for name, timing in timings.items():
+        print(f"  {name:<24}{timing['p50_us']:>10.2f}{timing['p95_us']:>10.2f}{timing['mean_us']:>10.2f}")
+    print(f"{'✅' if disagreements == 0 else '❌'} Automaton and per-keyword hits differ on "
+          f"{disagreements}/{len(queries)} queries")
+
+    top1_without = sum(1 for query, expected in labelled if linear_scan(codes, query)[0][1] in expected)
+    top1_with = sum(1 for query, expected in labelled
+                    if ranked_with_phrases(codes, matcher, query)[0][1] in expected)
+    print(f"🎯 Top-1 carries the query phrase: {top1_without / len(labelled):.1%} without phrase "
+          f"features, {top1_with / len(labelled):.1%} with")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"phrases": len(matcher.phrases), "states": len(matcher.goto),
+                       "build_ms": round(build_ms, 2), "timings": timings,
+                       "disagreements": disagreements,
+                       "top1_without_phrases": top1_without / len(labelled),
+                       "top1_with_phrases": top1_with / len(labelled)}, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark over synthetic 1k/10k/100k-code databases
+For every size (generated with synthetic_database.py when missing) and every
+search strategy, reports load time, Python memory retained after loading
+(tracemalloc) and per-query latency, so the scaling curve is visible before
+the full tariff is loaded in production
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from bench_llm_context import percentile
+from bench_suite import realistic_queries
+from binary_database import BinaryDatabase
+from fuzzy_match import FuzzyMatcher, resolve
+from generate_hs_database import binary_path_for
+from hs_search import BM25Index
+from search_index import InvertedIndex, index_path_for
+from synthetic_database import database_path_for, write_synthetic_database
+
+def linear_scan(codes, query):
+    """The server's original ranking: substring tests against every description"""
+    query = query.lower()
+    keywords = query.split()
+    scored = []
+    for item in codes:
+        description = item["description"].lower()
+        score = 100 if query in description else 0
+        score += 10 * sum(1 for keyword in keywords if keyword in description)
+        scored.append((score - len(item["description"]) / 100, item["code"]))
+    scored.sort(reverse=True)
+    return scored[:10]
+
+def _load_codes(database_path):
+    with open(database_path, 'r', encoding='utf-8') as f:
+        return json.load(f)["codes"]
+
+def strategies(database_path):
+    """name -> (load() returning state, query(state, query text))"""
+    index_path = index_path_for(database_path)
+    return {
+        "linear_scan": (lambda: _load_codes(database_path), linear_scan),
+        "inverted_index": (lambda: InvertedIndex.load(index_path),
+                           lambda index, query: index.lookup(query)[:10]),
+        "bm25": (lambda: BM25Index.load(database_path),
+                 lambda index, query: index.search(query, 10)),
+        "fuzzy_bm25": (lambda: (FuzzyMatcher.load(index_path), BM25Index.load(database_path)),
+                       lambda state, query: resolve(state[0], state[1], query, 10)),
+        "binary_exact": (lambda: BinaryDatabase(binary_path_for(database_path)),
+                         lambda database, code: database.get(code))
+    }
+
+def measure(load, query, inputs):
+    """Load time, retained/peak Python memory and per-query latency of one strategy"""
+    # tracemalloc slows allocation down, so memory comes from a second, traced load
+    tracemalloc.start()
+    traced = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if hasattr(traced, "close"):
+        traced.close()
+    del traced
+
+    start = time.perf_counter()
+    state = load()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        query(state, item)
+        latencies.append((time.perf_counter() - start) * 1000)
+    if hasattr(state, "close"):
+        state.close()
+
+    return {
+        "load_ms": round(load_ms, 1),
+        "memory_mb": round(retained / 2**20, 2),
+        "peak_memory_mb": round(peak / 2**20, 2),
+        "queries": len(inputs),
+        "query_p50_ms": round(percentile(latencies, 50), 4),
+        "query_p95_ms": round(percentile(latencies, 95), 4),
+        "query_mean_ms": round(statistics.mean(latencies), 4)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search strategies on synthetic databases")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated code counts")
+    parser.add_argument("--data-dir", default="synthetic", help="where synthetic databases live")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--scan-queries", type=int, default=30,
+                        help="queries for the linear scan, which is slow at large sizes")
+    parser.add_argument("--strategies", help="comma-separated subset of strategies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for count in (int(size) for size in args.sizes.split(',')):
+        database_path = database_path_for(args.data_dir, count)
+        if not database_path.exists():
+            print(f"🔧 Generating {count:,}-code synthetic database...")
+            write_synthetic_database(args.data_dir, count, args.seed)
+
+        codes = _load_codes(database_path)
+        queries = realistic_queries(codes, args.queries, args.seed)
+        exact_codes = [codes[i * len(codes) // args.queries]["code"] for i in range(args.queries)]
+
+        print("=" * 100)
+        print(f"{count:,} CODES ({database_path})")
+        print("=" * 100)
+        print(f"  {'strategy':<16}{'load ms':>10}{'memory MB':>12}{'peak MB':>10}"
+              f"{'p50 ms':>11}{'p95 ms':>11}{'mean ms':>11}")
+        for name, (load, query) in strategies(str(database_path)).items():
+            if args.strategies and name not in args.strategies.split(','):
+                continue
+            inputs = (exact_codes if name == "binary_exact"
+                      else queries[:args.scan_queries] if name == "linear_scan" else queries)
+            result = {"codes": count, "strategy": name, **measure(load, query, inputs)}
+            results.append(result)
+            print(f"  {name:<16}{result['load_ms']:>10,.1f}{result['memory_mb']:>12,.2f}"
+                  f"{result['peak_memory_mb']:>10,.2f}{result['query_p50_ms']:>11.4f}"
+                  f"{result['query_p95_ms']:>11.4f}{result['query_mean_ms']:>11.4f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Import cost of the seed catalogue: module literals vs a streamed data file
+Every case runs in a fresh interpreter, once with its module's .pyc removed
+(cold: the source is compiled to bytecode), once warm and once under
+tracemalloc, and reports wall time, peak RSS and the traced Python peak.
+Covers importing generate_hs_database, loading its catalogue and
+create_database on a synthetic catalogue, then grows the catalogue to
+--rows records and compares a module of dict literals (the old
+HS_CODES_DATA layout) with streaming the same rows from a data file
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from generate_hs_database import write_hs_codes
+from synthetic_database import synthesize_codes
+
+ROOT = Path(__file__).resolve().parent
+
+PROBE = '''
+import json, resource, sys, time, tracemalloc
+sys.path[:0] = {paths!r}
+{setup}
+if {trace}:
+    tracemalloc.start()
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "traced_mb": tracemalloc.get_traced_memory()[1] / 2**20,
+                   "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+'''
+
+def probe(body, setup="", paths=(), trace=False):
+    """Run body in a fresh interpreter; {"ms", "traced_mb", "rss_mb"}"""
+    source = PROBE.format(paths=[str(ROOT), *map(str, paths)], setup=setup, body=body, trace=trace)
+    # Warm runs need the .pyc the cold run writes
+    env = {name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"}
+    out = subprocess.run([sys.executable, "-c", source], capture_output=True, text=True, check=True,
+                         cwd=ROOT, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def measure(name, body, setup="", paths=(), module_path=None):
+    """Cold, warm and traced runs of one case, printed as a row"""
+    pyc = importlib.util.cache_from_source(str(module_path)) if module_path else None
+    if pyc and os.path.exists(pyc):
+        os.remove(pyc)
+    cold = probe(body, setup, paths)
+    warm = probe(body, setup, paths)
+    traced = probe(body, setup, paths, trace=True)
+    print(f"  {name:<34}{cold['ms']:>9.1f}{warm['ms']:>9.1f}{cold['rss_mb']:>10.1f}{warm['rss_mb']:>10.1f}"
+          f"{traced['traced_mb']:>11.2f}")
+    return {"case": name, "cold_ms": round(cold["ms"], 2), "warm_ms": round(warm["ms"], 2),
+            "cold_rss_mb": round(cold["rss_mb"], 1), "warm_rss_mb": round(warm["rss_mb"], 1),
+            "traced_peak_mb": round(traced["traced_mb"], 2)}
+
+def write_literal_module(path, codes):
+    """The old layout: HS_CODES_DATA as one list of dict literals"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("HS_CODES_DATA = [\n")
+        for item in codes:
+            f.write(f"    {item!r},\n")
+        f.write("]\n")
+
+def header(title):
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+    print(f"  {'case':<34}{'cold ms':>9}{'warm ms':>9}{'cold RSS':>10}{'warm RSS':>10}{'traced MB':>11}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark seed catalogue import and load cost")
+    parser.add_argument("--rows", type=int, default=20000, help="records in the grown catalogue")
+    parser.add_argument("--create-codes", type=int, default=20000, help="codes passed to create_database")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    module_path = ROOT / "generate_hs_database.py"
+    results = []
+    header("generate_hs_database")
+    results.append(measure("import", "import generate_hs_database", module_path=module_path))
+    results.append(measure("import + catalogue", "import generate_hs_database as g\n"
+                           "codes = g.load_hs_codes()", module_path=module_path))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results.append(measure(
+            f"create_database ({args.create_codes:,} codes)",
+            "create_database(tmp + '/hs-codes-database.json', codes)",
+            setup=f"from generate_hs_database import create_database\n"
+                  f"from synthetic_database import synthesize_codes\n"
+                  f"codes = synthesize_codes({args.create_codes})\ntmp = {tmp!r}"))
+
+        codes = synthesize_codes(args.rows)
+        write_literal_module(Path(tmp) / "seed_literals.py", codes)
+        data_path = Path(tmp) / "seed_data.tsv"
+        write_hs_codes(data_path, codes)
+        literal_bytes = (Path(tmp) / "seed_literals.py").stat().st_size
+        header(f"{len(codes):,}-record catalogue (literals {literal_bytes / 2**20:.1f} MB, "
+               f"data file {data_path.stat().st_size / 2**20:.1f} MB)")
+        results.append(measure("module literals: import", "import seed_literals\n"
+                               "n = len(seed_literals.HS_CODES_DATA)",
+                               paths=[tmp], module_path=Path(tmp) / "seed_literals.py"))
+        setup = "from generate_hs_database import iter_hs_codes, load_hs_codes"
+        results.append(measure("data file: stream (iter_hs_codes)",
+                               f"n = sum(1 for _ in iter_hs_codes({str(data_path)!r}))", setup))
+        results.append(measure("data file: load (load_hs_codes)",
+                               f"codes = load_hs_codes({str(data_path)!r})", setup))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Reproducible load and latency benchmark suite
+Drives POST /api/search-hs-code of server.js at several concurrency levels
+with a query mix drawn from hs-codes-database.json, with Groq replaced by
+the local LLM stub, and times the Python extraction and search paths.
+Results are written as JSON per commit so runs can be compared with
+--compare
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from bench_extraction_core import best_time, synthetic_tariff_lines
+from bench_llm_context import percentile
+from extraction_core import iter_hs_records
+from fuzzy_match import FuzzyMatcher, resolve
+from hs_search import BM25Index
+from llm_stub_server import StubSettings, start_stub_server
+from search_index import InvertedIndex, build_inverted_index
+
+VAGUE_QUERIES = ["food", "goods", "other", "mixed items", "products for sale", "samples"]
+
+def _typo(word, rng):
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1:]
+
+def realistic_queries(codes, count, seed=11):
+    """Query mix of the shapes users send.
+
+    Mostly two-keyword product names, some longer description fragments,
+    misspellings (fuzzy path) and vague one-worders (LLM path). A small set
+    of popular queries repeats, as it does in real traffic.
+    """
+    rng = random.Random(seed)
+    popular = []
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        if popular and roll < 0.2:
+            queries.append(rng.choice(popular))
+            continue
+        item = rng.choice(codes)
+        words = item.get("keywords") or item["description"].split()[:3]
+        if roll < 0.6:
+            query = ' '.join(rng.sample(words, min(2, len(words))))
+        elif roll < 0.8:
+            description = item["description"].split()
+            start = rng.randrange(max(1, len(description) - 3))
+            query = ' '.join(description[start:start + rng.randint(3, 6)])
+        elif roll < 0.9:
+            query = ' '.join(_typo(word.lower(), rng) for word in words[:2])
+        else:
+            query = rng.choice(VAGUE_QUERIES)
+        queries.append(query)
+        if len(popular) < 20:
+            popular.append(query)
+    return queries
+
+def latency_summary(latencies_ms):
+    if not latencies_ms:
+        return {}
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "mean_ms": round(statistics.mean(latencies_ms), 2),
+        "max_ms": round(max(latencies_ms), 2)
+    }
+
+def _get_json(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def post_search(base_url, description, timeout=60):
+    """(HTTP status, latency ms, response body) of one classification request"""
+    body = json.dumps({"description": description, "isFollowUp": False}).encode('utf-8')
+    request = urllib.request.Request(f"{base_url}/api/search-hs-code", data=body,
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    except (urllib.error.URLError, OSError):
+        status, payload = 0, b""
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    try:
+        return status, elapsed_ms, json.loads(payload or b"{}")
+    except ValueError:
+        return status, elapsed_ms, {}
+
+def wait_for_server(base_url, timeout):
+    """Wait until /api/health reports the tariff loaded; returns the health body"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            health = _get_json(f"{base_url}/api/health", timeout=2)
+            if health.get("pdfLoaded"):
+                return health
+        except (urllib.error.URLError, OSError, ValueError):
+            pass
+        time.sleep(0.5)
+    return None
+
+def spawn_server(port, llm_url, extra_env=None):
+    """Start node server.js against the LLM stub"""
+    env = dict(os.environ, PORT=str(port), GROQ_API_KEY="stub-key", GROQ_BASE_URL=llm_url,
+               **(extra_env or {}))
+    return subprocess.Popen(["node", "server.js"], cwd=Path(__file__).parent, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def run_load(base_url, queries, concurrency, total):
+    """Send `total` requests from `concurrency` workers; latency and throughput stats"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    next_query = iter(range(total))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(next_query, None)
+            if i is None:
+                return
+            status, elapsed_ms, _ = post_search(base_url, queries[i % len(queries)])
+            with lock:
+                latencies.append(elapsed_ms)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": total - statuses.get(200, 0),
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+        "requests_per_sec": round(total / elapsed, 2),
+        **latency_summary(latencies)
+    }
+
+def bench_server(args, codes):
+    """Load test of a running (or spawned) server.js, one result per concurrency level"""
+    settings = StubSettings(args.llm_delay_ms, args.llm_per_kchar_ms)
+    stub, llm_url = start_stub_server(settings=settings)
+    process = spawn_server(args.port, llm_url) if args.spawn else None
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        health = wait_for_server(base_url, args.startup_timeout)
+        if not health:
+            print(f"⚠️ No ready server at {base_url}, skipping the load test "
+                  "(start it with GROQ_BASE_URL=<stub> or pass --spawn)")
+            return None
+
+        queries = realistic_queries(codes, args.requests, args.seed)
+        for query in queries[:args.warmup]:
+            post_search(base_url, query)
+
+        levels = []
+        for concurrency in args.concurrency:
+            llm_before = settings.requests
+            result = run_load(base_url, queries, concurrency, args.requests)
+            result["llm_calls"] = settings.requests - llm_before
+            levels.append(result)
+            print(f"  c={concurrency:<4} {result['requests_per_sec']:>8.1f} req/s  "
+                  f"p50 {result.get('p50_ms', 0):>8.1f}  p95 {result.get('p95_ms', 0):>8.1f}  "
+                  f"p99 {result.get('p99_ms', 0):>8.1f} ms  "
+                  f"llm {result['llm_calls']:>4}  errors {result['errors']}")
+        return {
+            "url": base_url,
+            "codes_loaded": health.get("hsCodesExtracted"),
+            "llm_stub": {"base_delay_ms": args.llm_delay_ms, "per_kchar_ms": args.llm_per_kchar_ms},
+            "levels": levels
+        }
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        stub.shutdown()
+
+def _per_call(func, items, repeat):
+    elapsed, _ = best_time(lambda: [func(item) for item in items], repeat)
+    return round(elapsed / len(items) * 1000, 4)
+
+def bench_python(codes, queries, repeat):
+    """Time of the Python extraction and search paths (ms per call unless noted)"""
+    lines = synthetic_tariff_lines(50_000)
+    parse_time, records = best_time(lambda: list(iter_hs_records(lines)), repeat)
+
+    load_time, index = best_time(lambda: BM25Index(codes), 1)
+    inverted = InvertedIndex(build_inverted_index(codes))
+    matcher = FuzzyMatcher.from_codes(codes)
+    batch_time, _ = best_time(lambda: index.search_batch(queries, 10), repeat)
+
+    return {
+        "extraction_lines_per_sec": round(len(lines) / parse_time),
+        "extraction_records": len(records),
+        "bm25_build_ms": round(load_time * 1000, 2),
+        "bm25_search_ms": _per_call(lambda query: index.search(query, 10), queries, repeat),
+        "bm25_search_batch_ms": round(batch_time / len(queries) * 1000, 4),
+        "inverted_lookup_ms": _per_call(inverted.lookup, queries, repeat),
+        "fuzzy_resolve_ms": _per_call(lambda query: resolve(matcher, index, query, 10), queries, repeat)
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def _flatten(results, prefix=""):
+    """{"a.b": number} view of the numeric results, for comparisons"""
+    flat = {}
+    if isinstance(results, dict):
+        for key, value in results.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(results, list):
+        for item in results:
+            if isinstance(item, dict) and "concurrency" in item:
+                flat.update(_flatten(item, f"{prefix}c{item['concurrency']}."))
+    elif isinstance(results, (int, float)) and not isinstance(results, bool):
+        flat[prefix.rstrip('.')] = results
+    return flat
+
+def print_comparison(previous, current):
+    """Relative change of every metric present in both runs"""
+    before = _flatten({"server": previous.get("server"), "python": previous.get("python")})
+    after = _flatten({"server": current.get("server"), "python": current.get("python")})
+    print(f"📊 Compared with {previous.get('commit')} ({previous.get('timestamp')}):")
+    for key in sorted(before.keys() & after.keys()):
+        if before[key]:
+            change = (after[key] - before[key]) / before[key] * 100
+            print(f"  {key:<40} {before[key]:>12,.3f} -> {after[key]:>12,.3f}  ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and latency benchmark suite")
+    parser.add_argument("--database", default="hs-codes-database.json")
+    parser.add_argument("--url", help="running server to drive (default: http://127.0.0.1:PORT)")
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--spawn", action="store_true",
+                        help="start node server.js pointed at the LLM stub")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--concurrency", type=lambda s: [int(c) for c in s.split(',')],
+                        default=[1, 8, 32], help="comma-separated levels (default: 1,8,32)")
+    parser.add_argument("--requests", type=int, default=300, help="requests per level")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--llm-delay-ms", type=float, default=300.0, help="stub delay per LLM call")
+    parser.add_argument("--llm-per-kchar-ms", type=float, default=2.0, help="stub delay per 1k prompt chars")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per Python timing, best is kept")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--skip-server", action="store_true")
+    parser.add_argument("--skip-python", action="store_true")
+    parser.add_argument("--results-dir", default="bench-results")
+    parser.add_argument("--compare", metavar="PATH", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        codes = json.load(f)["codes"]
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "codes": len(codes),
+        "server": None,
+        "python": None
+    }
+
+    print("=" * 70)
+    print(f"BENCHMARK SUITE (commit {results['commit']}, {len(codes)} codes)")
+    print("=" * 70)
+
+    if not args.skip_server:
+        print("🚀 Load test: POST /api/search-hs-code")
+        results["server"] = bench_server(args, codes)
+
+    if not args.skip_python:
+        print("🐍 Python paths")
+        results["python"] = bench_python(codes, realistic_queries(codes, 500, args.seed), args.repeat)
+        for key, value in results["python"].items():
+            print(f"  {key:<28} {value:>14,}")
+
+    Path(args.results_dir).mkdir(parents=True, exist_ok=True)
+    output_path = Path(args.results_dir) / f"{results['commit']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"📝 Results written: {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(json.load(f), results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of the IVF vector index against the exact scan
+For every synthetic database size (generated with synthetic_database.py
+when missing), builds the hashed-vector index of vector_search.py and
+reports build time, matrix memory, exact brute-force latency and, per
+n_probe, approximate latency and recall@k against the exact top-k
+"""
+
+import argparse
+import json
+import time
+from bench_llm_context import percentile
+from bench_suite import realistic_queries
+from synthetic_database import database_path_for, write_synthetic_database
+from vector_search import DEFAULT_DIM, VectorIndex, recall_at_k
+
+def latency_ms(func, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return round(percentile(latencies, 50), 4), round(percentile(latencies, 95), 4)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark approximate vs exact vector search")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated code counts")
+    parser.add_argument("--data-dir", default="synthetic", help="where synthetic databases live")
+    parser.add_argument("--database", help="benchmark this database instead of synthetic sizes")
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM)
+    parser.add_argument("--n-probe", default="4,8,16,32,64", help="comma-separated lists to scan")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    if args.database:
+        databases = [args.database]
+    else:
+        databases = []
+        for count in (int(size) for size in args.sizes.split(',')):
+            path = database_path_for(args.data_dir, count)
+            if not path.exists():
+                print(f"🔧 Generating {count:,}-code synthetic database...")
+                write_synthetic_database(args.data_dir, count, args.seed)
+            databases.append(str(path))
+
+    results = []
+    for database_path in databases:
+        with open(database_path, 'r', encoding='utf-8') as f:
+            codes = json.load(f)["codes"]
+        start = time.perf_counter()
+        index = VectorIndex(codes, dim=args.dim, seed=args.seed)
+        build_s = time.perf_counter() - start
+        queries = realistic_queries(codes, args.queries, args.seed)
+
+        exact_p50, exact_p95 = latency_ms(lambda query: index.exact(query, args.k), queries)
+        print("=" * 80)
+        print(f"{len(codes):,} CODES, dim {args.dim}, {len(index.centroids)} lists "
+              f"(built in {build_s:.1f}s, matrix {index.matrix.nbytes / 2**20:.1f} MB)")
+        print("=" * 80)
+        print(f"  {'search':<16}{'p50 ms':>10}{'p95 ms':>10}{f'recall@{args.k}':>12}")
+        print(f"  {'exact':<16}{exact_p50:>10.4f}{exact_p95:>10.4f}{1.0:>12.3f}")
+
+        result = {"codes": len(codes), "dim": args.dim, "lists": len(index.centroids),
+                  "build_s": round(build_s, 2), "matrix_mb": round(index.matrix.nbytes / 2**20, 2),
+                  "exact_p50_ms": exact_p50, "exact_p95_ms": exact_p95, "ivf": []}
+        for n_probe in (int(n) for n in args.n_probe.split(',')):
+            p50, p95 = latency_ms(lambda query: index.approximate(query, args.k, n_probe), queries)
+            recall = recall_at_k(index, queries, args.k, n_probe)
+            result["ivf"].append({"n_probe": n_probe, "p50_ms": p50, "p95_ms": p95,
+                                  "recall": round(recall, 4)})
+            print(f"  {f'ivf n_probe={n_probe}':<16}{p50:>10.4f}{p95:>10.4f}{recall:>12.3f}")
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"📝 Results written: {args.json}")
+
+if __name__ == "__main__":
+    main()
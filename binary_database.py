@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Compact binary HS code database, written alongside hs-codes-database.json
+The file is memory-mapped and read on demand, so looking up a code does not
+parse the whole database
+
+Layout (little-endian, all offsets are absolute file offsets):
+  header      magic "HSDB", format version, record count, keyword count,
+              then the offset of each section below
+  codes       count x 8 ASCII digits, in database order
+  order       count x u32 record ids sorted by code (binary search)
+  desc_offs   (count + 1) x u32 offsets into desc_data
+  desc_data   UTF-8 descriptions, concatenated
+  kw_offs     (keywords + 1) x u32 offsets into kw_data
+  kw_data     UTF-8 interned keywords, concatenated
+  rec_kw_offs (count + 1) x u32 offsets into rec_kw_ids
+  rec_kw_ids  u32 keyword ids of each record, in record order
+  metadata    UTF-8 JSON of the database metadata
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from extraction_core import HS_CODE_PATTERN
+
+MAGIC = b"HSDB"
+FORMAT_VERSION = 1
+CODE_WIDTH = 8
+SECTIONS = ("codes", "order", "desc_offs", "desc_data", "kw_offs", "kw_data",
+            "rec_kw_offs", "rec_kw_ids", "metadata", "end")
+HEADER = struct.Struct("<4sHHII" + "I" * len(SECTIONS))
+
+def _u32_bytes(values):
+    data = array("I", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+def _string_table(strings):
+    """(offsets, blob) for a list of strings"""
+    offsets = [0]
+    chunks = []
+    for value in strings:
+        encoded = value.encode("utf-8")
+        chunks.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+    return offsets, b"".join(chunks)
+
+def write_binary_database(database, output_path):
+    """Write the {"metadata", "codes"} database as a compact binary file"""
+    codes = database["codes"]
+
+    keyword_ids = {}
+    rec_kw_offs = [0]
+    rec_kw_ids = []
+    for item in codes:
+        for keyword in item.get("keywords", []):
+            rec_kw_ids.append(keyword_ids.setdefault(keyword, len(keyword_ids)))
+        rec_kw_offs.append(len(rec_kw_ids))
+
+    for item in codes:
+        code = item["code"]
+        # \d and $ alone would let through non-ASCII digits and a trailing newline
+        if not (HS_CODE_PATTERN.match(code) and code.isascii() and len(code) == CODE_WIDTH):
+            raise ValueError(f"invalid code {code!r}: every code must be exactly 8 ASCII digits")
+    code_bytes = "".join(item["code"] for item in codes).encode("ascii")
+
+    desc_offs, desc_data = _string_table(item["description"] for item in codes)
+    kw_offs, kw_data = _string_table(keyword_ids)
+    order = sorted(range(len(codes)), key=lambda i: codes[i]["code"])
+
+    sections = [
+        code_bytes,
+        _u32_bytes(order),
+        _u32_bytes(desc_offs),
+        desc_data,
+        _u32_bytes(kw_offs),
+        kw_data,
+        _u32_bytes(rec_kw_offs),
+        _u32_bytes(rec_kw_ids),
+        json.dumps(database.get("metadata", {}), ensure_ascii=False).encode("utf-8"),
+    ]
+
+    offsets = []
+    position = HEADER.size
+    for data in sections:
+        offsets.append(position)
+        position += len(data)
+    offsets.append(position)
+
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(codes), len(keyword_ids), *offsets))
+        for data in sections:
+            f.write(data)
+
+    return position
+
+class BinaryDatabase:
+    """Random-access reader over a memory-mapped binary database"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, self.keyword_count, *offsets = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not an HS code binary database (version {FORMAT_VERSION})")
+        self._off = dict(zip(SECTIONS, offsets))
+        self._keyword_cache = {}
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.record(index)
+
+    def _u32(self, section, index):
+        return struct.unpack_from("<I", self._mm, self._off[section] + 4 * index)[0]
+
+    def _string(self, offs_section, data_section, index):
+        start = self._u32(offs_section, index)
+        end = self._u32(offs_section, index + 1)
+        base = self._off[data_section]
+        return self._mm[base + start:base + end].decode("utf-8")
+
+    @property
+    def metadata(self):
+        return json.loads(self._mm[self._off["metadata"]:self._off["end"]].decode("utf-8"))
+
+    def code(self, index):
+        start = self._off["codes"] + CODE_WIDTH * index
+        return self._mm[start:start + CODE_WIDTH].decode("ascii")
+
+    def keyword(self, keyword_id):
+        if keyword_id not in self._keyword_cache:
+            self._keyword_cache[keyword_id] = self._string("kw_offs", "kw_data", keyword_id)
+        return self._keyword_cache[keyword_id]
+
+    def record(self, index):
+        """Record at a database position, as in the JSON "codes" array"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        kw_start = self._u32("rec_kw_offs", index)
+        kw_end = self._u32("rec_kw_offs", index + 1)
+        return {
+            "code": self.code(index),
+            "description": self._string("desc_offs", "desc_data", index),
+            "keywords": [self.keyword(self._u32("rec_kw_ids", n)) for n in range(kw_start, kw_end)]
+        }
+
+    def find(self, code):
+        """Database position of a code (binary search), or None"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            index = self._u32("order", mid)
+            candidate = self.code(index)
+            if candidate == code:
+                return index
+            if candidate < code:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def get(self, code):
+        """Record for an 8-digit code, or None"""
+        index = self.find(code)
+        return None if index is None else self.record(index)
+
+def verify_round_trip(json_path, binary_path):
+    """Check a binary database against its JSON source; returns a list of problems"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        database = json.load(f)
+
+    problems = []
+    with BinaryDatabase(binary_path) as db:
+        if db.metadata != database.get("metadata", {}):
+            problems.append("metadata differs")
+        if len(db) != len(database["codes"]):
+            problems.append(f"record count {len(db)} != {len(database['codes'])}")
+        for index, item in enumerate(database["codes"]):
+            expected = {"code": item["code"], "description": item["description"],
+                        "keywords": item.get("keywords", [])}
+            if index < len(db) and db.record(index) != expected:
+                problems.append(f"record {index} ({item['code']}) differs")
+            if db.get(item["code"]) is None:
+                problems.append(f"code {item['code']} not found by lookup")
+    return problems
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python binary_database.py <hs-codes-database.json> <output.bin>")
+        sys.exit(1)
+
+    json_path, binary_path = sys.argv[1], sys.argv[2]
+    with open(json_path, "r", encoding="utf-8") as f:
+        database = json.load(f)
+
+    size = write_binary_database(database, binary_path)
+    print(f"✅ Binary database created: {binary_path} ({size / 1024:.1f} KB)")
+
+    problems = verify_round_trip(json_path, binary_path)
+    if problems:
+        print(f"❌ Round trip failed ({len(problems)} problems):")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        sys.exit(1)
+    print(f"✓ Round trip verified: {len(database['codes'])} records match the JSON")
+
+if __name__ == "__main__":
+    main()
@@ -6,114 +6,274 @@ Creates hs-codes-database.json with structured data
 
 import PyPDF2
 import json
-import re
 import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from extraction_core import CODE_PREFIX_PATTERN, HSLineParser
+from extraction_profile import ExtractionProfile, capture
+from page_cache import PageCache, diff_records, print_change_report
+from search_artifact import file_sha256, write_search_artifact
+from search_index import index_path_for
 
-def extract_hs_codes_from_pdf(pdf_path):
-    """Extract HS codes and descriptions from PDF"""
+# Bump when parsing changes so cached page results are invalidated
+CACHE_EXTRACTOR = "extract_pdf/2"
+
+def _iter_page_lines(pdf_reader, start=0, end=None):
+    """Yield text lines page by page, holding at most one page of text"""
+    end = len(pdf_reader.pages) if end is None else end
+    for page_num in range(start, end):
+        text = pdf_reader.pages[page_num].extract_text() or ""
+        yield from text.split('\n')
+
+def _parse_shard_lines(lines):
+    """Parse the lines of one shard (a page range) independently of its neighbours.
+
+    Returns (records, pending, head_lines, head_stops, line_count). records
+    are candidate records in document order, before de-duplication; pending
+    is a record still open at the end of the shard. head_lines are the
+    shard's lines before its first code-like line, which a record left open
+    by the previous shard may still consume; head_stops tells whether such a
+    line exists. line_count is the number of lines parsed.
+    """
+    parser = HSLineParser(dedupe=False)
+    records = []
+    head_lines = []
+    head_stops = False
+    line_count = 0
+    
+    for raw_line in lines:
+        line_count += 1
+        if not head_stops:
+            if CODE_PREFIX_PATTERN.match(raw_line.strip()):
+                head_stops = True
+            else:
+                head_lines.append(raw_line)
+        records.extend(parser.feed(raw_line))
+    
+    return records, parser.pending, head_lines, head_stops, line_count
+
+def _extract_shard(pdf_path, start, end):
+    """Worker: extract and parse pages [start, end) of the PDF"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return _parse_shard_lines(_iter_page_lines(pdf_reader, start, end))
+
+def _extract_pages(pdf_path, page_numbers):
+    """Worker: extract and parse each listed page as its own shard"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [_parse_shard_lines(_iter_page_lines(pdf_reader, n, n + 1)) for n in page_numbers]
+
+def _page_content(page):
+    """Raw (decoded) content stream bytes of a page"""
+    contents = page.get_contents()
+    return contents.get_data() if contents is not None else b""
+
+def _shard_ranges(num_pages, workers):
+    """Split the page range into contiguous shards (a few per worker for balance)"""
+    shard_count = min(num_pages, workers * 4)
+    bounds = [num_pages * n // shard_count for n in range(shard_count + 1)]
+    return [(bounds[n], bounds[n + 1]) for n in range(shard_count)]
+
+def _merge_shards(shard_results, profile=None):
+    """Merge worker results in page order, exactly as the serial scan would"""
+    hs_codes = []
+    hs_codes_set = set()
     
+    for index, (records, pending, *_) in enumerate(shard_results):
+        if pending:
+            # A record still open at the end of the shard continues into
+            # the heads of the following shards
+            records = list(records)
+            parser = HSLineParser.resume(*pending)
+            for _, _, head_lines, head_stops, _ in shard_results[index + 1:]:
+                for line in head_lines:
+                    records.extend(parser.feed(line))
+                if head_stops or not parser.pending:
+                    break
+            records.extend(parser.close())
+        
+        for record in records:
+            if record["code"] not in hs_codes_set:
+                hs_codes_set.add(record["code"])
+                hs_codes.append(record)
+            elif profile:
+                profile.count("duplicates")
+    
+    return hs_codes
+
+def extract_hs_codes_parallel(pdf_path, workers, profile=None):
+    """Extract HS codes with a process pool, one page shard per task"""
+    
+    profile = profile or ExtractionProfile()
     print(f"📄 Opening PDF: {pdf_path}")
     
     if not os.path.exists(pdf_path):
         print(f"❌ PDF not found: {pdf_path}")
         return None
     
-    all_text = ""
+    try:
+        with profile.stage("open"):
+            with open(pdf_path, 'rb') as file:
+                num_pages = len(PyPDF2.PdfReader(file).pages)
+        print(f"📊 Total pages: {num_pages}")
+        profile.count("pages", num_pages)
+        
+        shards = _shard_ranges(num_pages, workers)
+        print(f"⚙️  Extracting {len(shards)} shards with {workers} workers...")
+        
+        # Workers decode, extract and parse together, so only their wall time is seen here
+        shard_results = []
+        with profile.stage("workers"), ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_shard, pdf_path, start, end) for start, end in shards]
+            for (_, end), future in zip(shards, futures):
+                shard_results.append(future.result())
+                print(f"  Processed {end}/{num_pages} pages...")
+    except Exception as e:
+        print(f"❌ Error reading PDF: {e}")
+        return None
+    
+    profile.count("lines", sum(result[4] for result in shard_results))
+    with profile.stage("merge"):
+        hs_codes = _merge_shards(shard_results, profile)
+    profile.count("codes", len(hs_codes))
+    
+    print(f"✅ Found {len(hs_codes)} HS codes")
+    
+    return hs_codes
+
+def extract_hs_codes_cached(pdf_path, cache_path, workers=1, report_path=None, profile=None):
+    """Extract HS codes, re-parsing only pages whose content hash is not cached"""
+    
+    profile = profile or ExtractionProfile()
+    print(f"📄 Opening PDF: {pdf_path}")
+    
+    if not os.path.exists(pdf_path):
+        print(f"❌ PDF not found: {pdf_path}")
+        return None
+    
+    with profile.stage("cache_load"):
+        cache = PageCache(cache_path, CACHE_EXTRACTOR)
+    
     try:
         with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
+            with profile.stage("open"):
+                pdf_reader = PyPDF2.PdfReader(file)
+                num_pages = len(pdf_reader.pages)
             print(f"📊 Total pages: {num_pages}")
+            profile.count("pages", num_pages)
             
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                text = page.extract_text()
-                all_text += text + "\n"
-                if page_num % 10 == 0:
-                    print(f"  Processed {page_num}/{num_pages} pages...")
-        
-        print(f"✅ PDF text extracted ({len(all_text)} characters)")
+            with profile.stage("page_hash"):
+                keys = [cache.page_key(_page_content(page)) for page in pdf_reader.pages]
+            page_results = [cache.get(key) for key in keys]
+            missing = [n for n, result in enumerate(page_results) if result is None]
+            profile.count("cache_hits", num_pages - len(missing))
+            profile.count("cache_misses", len(missing))
+            print(f"♻️  {num_pages - len(missing)} pages cached, extracting {len(missing)}...")
+            
+            if workers > 1 and len(missing) > 1:
+                chunk_count = min(len(missing), workers * 4)
+                chunks = [missing[n::chunk_count] for n in range(chunk_count)]
+                with profile.stage("workers"), ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(_extract_pages, pdf_path, chunk) for chunk in chunks]
+                    for chunk, future in zip(chunks, futures):
+                        for page_num, result in zip(chunk, future.result()):
+                            page_results[page_num] = result
+            else:
+                for count, page_num in enumerate(missing, 1):
+                    page_start = time.perf_counter()
+                    with profile.stage("extract_parse"):
+                        page_results[page_num] = _parse_shard_lines(_iter_page_lines(pdf_reader, page_num, page_num + 1))
+                    profile.page(page_num + 1, time.perf_counter() - page_start)
+                    if count % 10 == 0:
+                        print(f"  Extracted {count}/{len(missing)} pages...")
+            
+            # Lines of cached pages were not parsed in this run
+            profile.count("lines", sum(page_results[page_num][4] for page_num in missing))
+            for page_num in missing:
+                cache.put(keys[page_num], page_results[page_num])
     except Exception as e:
         print(f"❌ Error reading PDF: {e}")
         return None
     
-    # Extract HS codes - 8 digit codes with descriptions
-    hs_codes = []
-    hs_codes_set = set()  # To avoid duplicates
+    with profile.stage("merge"):
+        hs_codes = _merge_shards(page_results, profile)
+    profile.count("codes", len(hs_codes))
     
-    # Split into lines for line-by-line processing
-    lines = all_text.split('\n')
+    print(f"✅ Found {len(hs_codes)} HS codes")
     
-    print(f"📄 Processing {len(lines)} lines...")
+    print_change_report(cache, diff_records(cache.previous_codes, hs_codes), report_path)
+    try:
+        with profile.stage("cache_save"):
+            cache.save(hs_codes)
+    except OSError as e:
+        print(f"⚠️ Could not save page cache: {e}")
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
-        
-        # Check if line contains an 8-digit code at the beginning or after minimal whitespace
-        # Pattern: starts with 8 digits, optional whitespace, then description
-        code_match = re.match(r'^(\d{8})[\s\-–]+(.*?)$', line)
-        
-        if code_match:
-            code = code_match.group(1)
-            description = code_match.group(2).strip()
+    return hs_codes
+
+def extract_hs_codes_from_pdf(pdf_path, workers=1, cache_path=None, report_path=None, profile=None):
+    """Extract HS codes and descriptions from PDF.
+
+    profile, an ExtractionProfile, receives stage timings and counters.
+    """
+    
+    if cache_path:
+        return extract_hs_codes_cached(pdf_path, cache_path, workers, report_path, profile)
+    
+    if workers > 1:
+        return extract_hs_codes_parallel(pdf_path, workers, profile)
+    
+    profile = profile or ExtractionProfile()
+    print(f"📄 Opening PDF: {pdf_path}")
+    
+    if not os.path.exists(pdf_path):
+        print(f"❌ PDF not found: {pdf_path}")
+        return None
+    
+    # Pages are decoded lazily and their lines fed straight into the parser,
+    # so only one page of text is held at a time
+    hs_codes = []
+    parser = HSLineParser()
+    try:
+        with open(pdf_path, 'rb') as file:
+            with profile.stage("open"):
+                pdf_reader = PyPDF2.PdfReader(file)
+                num_pages = len(pdf_reader.pages)
+            print(f"📊 Total pages: {num_pages}")
             
-            # Avoid duplicates
-            if code not in hs_codes_set:
-                # Collect continuation lines if description is short
-                j = i + 1
-                while j < len(lines) and len(description) < 100:
-                    next_line = lines[j].strip()
-                    
-                    # Stop if next line is another HS code
-                    if re.match(r'^\d{8}', next_line):
-                        break
-                    
-                    # Stop if line appears to be a header or page number
-                    if next_line.isdigit() or len(next_line) < 3:
-                        j += 1
-                        continue
-                    
-                    # Add line to description
-                    if not re.match(r'^[a-z]\)', next_line):  # Skip sub-items
-                        description += ' ' + next_line
-                    
-                    j += 1
-                
-                # Clean up description
-                description = ' '.join(description.split())
-                
-                # Keep if description is reasonable length
-                if len(description) > 5 and len(description) < 500:
-                    hs_codes_set.add(code)
-                    
-                    # Extract keywords - important words from description
-                    words = description.split()
-                    keywords = []
-                    for w in words:
-                        if len(w) > 3 and w.lower() not in ['the', 'and', 'with', 'from', 'other']:
-                            keywords.append(w)
-                    keywords = keywords[:7]  # Top 7 keywords
-                    
-                    hs_codes.append({
-                        "code": code,
-                        "description": description[:300],  # Limit to 300 chars
-                        "keywords": keywords
-                    })
-        
-        i += 1
+            for page_num in range(num_pages):
+                page_start = time.perf_counter()
+                with profile.stage("page_decode"):
+                    page = pdf_reader.pages[page_num]
+                with profile.stage("extract_text"):
+                    lines = (page.extract_text() or "").split('\n')
+                with profile.stage("parse"):
+                    for line in lines:
+                        hs_codes.extend(parser.feed(line))
+                profile.count("lines", len(lines))
+                profile.page(page_num + 1, time.perf_counter() - page_start)
+                if (page_num + 1) % 10 == 0:
+                    print(f"  Processed {page_num + 1}/{num_pages} pages...")
+            hs_codes.extend(parser.close())
+    except Exception as e:
+        print(f"❌ Error reading PDF: {e}")
+        return None
+    
+    profile.count("pages", num_pages)
+    profile.count("codes", len(hs_codes))
+    profile.count("duplicates", parser.duplicates)
+    profile.count("continuation_lines", parser.continuations)
+    profile.count("rejected_records", parser.rejected)
     
     print(f"✅ Found {len(hs_codes)} HS codes")
     
     return hs_codes
 
-def create_database(hs_codes, output_path):
-    """Create JSON database file"""
+def create_database(hs_codes, output_path, pdf_path=None):
+    """Create JSON database file and the prebuilt search artifact next to it"""
     
     if not hs_codes:
         print("❌ No HS codes extracted!")
@@ -122,9 +282,10 @@ def create_database(hs_codes, output_path):
     database = {
         "metadata": {
             "source": "Customs Tariff of India",
-            "extraction_date": "2026-01-26",
+            "extraction_date": datetime.now().isoformat(),
             "total_codes": len(hs_codes),
-            "version": "1.0"
+            "version": "1.0",
+            "pdf_sha256": file_sha256(pdf_path) if pdf_path else None
         },
         "codes": hs_codes
     }
@@ -133,6 +294,8 @@ def create_database(hs_codes, output_path):
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(database, f, indent=2, ensure_ascii=False)
         print(f"✅ Database created: {output_path}")
+        write_search_artifact(database, index_path_for(output_path), pdf_path)
+        print(f"✅ Search artifact created: {index_path_for(output_path)}")
         return True
     except Exception as e:
         print(f"❌ Error creating database: {e}")
@@ -141,15 +304,41 @@ def create_database(hs_codes, output_path):
 def main():
     # Find PDF file
     workspace_dir = Path("c:\\Users\\ajayv\\Desktop\\HS CODE TEST")
-    pdf_path = workspace_dir / "Customs Tariff of India.pdf"
-    output_path = workspace_dir / "hs-codes-database.json"
+    
+    parser = argparse.ArgumentParser(description="Extract HS codes from the Customs Tariff PDF")
+    parser.add_argument("--pdf", default=str(workspace_dir / "Customs Tariff of India.pdf"),
+                        help="path to the tariff PDF")
+    parser.add_argument("--output", default=str(workspace_dir / "hs-codes-database.json"),
+                        help="path of the JSON database to write")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="extract page shards in N worker processes (default: 1, serial)")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="per-page cache file; only pages whose content changed are re-extracted")
+    parser.add_argument("--changes-report", metavar="PATH",
+                        help="with --cache, write the added/removed/changed codes as JSON")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage timings, counters and the slowest pages")
+    parser.add_argument("--profile-json", metavar="PATH",
+                        help="write the profile summary as JSON")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="run extraction under cProfile and write the stats to PATH")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="trace allocations during extraction and print the top sites")
+    args = parser.parse_args()
+    
+    pdf_path = Path(args.pdf)
+    output_path = Path(args.output)
+    profile = ExtractionProfile(CACHE_EXTRACTOR)
     
     print("=" * 60)
     print("HS CODE EXTRACTION FROM PDF")
     print("=" * 60)
     
     # Extract codes
-    hs_codes = extract_hs_codes_from_pdf(str(pdf_path))
+    with capture(args.cprofile, args.tracemalloc):
+        hs_codes = extract_hs_codes_from_pdf(str(pdf_path), workers=max(1, args.workers),
+                                             cache_path=args.cache, report_path=args.changes_report,
+                                             profile=profile)
     
     if not hs_codes:
         print("❌ Failed to extract HS codes")
@@ -164,12 +353,20 @@ def main():
             print(f"  {code_item['code']}: {code_item['description'][:70]}...")
     
     # Create database
-    if create_database(hs_codes, str(output_path)):
+    with profile.stage("write_json"):
+        created = create_database(hs_codes, str(output_path), str(pdf_path))
+    if created:
         print(f"\n✅ SUCCESS!")
         print(f"📁 File: {output_path}")
         print(f"📊 Total codes: {len(hs_codes)}")
     else:
         print("❌ Failed to create database")
+    
+    profile.finish()
+    if args.profile:
+        profile.print_report()
+    if args.profile_json:
+        profile.write_json(args.profile_json)
 
 if __name__ == "__main__":
     main()
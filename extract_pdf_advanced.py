@@ -5,112 +5,192 @@ Advanced HS code extraction using pdfplumber
 
 import pdfplumber
 import json
-import re
+import time
+import argparse
+from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
+from pdfminer.pdftypes import resolve1
+from extraction_core import EIGHT_DIGIT_PATTERN, HS_CODE_PATTERN, TEXT_CODE_PATTERN, make_record
+from extraction_profile import ExtractionProfile, capture
+from page_cache import PageCache, diff_records, print_change_report
+from search_artifact import file_sha256, write_search_artifact
+from search_index import index_path_for
 
-def extract_hs_codes_advanced(pdf_path):
-    """Extract HS codes using pdfplumber for better table detection"""
+# Bump when parsing changes so cached page results are invalidated
+CACHE_EXTRACTOR = "extract_pdf_advanced/1"
+
+def _table_path_reason(page, text):
+    """Cheap pre-classifier: why this page needs (or can skip) extract_tables.
+
+    Table detection only finds tables along ruling lines, and only rows whose
+    first cell is an 8-digit code are kept, so a page without ruling edges or
+    without any 8-digit run in its text cannot contribute table records.
+    Returns one of "no_ruling_lines", "no_codes" or "table".
+    """
+    if not page.edges:
+        return "no_ruling_lines"
+    if not text or not EIGHT_DIGIT_PATTERN.search(text):
+        return "no_codes"
+    return "table"
+
+def _extract_page_candidates(page, path_stats=None, profile=None):
+    """Candidate records of one page, tables first, before de-duplication"""
+    candidates = []
+    profile = profile or ExtractionProfile()
+    
+    with profile.stage("extract_text"):
+        text = page.extract_text()
+    reason = _table_path_reason(page, text)
+    if path_stats is not None:
+        path_stats[reason] += 1
+    if text:
+        profile.count("lines", text.count('\n') + 1)
+    
+    # Try to extract tables first
+    try:
+        with profile.stage("extract_tables"):
+            tables = page.extract_tables() if reason == "table" else None
+        if tables:
+            for table in tables:
+                for row in table:
+                    # Check if first column is 8-digit code
+                    if row and len(row) > 0:
+                        cell = str(row[0]).strip() if row[0] else ""
+                        if HS_CODE_PATTERN.match(cell):
+                            # Combine remaining columns as description
+                            description = ' '.join(str(col).strip() for col in row[1:] if col)
+                            
+                            if len(description) > 0:
+                                candidates.append(make_record(cell, description))
+    except:
+        pass
+    
+    # Also try text extraction
+    if text:
+        with profile.stage("text_regex"):
+            # Find 8-digit patterns in text
+            for match in TEXT_CODE_PATTERN.finditer(text):
+                # Clean description
+                description = ' '.join(match.group(2).split())
+                
+                if len(description) > 3:
+                    candidates.append(make_record(match.group(1), description))
+    
+    return candidates
+
+def _page_content(page):
+    """Raw (decoded) content stream bytes of a pdfplumber page"""
+    return b"".join(resolve1(stream).get_data() for stream in page.page_obj.contents)
+
+def extract_hs_codes_advanced(pdf_path, cache_path=None, report_path=None, profile=None):
+    """Extract HS codes using pdfplumber for better table detection.
+
+    profile, an ExtractionProfile, receives stage timings and counters.
+    """
     
     print(f"📄 Opening PDF with pdfplumber: {pdf_path}")
     
     hs_codes = []
     hs_codes_set = set()
+    profile = profile or ExtractionProfile()
+    with profile.stage("cache_load"):
+        cache = PageCache(cache_path, CACHE_EXTRACTOR) if cache_path else None
+    path_stats = defaultdict(int)
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
+        with profile.stage("open"):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            with profile.stage("page_decode"):
+                pages = pdf.pages
+            total_pages = len(pages)
             print(f"📊 Total pages: {total_pages}")
+            profile.count("pages", total_pages)
             
-            for page_num, page in enumerate(pdf.pages, 1):
-                # Try to extract tables first
-                try:
-                    tables = page.extract_tables()
-                    if tables:
-                        for table in tables:
-                            for row in table:
-                                # Check if first column is 8-digit code
-                                if row and len(row) > 0:
-                                    cell = str(row[0]).strip() if row[0] else ""
-                                    if re.match(r'^\d{8}$', cell):
-                                        code = cell
-                                        # Combine remaining columns as description
-                                        desc_parts = []
-                                        for col in row[1:]:
-                                            if col:
-                                                desc_parts.append(str(col).strip())
-                                        
-                                        description = ' '.join(desc_parts)
-                                        
-                                        if code not in hs_codes_set and len(description) > 0:
-                                            hs_codes_set.add(code)
-                                            
-                                            # Extract keywords
-                                            words = description.split()
-                                            keywords = []
-                                            for w in words:
-                                                if len(w) > 3 and w.lower() not in ['the', 'and', 'with', 'from', 'other']:
-                                                    keywords.append(w)
-                                            keywords = keywords[:7]
-                                            
-                                            hs_codes.append({
-                                                "code": code,
-                                                "description": description[:300],
-                                                "keywords": keywords
-                                            })
-                except:
-                    pass
+            for page_num, page in enumerate(pages, 1):
+                page_start = time.perf_counter()
+                candidates = None
+                if cache:
+                    with profile.stage("page_hash"):
+                        key = cache.page_key(_page_content(page))
+                    candidates = cache.get(key)
+                    profile.count("cache_hits" if candidates is not None else "cache_misses")
+                if candidates is None:
+                    candidates = _extract_page_candidates(page, path_stats, profile)
+                    if cache:
+                        cache.put(key, candidates)
                 
-                # Also try text extraction
-                text = page.extract_text()
-                if text:
-                    # Find 8-digit patterns in text
-                    pattern = r'^(\d{8})\s+(.+?)$'
-                    for match in re.finditer(pattern, text, re.MULTILINE):
-                        code = match.group(1)
-                        description = match.group(2).strip()
-                        
-                        # Clean description
-                        description = ' '.join(description.split())
-                        
-                        if code not in hs_codes_set and len(description) > 3:
-                            hs_codes_set.add(code)
-                            
-                            words = description.split()
-                            keywords = []
-                            for w in words:
-                                if len(w) > 3 and w.lower() not in ['the', 'and', 'with', 'from', 'other']:
-                                    keywords.append(w)
-                            keywords = keywords[:7]
-                            
-                            hs_codes.append({
-                                "code": code,
-                                "description": description[:300],
-                                "keywords": keywords
-                            })
+                # First occurrence of a code wins, as in document order
+                with profile.stage("dedupe"):
+                    for item in candidates:
+                        if item["code"] not in hs_codes_set:
+                            hs_codes_set.add(item["code"])
+                            hs_codes.append(item)
+                        else:
+                            profile.count("duplicates")
+                profile.page(page_num, time.perf_counter() - page_start)
                 
                 if page_num % 50 == 0:
                     print(f"  Page {page_num}/{total_pages} - Found {len(hs_codes)} codes so far...")
             
             print(f"✅ PDF processing complete")
+            profile.count("codes", len(hs_codes))
+            for reason, pages in path_stats.items():
+                profile.count(f"table_path_{reason}", pages)
+            parsed = sum(path_stats.values())
+            print(f"🧮 Table detection ran on {path_stats['table']}/{parsed} parsed pages "
+                  f"(skipped: {path_stats['no_ruling_lines']} without ruling lines, "
+                  f"{path_stats['no_codes']} without 8-digit codes)")
     
     except Exception as e:
         print(f"❌ Error reading PDF: {e}")
         return None
     
+    if cache:
+        print_change_report(cache, diff_records(cache.previous_codes, hs_codes), report_path)
+        try:
+            with profile.stage("cache_save"):
+                cache.save(hs_codes)
+        except OSError as e:
+            print(f"⚠️ Could not save page cache: {e}")
+    
     return hs_codes
 
 def main():
     workspace_dir = Path(r"c:\Users\ajayv\Desktop\HS CODE TEST")
-    pdf_path = workspace_dir / "Customs Tariff of India.pdf"
-    output_path = workspace_dir / "hs-codes-database.json"
+    
+    parser = argparse.ArgumentParser(description="Extract HS codes from the Customs Tariff PDF with pdfplumber")
+    parser.add_argument("--pdf", default=str(workspace_dir / "Customs Tariff of India.pdf"),
+                        help="path to the tariff PDF")
+    parser.add_argument("--output", default=str(workspace_dir / "hs-codes-database.json"),
+                        help="path of the JSON database to write")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="per-page cache file; only pages whose content changed are re-extracted")
+    parser.add_argument("--changes-report", metavar="PATH",
+                        help="with --cache, write the added/removed/changed codes as JSON")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage timings, counters and the slowest pages")
+    parser.add_argument("--profile-json", metavar="PATH",
+                        help="write the profile summary as JSON")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="run extraction under cProfile and write the stats to PATH")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="trace allocations during extraction and print the top sites")
+    args = parser.parse_args()
+    
+    pdf_path = Path(args.pdf)
+    output_path = Path(args.output)
+    profile = ExtractionProfile(CACHE_EXTRACTOR)
     
     print("=" * 60)
     print("ADVANCED HS CODE EXTRACTION FROM PDF")
     print("=" * 60)
     
     # Extract codes
-    hs_codes = extract_hs_codes_advanced(str(pdf_path))
+    with capture(args.cprofile, args.tracemalloc):
+        hs_codes = extract_hs_codes_advanced(str(pdf_path), cache_path=args.cache,
+                                             report_path=args.changes_report, profile=profile)
     
     if not hs_codes:
         print("⚠️ No HS codes found")
@@ -127,23 +207,33 @@ def main():
     database = {
         "metadata": {
             "source": "Customs Tariff of India",
-            "extraction_date": "2026-01-26",
+            "extraction_date": datetime.now().isoformat(),
             "total_codes": len(hs_codes),
             "version": "1.0",
+            "pdf_sha256": file_sha256(str(pdf_path)),
             "extraction_method": "pdfplumber with table and text extraction"
         },
         "codes": hs_codes
     }
     
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with profile.stage("write_json"), open(output_path, 'w', encoding='utf-8') as f:
             json.dump(database, f, indent=2, ensure_ascii=False)
         print(f"\n✅ Database created: {output_path}")
+        with profile.stage("write_artifact"):
+            write_search_artifact(database, index_path_for(str(output_path)), str(pdf_path))
+        print(f"✅ Search artifact created: {index_path_for(str(output_path))}")
         print(f"📊 Total codes: {len(hs_codes)}")
         return len(hs_codes)
     except Exception as e:
         print(f"❌ Error creating database: {e}")
         return 0
+    finally:
+        profile.finish()
+        if args.profile:
+            profile.print_report()
+        if args.profile_json:
+            profile.write_json(args.profile_json)
 
 if __name__ == "__main__":
     main()
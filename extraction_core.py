@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Shared extraction core for the HS code extractors and database generator
+Precompiled patterns, keyword extraction and the tariff line parser
+"""
+
+import re
+
+# 8-digit code at the start of a line, separator, then description
+CODE_LINE_PATTERN = re.compile(r'^(\d{8})[\s\-–]+(.*?)$')
+# Continuation lines stop at anything that starts like an HS code
+CODE_PREFIX_PATTERN = re.compile(r'^\d{8}')
+SUB_ITEM_PATTERN = re.compile(r'^[a-z]\)')
+# Table cells and database entries hold exactly one 8-digit code
+HS_CODE_PATTERN = re.compile(r'^\d{8}$')
+# Code lines inside a page of pdfplumber text
+TEXT_CODE_PATTERN = re.compile(r'^(\d{8})\s+(.+?)$', re.MULTILINE)
+EIGHT_DIGIT_PATTERN = re.compile(r'\d{8}')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+KEYWORD_STOPWORDS = frozenset(['the', 'and', 'with', 'from', 'other'])
+MAX_KEYWORDS = 7
+
+def extract_keywords(description):
+    """Important words of a description: longer than 3 chars, not a stopword"""
+    keywords = []
+    for w in description.split():
+        if len(w) > 3 and w.lower() not in KEYWORD_STOPWORDS:
+            keywords.append(w)
+            if len(keywords) == MAX_KEYWORDS:
+                break
+    return keywords
+
+def tokenize(text):
+    """Normalized search tokens: lowercase alphanumeric runs"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def make_record(code, description):
+    """Database record for a code and its (already cleaned) description"""
+    return {
+        "code": code,
+        "description": description[:300],  # Limit to 300 chars
+        "keywords": extract_keywords(description)
+    }
+
+def build_line_record(code, description):
+    """Clean up a description collected from text lines; None if implausible"""
+    description = ' '.join(description.split())
+
+    # Keep if description is reasonable length
+    if not (5 < len(description) < 500):
+        return None
+
+    return make_record(code, description)
+
+class HSLineParser:
+    """Incremental code/continuation-line state machine.
+
+    Lines are fed one at a time. A code line opens a record; following lines
+    extend its description until it reaches 100 characters or the next
+    code-like line, at which point the record is emitted. With dedupe=False
+    every candidate record is emitted and the caller de-duplicates.
+    duplicates, continuations and rejected count skipped repeat codes,
+    merged continuation lines and records failing the length checks.
+    """
+
+    def __init__(self, dedupe=True):
+        self.seen = set() if dedupe else None
+        self.code = None
+        self.description = ""
+        self.duplicates = 0
+        self.continuations = 0
+        self.rejected = 0
+
+    @classmethod
+    def resume(cls, code, description):
+        """Continue a record left open by a parser that ran out of lines"""
+        parser = cls(dedupe=False)
+        parser.code = code
+        parser.description = description
+        return parser
+
+    @property
+    def pending(self):
+        """(code, description) of the open record, or None"""
+        return (self.code, self.description) if self.code else None
+
+    def feed(self, raw_line):
+        """Consume one line, yielding any records it completes"""
+        line = raw_line.strip()
+
+        if self.code:
+            # Stop if next line is another HS code
+            if CODE_PREFIX_PATTERN.match(line):
+                yield from self.close()
+            # Skip lines that look like a header or page number
+            elif line.isdigit() or len(line) < 3:
+                return
+            else:
+                if not SUB_ITEM_PATTERN.match(line):  # Skip sub-items
+                    self.description += ' ' + line
+                    self.continuations += 1
+                if len(self.description) >= 100:
+                    yield from self.close()
+                return
+
+        if not line:
+            return
+
+        code_match = CODE_LINE_PATTERN.match(line)
+        if not code_match:
+            return
+
+        code = code_match.group(1)
+        # Avoid duplicates
+        if self.seen is not None and code in self.seen:
+            self.duplicates += 1
+            return
+
+        self.code = code
+        self.description = code_match.group(2).strip()
+        if len(self.description) >= 100:
+            yield from self.close()
+
+    def close(self):
+        """Emit the open record, if it passes the length checks"""
+        if not self.code:
+            return
+        record = build_line_record(self.code, self.description)
+        self.code = None
+        self.description = ""
+        if not record:
+            self.rejected += 1
+            return
+        if self.seen is not None:
+            self.seen.add(record["code"])
+        yield record
+
+def iter_hs_records(lines):
+    """Yield de-duplicated HS code records from a stream of tariff lines"""
+    parser = HSLineParser()
+    for line in lines:
+        yield from parser.feed(line)
+    yield from parser.close()
+
+def validate_codes(codes_data):
+    """Check code format and uniqueness; returns a list of problems found"""
+    problems = []
+    seen = set()
+    for index, item in enumerate(codes_data):
+        code = item.get("code", "")
+        if not HS_CODE_PATTERN.match(code):
+            problems.append(f"entry {index}: invalid code {code!r}")
+        elif code in seen:
+            problems.append(f"entry {index}: duplicate code {code}")
+        seen.add(code)
+        if not item.get("description"):
+            problems.append(f"entry {index}: missing description for {code}")
+    return problems
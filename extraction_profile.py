@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Timing breakdown for extraction runs
+ExtractionProfile collects per-stage wall-clock timers, counters and
+per-page timings while an extractor runs, and renders them as a --profile
+report or a JSON summary. capture() wraps a call in cProfile and/or
+tracemalloc for function- and allocation-level detail
+"""
+
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+class ExtractionProfile:
+    """Stage timers, counters and page timings of one extraction run"""
+
+    def __init__(self, extractor="", slowest=10):
+        self.extractor = extractor
+        self.slowest = slowest
+        self.stages = {}
+        self.counters = Counter()
+        self.page_times = []
+        self._start = time.perf_counter()
+        self._end = None
+
+    @contextmanager
+    def stage(self, name):
+        """Add the time spent in the with-block to a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def page(self, page_num, seconds):
+        """Record the total time spent on one (1-based) page"""
+        self.page_times.append((seconds, page_num))
+
+    def finish(self):
+        self._end = time.perf_counter()
+
+    @property
+    def total_seconds(self):
+        return (self._end or time.perf_counter()) - self._start
+
+    def summary(self):
+        """Machine-readable run summary"""
+        total = self.total_seconds
+        stages = dict(self.stages)
+        stages["other"] = max(0.0, total - sum(stages.values()))
+        pages = self.counters.get("pages", 0)
+        lines = self.counters.get("lines", 0)
+        return {
+            "extractor": self.extractor,
+            "total_seconds": round(total, 4),
+            "stages": {name: {"seconds": round(seconds, 4),
+                              "share": round(seconds / total, 4) if total else 0.0}
+                       for name, seconds in stages.items()},
+            "pages": pages,
+            "pages_per_sec": round(pages / total, 2) if total else 0.0,
+            "lines": lines,
+            "lines_per_sec": round(lines / total, 2) if total else 0.0,
+            "codes_found": self.counters.get("codes", 0),
+            "duplicates_skipped": self.counters.get("duplicates", 0),
+            "counters": dict(sorted(self.counters.items())),
+            "slowest_pages": [{"page": page_num, "seconds": round(seconds, 4)}
+                              for seconds, page_num in sorted(self.page_times, reverse=True)[:self.slowest]]
+        }
+
+    def print_report(self):
+        summary = self.summary()
+        print("\n" + "=" * 60)
+        print(f"EXTRACTION PROFILE ({summary['extractor']})")
+        print("=" * 60)
+        print(f"⏱️  Total: {summary['total_seconds']:.3f}s  "
+              f"({summary['pages_per_sec']:,.1f} pages/sec, {summary['lines_per_sec']:,.0f} lines/sec)")
+        print("📊 Stages:")
+        for name, stage in summary["stages"].items():
+            print(f"  {name:<16} {stage['seconds']:>10.3f}s  {stage['share']:>6.1%}")
+        print("🔢 Counters:")
+        for name, value in summary["counters"].items():
+            print(f"  {name:<24} {value:>10,}")
+        if summary["slowest_pages"]:
+            print("🐢 Slowest pages:")
+            for page in summary["slowest_pages"]:
+                print(f"  page {page['page']:>5}  {page['seconds'] * 1000:>9.1f} ms")
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        print(f"📝 Profile summary written: {path}")
+
+@contextmanager
+def capture(cprofile_path=None, trace_memory=False, top=15):
+    """Run the with-block under cProfile and/or tracemalloc and print the top entries.
+
+    cprofile_path receives the raw stats (open with pstats or snakeviz).
+    """
+    profiler = cProfile.Profile() if cprofile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+            print(f"\n📝 cProfile stats written: {cprofile_path}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"\n🧠 Peak traced memory: {peak / 2**20:.1f} MB, top allocation sites:")
+            for stat in snapshot.statistics("lineno")[:top]:
+                print(f"  {stat}")
@@ -0,0 +1,89 @@
+// Trigram matcher for misspelled and abbreviated queries ("choc powdr",
+// "frzn veg") over the trigram index of hs-codes-index.json, with the same
+// Dice / abbreviation rules as fuzzy_match.py
+
+export const MIN_TOKEN_LENGTH = 3;
+export const DICE_CUTOFF = 0.5;
+export const PREFIX_SIMILARITY = 0.9;
+export const SUBSEQUENCE_SIMILARITY = 0.75;
+
+// Trigrams of a token padded at the start, so leading letters weigh more
+export function trigrams(token) {
+    const padded = '  ' + token;
+    const grams = new Set();
+    for (let i = 0; i + 3 <= padded.length; i++) {
+        grams.add(padded.substring(i, i + 3));
+    }
+    return grams;
+}
+
+// "choc" -> "chocolate" (prefix), "frzn" -> "frozen" (subsequence)
+export function abbreviationSimilarity(queryToken, token) {
+    if (queryToken.length < MIN_TOKEN_LENGTH || queryToken.length >= token.length) return 0;
+    if (token.startsWith(queryToken)) return PREFIX_SIMILARITY;
+    if (token[0] !== queryToken[0]) return 0;
+    let pos = 0;
+    for (const char of queryToken) {
+        pos = token.indexOf(char, pos) + 1;
+        if (pos === 0) return 0;
+    }
+    return SUBSEQUENCE_SIMILARITY;
+}
+
+export class FuzzyMatcher {
+    // trigramIndex: { vocabulary: [sorted tokens], trigrams: { gram: [token ids] } }
+    constructor(trigramIndex, cutoff = DICE_CUTOFF) {
+        this.vocabulary = trigramIndex.vocabulary;
+        this.trigrams = trigramIndex.trigrams;
+        this.known = new Set(this.vocabulary);
+        this.gramCounts = this.vocabulary.map(token => trigrams(token).size);
+        this.cutoff = cutoff;
+    }
+
+    // Best vocabulary token for a query token, or null below the cutoff
+    matchToken(queryToken) {
+        const { vocabulary, gramCounts } = this;
+        if (this.known.has(queryToken)) return queryToken;
+        if (queryToken.length < MIN_TOKEN_LENGTH) return null;
+
+        // The "  x" first-letter gram is not indexed; a shared first letter adds it back
+        const queryGrams = trigrams(queryToken);
+        const overlaps = new Map();
+        for (const gram of queryGrams) {
+            for (const tokenId of this.trigrams[gram] || []) {
+                overlaps.set(tokenId, (overlaps.get(tokenId) || 0) + 1);
+            }
+        }
+        // Tokens the query is a prefix of sit in one sorted range
+        let lo = 0;
+        let hi = vocabulary.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (vocabulary[mid] < queryToken) lo = mid + 1; else hi = mid;
+        }
+        for (let i = lo; i < vocabulary.length && vocabulary[i].startsWith(queryToken); i++) {
+            if (!overlaps.has(i)) overlaps.set(i, 0);
+        }
+
+        let best = null;
+        let bestSimilarity = this.cutoff;
+        for (const [tokenId, overlap] of overlaps) {
+            const token = vocabulary[tokenId];
+            const shared = overlap + (token[0] === queryToken[0] ? 1 : 0);
+            const similarity = Math.max(2 * shared / (queryGrams.size + gramCounts[tokenId]),
+                                        abbreviationSimilarity(queryToken, token));
+            if (similarity > bestSimilarity || (similarity === bestSimilarity &&
+                (!best || token.length < best.length || (token.length === best.length && token < best)))) {
+                best = token;
+                bestSimilarity = similarity;
+            }
+        }
+        return best;
+    }
+
+    // Query with every token replaced by its closest vocabulary token
+    correct(query) {
+        const tokens = String(query).toLowerCase().match(/[a-z0-9]+/g) || [];
+        return tokens.map(token => this.matchToken(token) || token).join(' ');
+    }
+}
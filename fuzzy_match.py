@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Character trigram matcher for misspelled and abbreviated descriptions
+("choc powdr", "frzn veg"). The generator stores a trigram -> token index
+over the database vocabulary in hs-codes-index.json; query tokens are
+matched to vocabulary tokens by trigram Dice overlap, with a prefix or
+subsequence match counting as an abbreviation, and the corrected query is
+ranked with BM25
+"""
+
+import argparse
+import bisect
+import json
+import time
+from collections import Counter
+from extraction_core import tokenize
+from search_index import build_inverted_index
+
+TRIGRAM_VERSION = 1
+MIN_TOKEN_LENGTH = 3
+DICE_CUTOFF = 0.5
+PREFIX_SIMILARITY = 0.9
+SUBSEQUENCE_SIMILARITY = 0.75
+
+def trigrams(token):
+    """Trigrams of a token padded at the start, so leading letters weigh more"""
+    padded = "  " + token
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_trigram_index(vocabulary):
+    """Serializable trigram -> [vocabulary ids] map over sorted tokens.
+
+    The "  x" gram of the first letter is left out: its lists would hold a
+    whole letter's worth of tokens, and the sorted vocabulary already tells
+    whether two tokens share their first letter.
+    """
+    vocabulary = sorted(vocabulary)
+    grams = {}
+    for token_id, token in enumerate(vocabulary):
+        for gram in trigrams(token):
+            if not gram.startswith("  "):
+                grams.setdefault(gram, []).append(token_id)
+    return {
+        "version": TRIGRAM_VERSION,
+        "vocabulary": vocabulary,
+        "trigrams": {gram: grams[gram] for gram in sorted(grams)}
+    }
+
+def _is_subsequence(short, long):
+    chars = iter(long)
+    return all(c in chars for c in short)
+
+def abbreviation_similarity(query_token, token):
+    """Similarity for abbreviations: "choc" -> "chocolate", "frzn" -> "frozen" """
+    if len(query_token) < MIN_TOKEN_LENGTH or len(query_token) >= len(token):
+        return 0.0
+    if token.startswith(query_token):
+        return PREFIX_SIMILARITY
+    if token[0] == query_token[0] and _is_subsequence(query_token, token):
+        return SUBSEQUENCE_SIMILARITY
+    return 0.0
+
+class FuzzyMatcher:
+    """Resolve noisy query tokens to database vocabulary tokens"""
+
+    def __init__(self, trigram_index, cutoff=DICE_CUTOFF):
+        self.vocabulary = trigram_index["vocabulary"]
+        self.known = set(self.vocabulary)
+        self.trigrams = trigram_index["trigrams"]
+        self.gram_counts = [len(trigrams(token)) for token in self.vocabulary]
+        self.cutoff = cutoff
+
+    @classmethod
+    def from_codes(cls, codes, **params):
+        return cls(build_trigram_index(build_inverted_index(codes)["postings"]), **params)
+
+    @classmethod
+    def load(cls, artifact_path, **params):
+        """Matcher over the trigram index stored in hs-codes-index.json"""
+        with open(artifact_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["trigram_index"], **params)
+
+    def match_token(self, query_token, limit=3):
+        """[(vocabulary token, similarity)] above the cutoff, best first"""
+        if query_token in self.known:
+            return [(query_token, 1.0)]
+        if len(query_token) < MIN_TOKEN_LENGTH:
+            return []
+
+        query_grams = trigrams(query_token)
+        overlaps = Counter()
+        for gram in query_grams:
+            overlaps.update(self.trigrams.get(gram, ()))
+
+        # Tokens the query is a prefix of sit in one sorted range
+        start = bisect.bisect_left(self.vocabulary, query_token)
+        end = bisect.bisect_left(self.vocabulary, query_token + "\uffff")
+        for token_id in range(start, end):
+            overlaps.setdefault(token_id, 0)
+
+        matches = []
+        size = len(query_grams)
+        first = query_token[0]
+        vocabulary = self.vocabulary
+        gram_counts = self.gram_counts
+        for token_id, overlap in overlaps.items():
+            token = vocabulary[token_id]
+            if token[0] != first:
+                # No abbreviation without the first letter, so only Dice can pass
+                if 2 * overlap < self.cutoff * (size + gram_counts[token_id]):
+                    continue
+                matches.append((token, 2 * overlap / (size + gram_counts[token_id])))
+                continue
+            similarity = 2 * (overlap + 1) / (size + gram_counts[token_id])
+            if similarity < PREFIX_SIMILARITY:
+                similarity = max(similarity, abbreviation_similarity(query_token, token))
+            if similarity >= self.cutoff:
+                matches.append((token, similarity))
+        matches.sort(key=lambda match: (-match[1], len(match[0]), match[0]))
+        return matches[:limit]
+
+    def correct(self, query):
+        """Query with each token replaced by its best vocabulary match"""
+        corrected = []
+        for token in tokenize(query):
+            matches = self.match_token(token, 1)
+            corrected.append(matches[0][0] if matches else token)
+        return ' '.join(corrected)
+
+def resolve(matcher, index, query, k=5):
+    """(corrected query, BM25 results) for a noisy query"""
+    corrected = matcher.correct(query)
+    return corrected, index.search(corrected, k)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy-match a noisy product description")
+    parser.add_argument("query", help="product description, typos and abbreviations allowed")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--database", default="hs-codes-database.json")
+    args = parser.parse_args()
+
+    # Imported here so building the trigram index does not need numpy
+    from hs_search import BM25Index
+    index = BM25Index.load(args.database)
+    matcher = FuzzyMatcher.from_codes(index.codes)
+
+    start = time.perf_counter()
+    corrected, results = resolve(matcher, index, args.query, args.k)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🔎 Corrected query: {corrected!r} ({elapsed_ms:.3f} ms)")
+    for result in results:
+        print(f"  {result['code']}  {result['score']:>7.3f}  {result['description'][:70]}")
+
+if __name__ == "__main__":
+    main()
@@ -5,391 +5,152 @@ Based on the official 8-digit HS code system for India
 """
 
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
+from extraction_core import HS_CODE_PATTERN
+from numeric_intervals import parse_thresholds
+from binary_database import write_binary_database, verify_round_trip
+from search_index import index_path_for
+from search_artifact import write_search_artifact
 
-# Comprehensive HS code database
-# Based on Indian Customs Tariff classification system
-HS_CODES_DATA = [
-    # Chapter 1: Live Animals
-    {"code": "01011000", "description": "Horses pure-bred for breeding", "keywords": ["horses", "breeding", "pure-bred"]},
-    {"code": "01012100", "description": "Horses other than pure-bred for breeding, not over 150 kg", "keywords": ["horses", "weight", "breeding"]},
-    {"code": "01019000", "description": "Live animals not specified, equine", "keywords": ["animals", "equine"]},
-    {"code": "01021000", "description": "Bovine animals, pure-bred for breeding", "keywords": ["bovine", "breeding", "cattle"]},
-    {"code": "01022910", "description": "Buffalo calves, not over 100 kg", "keywords": ["buffalo", "calves", "weight"]},
-    {"code": "01022920", "description": "Buffalo, over 100 kg but not over 160 kg", "keywords": ["buffalo", "weight"]},
-    {"code": "01022930", "description": "Buffalo, over 160 kg but not over 300 kg", "keywords": ["buffalo", "weight"]},
-    {"code": "01022990", "description": "Buffalo other weight specifications", "keywords": ["buffalo", "weight"]},
-    {"code": "01029000", "description": "Cattle not specified for breeding", "keywords": ["cattle", "bovine"]},
-    {"code": "01031000", "description": "Swine pure-bred for breeding", "keywords": ["swine", "pig", "breeding"]},
-    {"code": "01032100", "description": "Swine not over 50 kg", "keywords": ["swine", "pig", "weight"]},
-    {"code": "01032200", "description": "Swine over 50 kg", "keywords": ["swine", "pig", "weight"]},
-    {"code": "01039000", "description": "Swine not specified", "keywords": ["swine", "pig"]},
-    {"code": "01041000", "description": "Sheep pure-bred for breeding", "keywords": ["sheep", "breeding"]},
-    {"code": "01042100", "description": "Sheep lambs not over 30 kg", "keywords": ["sheep", "lambs", "weight"]},
-    {"code": "01042200", "description": "Sheep lambs over 30 kg", "keywords": ["sheep", "lambs", "weight"]},
-    {"code": "01042300", "description": "Sheep other than lambs", "keywords": ["sheep"]},
-    {"code": "01051100", "description": "Goats pure-bred for breeding", "keywords": ["goats", "breeding"]},
-    {"code": "01051200", "description": "Goats other than pure-bred for breeding", "keywords": ["goats"]},
-    {"code": "01061100", "description": "Primates for breeding", "keywords": ["primates", "breeding", "animals"]},
-    {"code": "01061200", "description": "Primates not for breeding", "keywords": ["primates"]},
-    
-    # Chapter 2: Meat and Edible Meat Offal
-    {"code": "02011000", "description": "Beef carcasses and half-carcasses", "keywords": ["beef", "carcass", "meat"]},
-    {"code": "02012100", "description": "Beef other cuts with bone, not over 5 kg per unit", "keywords": ["beef", "bone", "meat"]},
-    {"code": "02012200", "description": "Beef other cuts with bone, over 5 kg per unit", "keywords": ["beef", "bone", "meat"]},
-    {"code": "02012300", "description": "Beef boneless cuts", "keywords": ["beef", "boneless", "meat"]},
-    {"code": "02012900", "description": "Beef other cuts", "keywords": ["beef", "meat"]},
-    {"code": "02013000", "description": "Beef salted, dried or smoked", "keywords": ["beef", "processed", "meat"]},
-    {"code": "02021000", "description": "Buffalo meat carcasses and half-carcasses", "keywords": ["buffalo", "meat", "carcass"]},
-    {"code": "02022100", "description": "Buffalo other cuts with bone", "keywords": ["buffalo", "bone", "meat"]},
-    {"code": "02022200", "description": "Buffalo boneless cuts", "keywords": ["buffalo", "boneless", "meat"]},
-    {"code": "02022900", "description": "Buffalo other meat cuts", "keywords": ["buffalo", "meat"]},
-    {"code": "02031100", "description": "Pork carcasses and half-carcasses", "keywords": ["pork", "carcass", "meat"]},
-    {"code": "02031200", "description": "Pork hams and cuts with bone", "keywords": ["pork", "ham", "meat", "bone"]},
-    {"code": "02031300", "description": "Pork loins and cuts with bone", "keywords": ["pork", "loin", "meat"]},
-    {"code": "02031400", "description": "Pork shoulders and cuts with bone", "keywords": ["pork", "shoulder", "meat"]},
-    {"code": "02031900", "description": "Pork other cuts with bone", "keywords": ["pork", "bone", "meat"]},
-    {"code": "02032100", "description": "Pork boneless hams", "keywords": ["pork", "ham", "boneless"]},
-    {"code": "02032200", "description": "Pork boneless loins", "keywords": ["pork", "loin", "boneless"]},
-    {"code": "02032300", "description": "Pork boneless shoulders", "keywords": ["pork", "shoulder", "boneless"]},
-    {"code": "02032900", "description": "Pork boneless cuts", "keywords": ["pork", "boneless"]},
-    {"code": "02033000", "description": "Pork salted, dried or smoked", "keywords": ["pork", "processed"]},
-    
-    # Chapter 3: Fish and Crustaceans
-    {"code": "03011110", "description": "Pacific salmon fresh or chilled, not filleted", "keywords": ["salmon", "fresh", "fish"]},
-    {"code": "03011210", "description": "Pacific salmon fresh or chilled, fillets", "keywords": ["salmon", "fillets", "fish"]},
-    {"code": "03011310", "description": "Pacific salmon fresh or chilled, other forms", "keywords": ["salmon", "fish"]},
-    {"code": "03011910", "description": "Other salmon fresh or chilled, not filleted", "keywords": ["salmon", "fresh", "fish"]},
-    {"code": "03011920", "description": "Other salmon fresh or chilled, fillets", "keywords": ["salmon", "fillets", "fish"]},
-    {"code": "03012100", "description": "Salmon frozen, not filleted", "keywords": ["salmon", "frozen", "fish"]},
-    {"code": "03012210", "description": "Salmon frozen, fillets", "keywords": ["salmon", "fillets", "frozen"]},
-    {"code": "03021110", "description": "Trout fresh or chilled, not filleted", "keywords": ["trout", "fresh", "fish"]},
-    {"code": "03021210", "description": "Trout fresh or chilled, fillets", "keywords": ["trout", "fillets", "fish"]},
-    {"code": "03022110", "description": "Trout frozen, not filleted", "keywords": ["trout", "frozen", "fish"]},
-    {"code": "03022210", "description": "Trout frozen, fillets", "keywords": ["trout", "fillets", "frozen"]},
-    {"code": "03031110", "description": "Cod fresh or chilled, not filleted", "keywords": ["cod", "fresh", "fish"]},
-    {"code": "03031210", "description": "Cod fresh or chilled, fillets", "keywords": ["cod", "fillets", "fish"]},
-    {"code": "03031910", "description": "Cod salted or dried", "keywords": ["cod", "processed", "fish"]},
-    {"code": "03032110", "description": "Cod frozen, not filleted", "keywords": ["cod", "frozen", "fish"]},
-    {"code": "03032210", "description": "Cod frozen, fillets", "keywords": ["cod", "fillets", "frozen"]},
-    {"code": "03034210", "description": "Pollock fresh or chilled, fillets", "keywords": ["pollock", "fillets", "fresh"]},
-    {"code": "03034220", "description": "Pollock frozen, fillets", "keywords": ["pollock", "fillets", "frozen"]},
-    {"code": "03041110", "description": "Herring fresh or chilled, not filleted", "keywords": ["herring", "fresh", "fish"]},
-    {"code": "03041120", "description": "Herring fresh or chilled, filleted", "keywords": ["herring", "fillets", "fresh"]},
-    {"code": "03042110", "description": "Herring frozen, not filleted", "keywords": ["herring", "frozen", "fish"]},
-    {"code": "03051110", "description": "Anchovies fresh or chilled, not filleted", "keywords": ["anchovies", "fresh", "fish"]},
-    {"code": "03061110", "description": "Sardines fresh or chilled, not filleted", "keywords": ["sardines", "fresh", "fish"]},
-    
-    # Chapter 4: Dairy, Eggs, Honey
-    {"code": "04011000", "description": "Cow milk fresh not concentrated", "keywords": ["milk", "dairy", "fresh"]},
-    {"code": "04012100", "description": "Cow milk concentrated not sweetened", "keywords": ["milk", "dairy", "concentrated"]},
-    {"code": "04012200", "description": "Cow milk concentrated sweetened", "keywords": ["milk", "dairy", "sweetened"]},
-    {"code": "04013000", "description": "Cow milk buttermilk", "keywords": ["milk", "buttermilk", "dairy"]},
-    {"code": "04021100", "description": "Cheese fresh unripened not salted", "keywords": ["cheese", "fresh", "dairy"]},
-    {"code": "04021200", "description": "Cheese fresh unripened salted", "keywords": ["cheese", "fresh", "salted"]},
-    {"code": "04022100", "description": "Cheese grated or powdered", "keywords": ["cheese", "grated", "powdered"]},
-    {"code": "04022200", "description": "Cheese processed not grated", "keywords": ["cheese", "processed"]},
-    {"code": "04023000", "description": "Cheese blue-veined", "keywords": ["cheese", "blue", "veined"]},
-    {"code": "04029000", "description": "Cheese other", "keywords": ["cheese"]},
-    {"code": "04031000", "description": "Whey whether or not concentrated", "keywords": ["whey", "dairy"]},
-    {"code": "04041000", "description": "Butter and butterfat", "keywords": ["butter", "butterfat", "dairy"]},
-    {"code": "04051000", "description": "Cream fresh", "keywords": ["cream", "fresh", "dairy"]},
-    {"code": "04052100", "description": "Cream concentrated not sweetened", "keywords": ["cream", "concentrated"]},
-    {"code": "04052200", "description": "Cream concentrated sweetened", "keywords": ["cream", "sweetened"]},
-    {"code": "04061110", "description": "Yogurt concentrated not sweetened", "keywords": ["yogurt", "dairy"]},
-    {"code": "04061120", "description": "Yogurt concentrated sweetened", "keywords": ["yogurt", "sweetened"]},
-    {"code": "04071000", "description": "Lactose and lactose syrup", "keywords": ["lactose", "syrup", "dairy"]},
-    {"code": "04081000", "description": "Casein and caseinates", "keywords": ["casein", "dairy"]},
-    {"code": "04091000", "description": "Egg albumen", "keywords": ["eggs", "albumen", "protein"]},
-    {"code": "04101100", "description": "Eggs in shell fresh preserved", "keywords": ["eggs", "fresh", "shell"]},
-    {"code": "04101200", "description": "Eggs in shell preserved other", "keywords": ["eggs", "preserved", "shell"]},
-    {"code": "04101900", "description": "Eggs in shell other", "keywords": ["eggs", "shell"]},
-    {"code": "04109000", "description": "Honey natural", "keywords": ["honey", "natural"]},
-    
-    # Chapter 5: Products of Animal Origin
-    {"code": "05010000", "description": "Cochineal and lac insects", "keywords": ["insects", "dye"]},
-    {"code": "05021000", "description": "Ivory", "keywords": ["ivory"]},
-    {"code": "05030000", "description": "Horsehair and waste", "keywords": ["horsehair", "fibers"]},
-    {"code": "05040000", "description": "Gut bladder and stomachs", "keywords": ["casings", "gut"]},
-    {"code": "05051000", "description": "Feathers feather waste", "keywords": ["feathers", "down"]},
-    {"code": "05052000", "description": "Down soft plumage", "keywords": ["down", "plumage", "feathers"]},
-    {"code": "05061000", "description": "Bones bone meal demineralized", "keywords": ["bones", "mineral"]},
-    {"code": "05071000", "description": "Skins and other hides raw", "keywords": ["hides", "skins", "leather"]},
-    {"code": "05071100", "description": "Fish skins raw", "keywords": ["fish", "skins"]},
-    {"code": "05080000", "description": "Coral and similar materials", "keywords": ["coral", "shells"]},
-    {"code": "05090000", "description": "Ambergris musk and other", "keywords": ["ambergris", "musk"]},
-    {"code": "05100000", "description": "Shells and snail waste", "keywords": ["shells", "snails"]},
-    {"code": "05110000", "description": "Animal products not specified", "keywords": ["animal", "products"]},
-    
-    # Chapter 6: Trees, Plants, Flowers
-    {"code": "06011000", "description": "Bulbs corms and tubers dormant", "keywords": ["bulbs", "tubers", "plants"]},
-    {"code": "06011200", "description": "Orchid seeds", "keywords": ["orchids", "seeds", "plants"]},
-    {"code": "06021000", "description": "Roses fresh cut flowers", "keywords": ["roses", "flowers", "fresh"]},
-    {"code": "06022100", "description": "Carnations fresh cut flowers", "keywords": ["carnations", "flowers", "fresh"]},
-    {"code": "06022200", "description": "Chrysanthemums fresh cut flowers", "keywords": ["chrysanthemums", "flowers"]},
-    {"code": "06022300", "description": "Tulips fresh cut flowers", "keywords": ["tulips", "flowers", "fresh"]},
-    {"code": "06022400", "description": "Lilies fresh cut flowers", "keywords": ["lilies", "flowers"]},
-    {"code": "06022500", "description": "Sunflowers fresh cut flowers", "keywords": ["sunflowers", "flowers"]},
-    {"code": "06023000", "description": "Orchids fresh cut flowers", "keywords": ["orchids", "flowers", "fresh"]},
-    {"code": "06024000", "description": "Cut foliage and flowers", "keywords": ["foliage", "flowers"]},
-    {"code": "06029000", "description": "Cut flowers and foliage other", "keywords": ["flowers", "plants"]},
-    {"code": "06031000", "description": "Dried flowers foliage grasses", "keywords": ["dried", "flowers"]},
-    {"code": "06041000", "description": "Mosses and lichens", "keywords": ["moss", "lichens", "plants"]},
-    {"code": "06049000", "description": "Plant material other", "keywords": ["plants", "material"]},
-    
-    # Chapter 7: Vegetables
-    {"code": "07011000", "description": "Potatoes seed", "keywords": ["potatoes", "seed", "vegetables"]},
-    {"code": "07019000", "description": "Potatoes fresh or chilled other", "keywords": ["potatoes", "fresh", "vegetables"]},
-    {"code": "07031000", "description": "Onions fresh or chilled", "keywords": ["onions", "fresh", "vegetables"]},
-    {"code": "07032000", "description": "Garlic fresh or chilled", "keywords": ["garlic", "fresh", "vegetables"]},
-    {"code": "07041000", "description": "Cauliflower fresh or chilled", "keywords": ["cauliflower", "fresh", "vegetables"]},
-    {"code": "07042000", "description": "Broccoli fresh or chilled", "keywords": ["broccoli", "fresh", "vegetables"]},
-    {"code": "07051100", "description": "Lettuce fresh or chilled, cabbage head", "keywords": ["lettuce", "cabbage", "fresh"]},
-    {"code": "07051200", "description": "Lettuce fresh or chilled other", "keywords": ["lettuce", "fresh"]},
-    {"code": "07051300", "description": "Chicory fresh or chilled", "keywords": ["chicory", "fresh", "vegetables"]},
-    {"code": "07061000", "description": "Carrots fresh or chilled", "keywords": ["carrots", "fresh", "vegetables"]},
-    {"code": "07071000", "description": "Turnips fresh or chilled", "keywords": ["turnips", "fresh", "vegetables"]},
-    {"code": "07081000", "description": "Peas fresh or chilled", "keywords": ["peas", "fresh", "vegetables"]},
-    {"code": "07082000", "description": "Beans fresh or chilled", "keywords": ["beans", "fresh", "vegetables"]},
-    {"code": "07091000", "description": "Corn fresh or chilled", "keywords": ["corn", "maize", "fresh"]},
-    {"code": "07101100", "description": "Tomatoes fresh or chilled", "keywords": ["tomatoes", "fresh", "vegetables"]},
-    {"code": "07111000", "description": "Cucumbers fresh or chilled", "keywords": ["cucumbers", "fresh", "vegetables"]},
-    {"code": "07112000", "description": "Gherkins fresh or chilled", "keywords": ["gherkins", "fresh", "vegetables"]},
-    {"code": "07131000", "description": "Mushrooms fresh or chilled", "keywords": ["mushrooms", "fresh"]},
-    {"code": "07141000", "description": "Peppers fresh or chilled", "keywords": ["peppers", "chilli", "fresh"]},
-    {"code": "07151000", "description": "Spinach fresh or chilled", "keywords": ["spinach", "fresh", "vegetables"]},
-    
-    # Chapter 8: Fruits
-    {"code": "08011100", "description": "Coconuts fresh or dried not husked", "keywords": ["coconuts", "fruits"]},
-    {"code": "08011200", "description": "Coconuts dried husked and shelled", "keywords": ["coconuts", "dried", "fruits"]},
-    {"code": "08012000", "description": "Brazil nuts fresh or dried", "keywords": ["brazil nuts", "nuts", "fruits"]},
-    {"code": "08021100", "description": "Bananas fresh", "keywords": ["bananas", "fresh", "fruits"]},
-    {"code": "08021200", "description": "Bananas dried", "keywords": ["bananas", "dried", "fruits"]},
-    {"code": "08031000", "description": "Pineapples fresh", "keywords": ["pineapples", "fresh", "fruits"]},
-    {"code": "08032000", "description": "Pineapples dried", "keywords": ["pineapples", "dried", "fruits"]},
-    {"code": "08041000", "description": "Avocados fresh", "keywords": ["avocados", "fresh", "fruits"]},
-    {"code": "08051000", "description": "Guavas mangoes fresh", "keywords": ["guavas", "mangoes", "fresh"]},
-    {"code": "08052100", "description": "Guavas mangoes dried", "keywords": ["guavas", "mangoes", "dried"]},
-    {"code": "08061100", "description": "Grapes fresh", "keywords": ["grapes", "fresh", "fruits"]},
-    {"code": "08061200", "description": "Grapes dried raisins", "keywords": ["grapes", "raisins", "dried"]},
-    {"code": "08071100", "description": "Melons fresh", "keywords": ["melons", "fresh", "fruits"]},
-    {"code": "08081000", "description": "Apples fresh", "keywords": ["apples", "fresh", "fruits"]},
-    {"code": "08082000", "description": "Apples dried", "keywords": ["apples", "dried", "fruits"]},
-    {"code": "08091000", "description": "Apricots fresh", "keywords": ["apricots", "fresh", "fruits"]},
-    {"code": "08092100", "description": "Apricots dried", "keywords": ["apricots", "dried", "fruits"]},
-    {"code": "08093000", "description": "Cherries fresh", "keywords": ["cherries", "fresh", "fruits"]},
-    {"code": "08094100", "description": "Peaches fresh", "keywords": ["peaches", "fresh", "fruits"]},
-    {"code": "08095000", "description": "Plums fresh", "keywords": ["plums", "fresh", "fruits"]},
-    
-    # Chapter 9: Coffee Tea Spices
-    {"code": "09011100", "description": "Coffee not roasted not decaffeinated", "keywords": ["coffee", "beans"]},
-    {"code": "09011200", "description": "Coffee not roasted decaffeinated", "keywords": ["coffee", "decaffeinated"]},
-    {"code": "09012100", "description": "Coffee roasted not decaffeinated", "keywords": ["coffee", "roasted"]},
-    {"code": "09012200", "description": "Coffee roasted decaffeinated", "keywords": ["coffee", "roasted", "decaffeinated"]},
-    {"code": "09021000", "description": "Tea black fermented", "keywords": ["tea", "black", "beverage"]},
-    {"code": "09021100", "description": "Tea black fermented in packages not exceeding 3kg", "keywords": ["tea", "black", "packaged"]},
-    {"code": "09021200", "description": "Tea black fermented other", "keywords": ["tea", "black"]},
-    {"code": "09022000", "description": "Tea green unfermented", "keywords": ["tea", "green"]},
-    {"code": "09023000", "description": "Tea partly fermented oolong", "keywords": ["tea", "oolong"]},
-    {"code": "09024000", "description": "Tea herbal infusions", "keywords": ["tea", "herbal"]},
-    {"code": "09030000", "description": "Mate tea leaves", "keywords": ["mate", "tea"]},
-    {"code": "09041100", "description": "Pepper not crushed or ground", "keywords": ["pepper", "spice"]},
-    {"code": "09041200", "description": "Pepper crushed or ground", "keywords": ["pepper", "ground", "spice"]},
-    {"code": "09042100", "description": "Pimiento pepper fresh not dried", "keywords": ["pimiento", "pepper", "spice"]},
-    {"code": "09042200", "description": "Pimiento pepper dried not ground", "keywords": ["pimiento", "pepper", "dried"]},
-    {"code": "09050000", "description": "Vanilla pods", "keywords": ["vanilla", "spice"]},
-    {"code": "09061100", "description": "Cinnamon bark dried", "keywords": ["cinnamon", "spice", "bark"]},
-    {"code": "09061200", "description": "Cinnamon other plant material", "keywords": ["cinnamon", "spice"]},
-    {"code": "09070100", "description": "Cloves whole", "keywords": ["cloves", "spice"]},
-    {"code": "09070200", "description": "Cloves other forms", "keywords": ["cloves", "spice"]},
-    {"code": "09081000", "description": "Nutmeg seeds", "keywords": ["nutmeg", "spice"]},
-    {"code": "09091000", "description": "Anise seeds", "keywords": ["anise", "spice"]},
-    {"code": "09091100", "description": "Coriander seeds", "keywords": ["coriander", "spice"]},
-    {"code": "09091200", "description": "Cumin seeds", "keywords": ["cumin", "spice"]},
-    {"code": "09091300", "description": "Caraway seeds", "keywords": ["caraway", "spice"]},
-    {"code": "09091400", "description": "Fennel seeds", "keywords": ["fennel", "spice"]},
-    {"code": "09091500", "description": "Juniper berries", "keywords": ["juniper", "spice"]},
-    {"code": "09091600", "description": "Fenugreek seeds", "keywords": ["fenugreek", "spice"]},
-    
-    # Chapter 10: Cereals
-    {"code": "10011000", "description": "Wheat seed for sowing", "keywords": ["wheat", "grain", "cereals"]},
-    {"code": "10019100", "description": "Wheat for milling", "keywords": ["wheat", "milling", "cereals"]},
-    {"code": "10019200", "description": "Wheat other than milling", "keywords": ["wheat", "cereals"]},
-    {"code": "10021000", "description": "Rye seed", "keywords": ["rye", "grain", "cereals"]},
-    {"code": "10029000", "description": "Rye other", "keywords": ["rye", "cereals"]},
-    {"code": "10031000", "description": "Barley seed", "keywords": ["barley", "grain", "cereals"]},
-    {"code": "10039000", "description": "Barley other", "keywords": ["barley", "cereals"]},
-    {"code": "10041000", "description": "Oats seed", "keywords": ["oats", "grain", "cereals"]},
-    {"code": "10049000", "description": "Oats other", "keywords": ["oats", "cereals"]},
-    {"code": "10051000", "description": "Corn seed", "keywords": ["corn", "maize", "seed"]},
-    {"code": "10059000", "description": "Corn other", "keywords": ["corn", "maize", "cereals"]},
-    {"code": "10061000", "description": "Rice in husk", "keywords": ["rice", "cereals"]},
-    {"code": "10062000", "description": "Rice husked", "keywords": ["rice", "milled", "cereals"]},
-    {"code": "10063000", "description": "Rice semi-milled or wholly milled", "keywords": ["rice", "white", "cereals"]},
-    {"code": "10064000", "description": "Rice broken", "keywords": ["rice", "broken", "cereals"]},
-    {"code": "10070000", "description": "Grain sorghum", "keywords": ["sorghum", "grain", "cereals"]},
-    {"code": "10081000", "description": "Buckwheat", "keywords": ["buckwheat", "grain", "cereals"]},
-    {"code": "10082000", "description": "Millet grain", "keywords": ["millet", "grain", "cereals"]},
-    {"code": "10083000", "description": "Canary seed", "keywords": ["canary seed", "grain"]},
-    {"code": "10089000", "description": "Other cereals", "keywords": ["cereals", "grain"]},
-    
-    # Chapter 11: Milling Products
-    {"code": "11010000", "description": "Wheat flour milling products", "keywords": ["wheat flour", "milling"]},
-    {"code": "11021000", "description": "Corn flour milling products", "keywords": ["corn flour", "milling"]},
-    {"code": "11030000", "description": "Tapioca and tapioca substitutes", "keywords": ["tapioca", "starch"]},
-    {"code": "11041100", "description": "Oat grits and meal not roasted", "keywords": ["oats", "flour"]},
-    {"code": "11041200", "description": "Oat grits and meal roasted", "keywords": ["oats", "roasted"]},
-    {"code": "11050000", "description": "Corn germ separated not roasted", "keywords": ["corn", "germ"]},
-    {"code": "11061000", "description": "Flour and meal legume not heat-treated", "keywords": ["legume", "flour"]},
-    {"code": "11062000", "description": "Flour and meal legume heat-treated", "keywords": ["legume", "flour", "heat-treated"]},
-    {"code": "11071000", "description": "Malt not roasted", "keywords": ["malt", "grain"]},
-    {"code": "11072000", "description": "Malt roasted", "keywords": ["malt", "roasted"]},
-    {"code": "11081100", "description": "Wheat starch", "keywords": ["starch", "wheat"]},
-    {"code": "11081200", "description": "Corn starch", "keywords": ["starch", "corn"]},
-    {"code": "11081300", "description": "Potato starch", "keywords": ["starch", "potato"]},
-    {"code": "11081400", "description": "Cassava starch", "keywords": ["starch", "cassava"]},
-    {"code": "11081900", "description": "Starch other", "keywords": ["starch"]},
-    {"code": "11082000", "description": "Starch inulin", "keywords": ["starch", "inulin"]},
-    
-    # Continuing with more chapters for 500+ codes total
-    {"code": "12010000", "description": "Groundnuts not shelled, not roasted", "keywords": ["groundnuts", "peanuts"]},
-    {"code": "12020000", "description": "Groundnuts shelled not roasted", "keywords": ["groundnuts", "peanuts", "kernels"]},
-    {"code": "12030000", "description": "Groundnuts roasted", "keywords": ["groundnuts", "peanuts", "roasted"]},
-    {"code": "12040000", "description": "Soyabeans not roasted", "keywords": ["soybeans", "legume"]},
-    {"code": "12050000", "description": "Copra coconut", "keywords": ["copra", "coconut"]},
-    {"code": "12060000", "description": "Sunflower seeds", "keywords": ["sunflower", "seeds", "oilseeds"]},
-    {"code": "12070000", "description": "Palm nuts and kernels", "keywords": ["palm", "nuts", "kernels"]},
-    {"code": "12081000", "description": "Cotton seed", "keywords": ["cotton", "seed"]},
-    {"code": "12090000", "description": "Sesame seeds", "keywords": ["sesame", "seeds", "oilseeds"]},
-    {"code": "12101000", "description": "Hop cones", "keywords": ["hops", "brewing"]},
-    {"code": "12102000", "description": "Hop cones powder or pellets", "keywords": ["hops", "processed"]},
-    
-    # Chapter 13: Lacquer, Gums, Resins
-    {"code": "13011000", "description": "Shellac natural gum", "keywords": ["shellac", "resin"]},
-    {"code": "13012100", "description": "Latex rubber liquid", "keywords": ["latex", "rubber"]},
-    {"code": "13012200", "description": "Latex rubber pre-vulcanized", "keywords": ["latex", "rubber"]},
-    {"code": "13023100", "description": "Gum Arabic", "keywords": ["gum arabic", "natural"]},
-    {"code": "13023200", "description": "Gum other natural", "keywords": ["gum", "natural"]},
-    {"code": "13024100", "description": "Rosin turpentine products", "keywords": ["rosin", "turpentine"]},
-    {"code": "13024200", "description": "Rosin derivatives", "keywords": ["rosin", "derivatives"]},
-    {"code": "13024300", "description": "Rosin dipentene products", "keywords": ["rosin", "products"]},
-    {"code": "13025000", "description": "amber and amber gum", "keywords": ["amber", "fossil"]},
-    
-    # Chapter 14: Vegetable Plaiting Materials
-    {"code": "14041100", "description": "Rattan splitting plaited strips", "keywords": ["rattan", "strips"]},
-    {"code": "14041200", "description": "Bamboo splitting plaited strips", "keywords": ["bamboo", "strips"]},
-    {"code": "14041300", "description": "Palm and other material strips", "keywords": ["palm", "strips"]},
-    
-    # Chapter 15: Edible Oils
-    {"code": "15071100", "description": "Rapeseed oil crude", "keywords": ["rapeseed oil", "edible oil"]},
-    {"code": "15071200", "description": "Rapeseed oil refined", "keywords": ["rapeseed oil", "refined"]},
-    {"code": "15081100", "description": "Sunflower oil crude", "keywords": ["sunflower oil", "edible oil"]},
-    {"code": "15081200", "description": "Sunflower oil refined", "keywords": ["sunflower oil", "refined"]},
-    {"code": "15091000", "description": "Olive oil virgin", "keywords": ["olive oil", "virgin", "extra"]},
-    {"code": "15091200", "description": "Olive oil refined", "keywords": ["olive oil", "refined"]},
-    {"code": "15100000", "description": "Other oils plant fixed", "keywords": ["plant oils", "edible"]},
-    {"code": "15110000", "description": "Oil lard rendered", "keywords": ["animal oil", "lard"]},
-    {"code": "15120000", "description": "Animal oil other", "keywords": ["animal oil", "edible"]},
-    {"code": "15130000", "description": "Margarine shortening", "keywords": ["margarine", "vegetable fat"]},
-    {"code": "15140000", "description": "Tallow fat rendered", "keywords": ["tallow", "animal fat"]},
-    {"code": "15150000", "description": "Fat grease not chemically modified", "keywords": ["fat", "grease"]},
-    {"code": "15160000", "description": "Vegetable wax fat hydrogenated", "keywords": ["wax", "hydrogenated"]},
-    {"code": "15170000", "description": "Residues oil refining", "keywords": ["oil residues", "refining"]},
-    {"code": "15180000", "description": "Fats fat products mixed", "keywords": ["mixed fats", "food"]},
-    
-    # Chapter 16: Meat Preparations
-    {"code": "16010000", "description": "Sausages meat products", "keywords": ["sausages", "meat", "processed"]},
-    {"code": "16020000", "description": "Prepared meat other", "keywords": ["meat", "prepared", "processed"]},
-    {"code": "16030000", "description": "Meat extract meat juice", "keywords": ["extract", "meat", "juice"]},
-    {"code": "16041100", "description": "Fish fillets cooked", "keywords": ["fish", "fillets", "cooked"]},
-    {"code": "16041200", "description": "Fish fillets other preparation", "keywords": ["fish", "fillets", "prepared"]},
-    {"code": "16042000", "description": "Fish prepared other", "keywords": ["fish", "prepared"]},
-    {"code": "16043000", "description": "Caviar substitutes", "keywords": ["caviar", "fish roe"]},
-    {"code": "16051000", "description": "Crustacean meat prepared", "keywords": ["crustacean", "prepared"]},
-    
-    # Chapter 17: Sugars and Sugar Confectionery
-    {"code": "17011100", "description": "Cane sugar raw not refined", "keywords": ["sugar", "cane", "raw"]},
-    {"code": "17011200", "description": "Cane sugar other specified", "keywords": ["sugar", "cane"]},
-    {"code": "17011300", "description": "Beet sugar raw not refined", "keywords": ["sugar", "beet", "raw"]},
-    {"code": "17012000", "description": "Sugar refined", "keywords": ["sugar", "refined", "white"]},
-    {"code": "17013000", "description": "Sugar cube form molded", "keywords": ["sugar", "cube", "molded"]},
-    {"code": "17014000", "description": "Sugar products caramel", "keywords": ["sugar", "caramel", "products"]},
-    {"code": "17021000", "description": "Lactose milk sugar", "keywords": ["lactose", "milk sugar"]},
-    {"code": "17022000", "description": "Maple sugar syrup", "keywords": ["maple", "sugar", "syrup"]},
-    {"code": "17023000", "description": "Glucose and glucose syrup", "keywords": ["glucose", "syrup"]},
-    {"code": "17029000", "description": "Sugar sugar products other", "keywords": ["sugar", "products"]},
-    {"code": "17031000", "description": "Molasses blackstrap", "keywords": ["molasses", "byproduct"]},
-    {"code": "17040000", "description": "Chewing gum", "keywords": ["gum", "confectionery"]},
-    {"code": "17051000", "description": "Chocolate not containing cocoa butter", "keywords": ["chocolate", "confectionery"]},
-    {"code": "17051200", "description": "Chocolate other containing cocoa", "keywords": ["chocolate", "confectionery"]},
-    
-    # Chapter 18: Cocoa and Cocoa Preparations
-    {"code": "18010000", "description": "Cocoa beans fermented dried", "keywords": ["cocoa", "beans"]},
-    {"code": "18020000", "description": "Cocoa shells husks waste", "keywords": ["cocoa", "shells", "waste"]},
-    {"code": "18031000", "description": "Cocoa paste non-defatted", "keywords": ["cocoa", "paste"]},
-    {"code": "18032000", "description": "Cocoa paste wholly or partly defatted", "keywords": ["cocoa", "paste", "defatted"]},
-    {"code": "18040000", "description": "Cocoa butter", "keywords": ["cocoa butter", "fat"]},
-    {"code": "18050000", "description": "Cocoa powder unsweetened", "keywords": ["cocoa powder", "unsweetened"]},
-    {"code": "18061000", "description": "Chocolate containing cocoa 2000mg or less per kg", "keywords": ["chocolate", "cocoa"]},
-    {"code": "18062000", "description": "Chocolate containing cocoa other", "keywords": ["chocolate", "cocoa"]},
-    
-    # Chapter 19: Grain Mill Products and Malt Extract
-    {"code": "19011000", "description": "Malt extract not containing cocoa", "keywords": ["malt extract", "beverage"]},
-    {"code": "19012000", "description": "Malt extract containing cocoa", "keywords": ["malt extract", "cocoa"]},
-    {"code": "19021100", "description": "Pasta uncooked unfilled not stuffed", "keywords": ["pasta", "wheat"]},
-    {"code": "19021200", "description": "Pasta uncooked egg containing", "keywords": ["pasta", "egg"]},
-    {"code": "19022000", "description": "Pasta cooked stuffed", "keywords": ["pasta", "ravioli", "cooked"]},
-    {"code": "19023000", "description": "Tapioca and starch preparations", "keywords": ["tapioca", "starch"]},
-    {"code": "19024000", "description": "Cereal preparations breakfast", "keywords": ["cereal", "breakfast"]},
-    
-    # More product categories for comprehensive coverage
-    {"code": "20011000", "description": "Vegetable preserve homogenized", "keywords": ["preserve", "vegetable"]},
-    {"code": "20012000", "description": "Vegetable preserve not homogenized", "keywords": ["preserve", "vegetable"]},
-    {"code": "20019000", "description": "Vegetable preserved other", "keywords": ["vegetable", "preserved"]},
-    {"code": "20021000", "description": "Tomato juice", "keywords": ["tomato", "juice"]},
-    {"code": "20029000", "description": "Vegetable juice other", "keywords": ["vegetable juice", "beverage"]},
-    {"code": "20030000", "description": "Vegetable juice mixed", "keywords": ["vegetable juice", "mixed"]},
-    {"code": "20041000", "description": "Vegetable pickled frozen", "keywords": ["pickled", "frozen vegetable"]},
-    {"code": "20049000", "description": "Vegetable other preserved", "keywords": ["vegetable", "preserved"]},
-    {"code": "20051100", "description": "Homogenized vegetable preparations", "keywords": ["vegetable", "homogenized"]},
-    {"code": "20059000", "description": "Vegetable preparations other", "keywords": ["vegetable", "prepared"]},
-    {"code": "20061000", "description": "Fruit vegetable homogenized", "keywords": ["fruit vegetable", "homogenized"]},
-    {"code": "20069000", "description": "Fruit vegetable preserved other", "keywords": ["fruit vegetable", "preserved"]},
-    {"code": "20071000", "description": "Jams marmalades paste puree", "keywords": ["jam", "marmalade", "preserve"]},
-    {"code": "20079000", "description": "Fruit preparations other", "keywords": ["fruit", "prepared"]},
-    {"code": "20081100", "description": "Peanut butter", "keywords": ["peanut butter", "spread"]},
-    {"code": "20081900", "description": "Fruit paste other", "keywords": ["fruit", "paste"]},
-    {"code": "20082000", "description": "Fruit juice concentrate", "keywords": ["juice", "concentrate"]},
-    {"code": "20083000", "description": "Fruit juice not fermented", "keywords": ["fruit juice", "beverage"]},
-    {"code": "20084000", "description": "Grape juice", "keywords": ["grape juice", "beverage"]},
-    {"code": "20085000", "description": "Apple juice", "keywords": ["apple juice", "beverage"]},
-    {"code": "20086000", "description": "Pineapple juice", "keywords": ["pineapple juice", "beverage"]},
-    {"code": "20087000", "description": "Orange juice", "keywords": ["orange juice", "beverage"]},
-    {"code": "20088000", "description": "Juice other citrus", "keywords": ["citrus juice", "beverage"]},
-    {"code": "20089000", "description": "Fruit juice other", "keywords": ["fruit juice", "beverage"]},
-]
+# Chapter titles for the code hierarchy, keyed by 2-digit chapter
+CHAPTER_TITLES = {
+    "01": "Live Animals",
+    "02": "Meat and Edible Meat Offal",
+    "03": "Fish and Crustaceans",
+    "04": "Dairy, Eggs, Honey",
+    "05": "Products of Animal Origin",
+    "06": "Trees, Plants, Flowers",
+    "07": "Vegetables",
+    "08": "Fruits",
+    "09": "Coffee Tea Spices",
+    "10": "Cereals",
+    "11": "Milling Products",
+    "12": "Oil Seeds and Oleaginous Fruits",
+    "13": "Lacquer, Gums, Resins",
+    "14": "Vegetable Plaiting Materials",
+    "15": "Edible Oils",
+    "16": "Meat Preparations",
+    "17": "Sugars and Sugar Confectionery",
+    "18": "Cocoa and Cocoa Preparations",
+    "19": "Grain Mill Products and Malt Extract",
+    "20": "Preparations of Vegetables, Fruit and Nuts",
+}
 
-def create_database(output_path, codes_data):
-    """Create comprehensive HS code database"""
-    
+# Comprehensive HS code database, one code per line of a tab-separated file
+# (code, description, "|"-joined keywords), based on the Indian Customs
+# Tariff classification system. It is streamed on demand instead of living in
+# this module as literals, so importing the module stays cheap as it grows
+SEED_DATA_PATH = Path(__file__).with_name("hs_codes_data.tsv")
+KEYWORD_SEPARATOR = "|"
+
+def iter_hs_codes(path=SEED_DATA_PATH):
+    """Yield {"code", "description", "keywords"} records of a seed data file, one line at a time
+
+    Blank lines and "#" comments are skipped. Raises ValueError at the first
+    malformed line, invalid or duplicate code, or missing description.
+    """
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            fields = line.split('\t')
+            if len(fields) != 3:
+                raise ValueError(f"{path}:{line_num}: expected 3 tab-separated fields, found {len(fields)}")
+            code, description, keywords = fields
+            if not HS_CODE_PATTERN.match(code):
+                raise ValueError(f"{path}:{line_num}: invalid code {code!r}")
+            if code in seen:
+                raise ValueError(f"{path}:{line_num}: duplicate code {code}")
+            if not description:
+                raise ValueError(f"{path}:{line_num}: missing description for {code}")
+            seen.add(code)
+            yield {"code": code, "description": description,
+                   "keywords": keywords.split(KEYWORD_SEPARATOR) if keywords else []}
+
+def load_hs_codes(path=SEED_DATA_PATH):
+    return list(iter_hs_codes(path))
+
+def _check_seed_field(item, name, value):
+    if '\t' in value or '\n' in value or '\r' in value:
+        raise ValueError(f"{item['code']}: {name} {value!r} contains a tab or line break")
+
+def write_hs_codes(path, codes):
+    """Write records in the seed data format; returns the number written
+
+    Raises ValueError for a record iter_hs_codes could not read back the
+    same: a tab or line break in any field, or a keyword that is empty or
+    holds the keyword separator.
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for count, item in enumerate(codes, 1):
+            keywords = item.get('keywords', [])
+            _check_seed_field(item, "code", item['code'])
+            _check_seed_field(item, "description", item['description'])
+            for keyword in keywords:
+                _check_seed_field(item, "keyword", keyword)
+                if not keyword or KEYWORD_SEPARATOR in keyword:
+                    raise ValueError(f"{item['code']}: keyword {keyword!r} is empty or contains "
+                                     f"{KEYWORD_SEPARATOR!r}")
+            f.write(f"{item['code']}\t{item['description']}\t{KEYWORD_SEPARATOR.join(keywords)}\n")
+    return count
+
+def __getattr__(name):
+    """HS_CODES_DATA stays importable, read from the data file on first access"""
+    if name == "HS_CODES_DATA":
+        codes = globals()["HS_CODES_DATA"] = load_hs_codes()
+        return codes
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def binary_path_for(output_path):
+    """Path of the compact binary database written next to the JSON one"""
+    return str(Path(output_path).with_suffix('.bin'))
+
+def write_database_json(output_path, database):
+    """Write a {"metadata", "codes"} database incrementally, one code record per line
+
+    Each record goes through the C JSON encoder and straight to the file,
+    instead of json.dump's pure-Python indenting encoder walking the whole
+    document.
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        metadata = json.dumps(database["metadata"], indent=2, ensure_ascii=False)
+        f.write('{\n  "metadata": ' + metadata.replace('\n', '\n  ') + ',\n  "codes": [')
+        for position, item in enumerate(database["codes"]):
+            f.write((',\n    ' if position else '\n    ') + json.dumps(item, ensure_ascii=False))
+        f.write('\n  ]\n}\n')
+
+def create_database(output_path, codes_data, metadata=None):
+    """Create comprehensive HS code database (JSON, compact binary copy and search index)
+
+    codes_data may be any iterable of records, e.g. iter_hs_codes(); the
+    binary copy and search index need every record, so it is read once into
+    a list. metadata overrides or extends the default metadata fields.
+    """
+    codes = codes_data if isinstance(codes_data, list) else list(codes_data)
     database = {
         "metadata": {
             "source": "Indian Customs Tariff Official Classification",
             "extraction_date": datetime.now().isoformat(),
-            "total_codes": len(codes_data),
+            "total_codes": len(codes),
             "version": "2.0",
             "extraction_method": "Official tariff schedule extraction",
             "chapters_covered": "1-20 (Food, Beverages, Oils)",
-            "production_ready": True
+            "production_ready": True,
+            **(metadata or {})
         },
-        "codes": codes_data
+        "codes": codes
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(database, f, indent=2, ensure_ascii=False)
+    write_database_json(output_path, database)
+    write_binary_database(database, binary_path_for(output_path))
+    write_search_artifact(database, index_path_for(output_path), chapter_titles=CHAPTER_TITLES)
     
-    return len(codes_data)
+    return len(codes)
 
 def main():
     output_path = Path(r"c:\Users\ajayv\Desktop\HS CODE TEST\hs-codes-database.json")
@@ -397,12 +158,20 @@ def main():
     print("=" * 70)
     print("PRODUCTION HS CODE DATABASE GENERATION")
     print("=" * 70)
-    print(f"\n📊 Generating database with {len(HS_CODES_DATA)} HS codes...")
+    try:
+        codes = load_hs_codes()
+    except ValueError as e:
+        print(f"❌ Invalid seed data: {e}")
+        return
+    print(f"\n📊 Generating database with {len(codes)} HS codes from {SEED_DATA_PATH.name}...")
     
-    count = create_database(str(output_path), HS_CODES_DATA)
+    count = create_database(str(output_path), codes)
     
     print(f"\n✅ DATABASE CREATED SUCCESSFULLY")
     print(f"📁 File: {output_path}")
+    print(f"📁 Binary: {binary_path_for(output_path)}")
+    print(f"📁 Search index: {index_path_for(output_path)}")
+    print(f"📏 Codes with numeric ranges: {sum(1 for item in codes if parse_thresholds(item['description']))}")
     print(f"📊 Total codes: {count}")
     print(f"📋 Chapters covered: 1-20 (Food, Beverages, Oils)")
     print(f"✨ Production ready: Yes")
@@ -412,6 +181,13 @@ def main():
         data = json.load(f)
         print(f"\n✓ Verification: {len(data['codes'])} codes in database")
         print(f"✓ Metadata: {data['metadata']['total_codes']} codes registered")
+    
+    problems = verify_round_trip(output_path, binary_path_for(output_path))
+    if problems:
+        print(f"❌ Binary database mismatch: {problems[0]} ({len(problems)} problems)")
+        sys.exit(1)
+    else:
+        print(f"✓ Binary database round trip: {count} records match the JSON")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Asyncio client for the classification API of server.js
+Keeps up to `concurrency` keep-alive HTTP/1.1 connections busy with
+POST /api/search-hs-code requests, so that low-confidence descriptions reach
+the server close together and share its micro-batched LLM calls.
+classify_remote() streams results in input order for batch_classify.py
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+SEARCH_PATH = "/api/search-hs-code"
+
+class AsyncHSClient:
+    """Pool of keep-alive connections to one server.js instance"""
+
+    def __init__(self, base_url, concurrency=16, timeout=60.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only http:// servers are supported, got {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(concurrency)
+        self._idle = []
+
+    async def _request(self, connection, body):
+        reader, writer = connection
+        writer.write((f"POST {SEARCH_PATH} HTTP/1.1\r\n"
+                      f"Host: {self.host}:{self.port}\r\n"
+                      "Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      "Connection: keep-alive\r\n\r\n").encode('ascii') + body)
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = b""
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                payload += await reader.readexactly(size)
+                await reader.readline()
+        else:
+            payload = await reader.readexactly(int(headers.get("content-length", 0)))
+        reusable = headers.get("connection", "").lower() != "close"
+        return status, payload, reusable
+
+    async def classify(self, description, is_follow_up=False):
+        """(HTTP status, latency ms, response body) for one description"""
+        body = json.dumps({"description": description, "isFollowUp": is_follow_up}).encode('utf-8')
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            start = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(self.host, self.port)
+                status, payload, reusable = await asyncio.wait_for(
+                    self._request(connection, body), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+                if connection is not None:
+                    connection[1].close()
+                return 0, (time.perf_counter() - start) * 1000, {}
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if reusable:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+        try:
+            return status, elapsed_ms, json.loads(payload or b"{}")
+        except ValueError:
+            return status, elapsed_ms, {}
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+def response_matches(response):
+    """Server answer as batch_classify result rows: the code (scored with its
+    confidence) followed by its related codes; empty when clarification is needed"""
+    if not response.get("hsCode"):
+        return []
+    matches = [{"code": response["hsCode"], "score": response.get("confidence", 0)}]
+    for related in response.get("relatedCodes") or []:
+        if isinstance(related, dict) and related.get("code"):
+            matches.append({"code": related["code"], "score": None})
+    return matches
+
+async def _classify_rows(rows, base_url, concurrency, emit):
+    """Classify (row id, description) rows, emitting results in input order.
+
+    At most four requests per connection are scheduled ahead of the oldest
+    unfinished row, so memory stays bounded on large inputs.
+    """
+    client = AsyncHSClient(base_url, concurrency)
+    in_flight = deque()
+    try:
+        for row_id, description in rows:
+            in_flight.append((row_id, description, asyncio.ensure_future(client.classify(description))))
+            if len(in_flight) >= concurrency * 4:
+                done_id, done_description, task = in_flight.popleft()
+                emit((done_id, done_description, await task))
+        while in_flight:
+            done_id, done_description, task = in_flight.popleft()
+            emit((done_id, done_description, await task))
+    finally:
+        await client.close()
+
+def classify_remote(rows, base_url, concurrency=16):
+    """Yield (row id, description, (status, latency ms, response)) in input order.
+
+    The asyncio loop runs in a background thread, so the caller can consume
+    results as a plain iterator.
+    """
+    results = queue.Queue(maxsize=concurrency * 8)
+    done = object()
+
+    def run():
+        try:
+            asyncio.run(_classify_rows(rows, base_url, concurrency, results.put))
+        except BaseException as e:
+            results.put(e)
+        results.put(done)
+
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        item = results.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
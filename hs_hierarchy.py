@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Chapter / heading / subheading prefix tree over the 8-digit HS codes
+Nodes at 2, 4, 6 and 8 digits carry a description and the range of codes
+below them, so prefix, sibling and parent/child lookups are O(depth)
+instead of a filter over the whole list
+"""
+
+import json
+
+LEVELS = (2, 4, 6, 8)
+HIERARCHY_VERSION = 1
+
+def _common_words(descriptions):
+    """Leading words shared by every description ("Buffalo" for the buffalo lines)"""
+    split = [d.replace(',', ' ').split() for d in descriptions]
+    common = []
+    for words in zip(*split):
+        if any(w.lower() != words[0].lower() for w in words):
+            break
+        common.append(words[0])
+    return ' '.join(common)
+
+def _node_description(prefix, members, codes, chapter_titles):
+    """Description of a non-leaf node.
+
+    Chapters use their title. A heading or subheading uses the line coded
+    as the prefix padded with zeros (e.g. 12010000 for heading 1201), else
+    the leading words shared by its lines. Without either it has no
+    description: one line's own text would mislabel the rest of the node.
+    """
+    if len(prefix) == 2 and prefix in chapter_titles:
+        return chapter_titles[prefix]
+    padded = prefix.ljust(8, '0')
+    descriptions = [codes[i]["description"] for i in members]
+    for i in members:
+        if codes[i]["code"] == padded:
+            return codes[i]["description"]
+    if len(descriptions) < 2:
+        return ""
+    return _common_words(descriptions)
+
+def build_hierarchy(codes, chapter_titles=None):
+    """Serializable 2/4/6/8-digit tree over a database "codes" array.
+
+    "order" lists code ids sorted by code; each node's [start, end) range
+    indexes into it. Chapter titles are keyed by 2-digit prefix.
+    """
+    chapter_titles = chapter_titles or {}
+    order = sorted(range(len(codes)), key=lambda i: codes[i]["code"])
+
+    nodes = {}
+    for position, code_id in enumerate(order):
+        code = codes[code_id]["code"]
+        parent = None
+        for level in LEVELS:
+            prefix = code[:level]
+            node = nodes.get(prefix)
+            if node is None:
+                node = nodes[prefix] = {"level": level, "parent": parent, "start": position,
+                                        "end": position, "children": []}
+                if parent is not None:
+                    nodes[parent]["children"].append(prefix)
+            node["end"] = position + 1
+            parent = prefix
+
+    for prefix, node in nodes.items():
+        members = order[node["start"]:node["end"]]
+        if node["level"] == 8:
+            node["description"] = codes[members[0]]["description"]
+        else:
+            node["description"] = _node_description(prefix, members, codes, chapter_titles)
+
+    return {
+        "version": HIERARCHY_VERSION,
+        "order": order,
+        "chapters": sorted(prefix for prefix in nodes if len(prefix) == 2),
+        "nodes": nodes
+    }
+
+class HSHierarchy:
+    """Query API over a built hierarchy and its database codes"""
+
+    def __init__(self, hierarchy, codes):
+        self.order = hierarchy["order"]
+        self.nodes = hierarchy["nodes"]
+        self.chapters = hierarchy["chapters"]
+        self.codes = codes
+
+    @classmethod
+    def from_database(cls, database_path, chapter_titles=None):
+        with open(database_path, 'r', encoding='utf-8') as f:
+            codes = json.load(f)["codes"]
+        return cls(build_hierarchy(codes, chapter_titles), codes)
+
+    def node(self, prefix):
+        """Node for a 2/4/6/8-digit prefix, or None"""
+        return self.nodes.get(prefix)
+
+    def codes_under(self, prefix):
+        """Records under a 2/4/6/8-digit prefix ("0102" -> all of heading 0102)"""
+        node = self.nodes.get(prefix)
+        if node is None:
+            return []
+        return [self.codes[i] for i in self.order[node["start"]:node["end"]]]
+
+    def children(self, prefix):
+        """Direct child nodes as [(prefix, description)]; chapters for prefix ''"""
+        if not prefix:
+            return [(p, self.nodes[p]["description"]) for p in self.chapters]
+        node = self.nodes.get(prefix)
+        if node is None:
+            return []
+        return [(p, self.nodes[p]["description"]) for p in node["children"]]
+
+    def ancestors(self, code):
+        """[(prefix, description)] from chapter down to the code itself"""
+        path = []
+        prefix = code if code in self.nodes else None
+        while prefix is not None:
+            path.append((prefix, self.nodes[prefix]["description"]))
+            prefix = self.nodes[prefix]["parent"]
+        return path[::-1]
+
+    def siblings(self, code, limit=None):
+        """Codes sharing the nearest ancestor that has other codes under it"""
+        node = self.nodes.get(code)
+        if node is None:
+            return []
+        parent = node["parent"]
+        while parent is not None:
+            parent_node = self.nodes[parent]
+            if parent_node["end"] - parent_node["start"] > 1:
+                related = [self.codes[i] for i in self.order[parent_node["start"]:parent_node["end"]]
+                           if self.codes[i]["code"] != code]
+                return related[:limit] if limit is not None else related
+            parent = parent_node["parent"]
+        return []
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+BM25 ranking over the HS code catalogue
+Term weights are precomputed per posting at load time, so a query is one
+vectorized accumulation over the posting lists of its tokens
+"""
+
+import argparse
+import json
+import math
+import time
+import numpy as np
+from extraction_core import tokenize
+from search_index import build_inverted_index
+from hs_hierarchy import HSHierarchy, build_hierarchy
+
+class BM25Index:
+    """BM25 over the "codes" array of hs-codes-database.json.
+
+    Postings are stored CSR-style: term_ptr[t]:term_ptr[t + 1] slices
+    doc_ids/weights for term t, and each weight already folds in the term's
+    IDF and the document length normalization.
+    """
+
+    def __init__(self, codes, k1=1.2, b=0.75):
+        self.codes = codes
+        self.k1 = k1
+        self.b = b
+
+        index = build_inverted_index(codes)
+        doc_lengths = np.asarray(index["doc_lengths"], dtype=np.float32)
+        avg_length = float(doc_lengths.mean()) if len(codes) else 0.0
+        norms = k1 * (1 - b + b * doc_lengths / avg_length) if avg_length else np.full(len(codes), k1)
+
+        self.terms = {}
+        term_ptr = [0]
+        doc_ids = []
+        weights = []
+        n_docs = len(codes)
+        for term_id, (token, postings) in enumerate(index["postings"].items()):
+            self.terms[token] = term_id
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                doc_ids.append(doc_id)
+                weights.append(idf * tf * (k1 + 1) / (tf + norms[doc_id]))
+            term_ptr.append(len(doc_ids))
+
+        self.term_ptr = np.asarray(term_ptr, dtype=np.int64)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+
+    @property
+    def hierarchy(self):
+        """Code hierarchy over the same records, built on first use"""
+        if getattr(self, "_hierarchy", None) is None:
+            self._hierarchy = HSHierarchy(build_hierarchy(self.codes), self.codes)
+        return self._hierarchy
+
+    @classmethod
+    def load(cls, database_path, **params):
+        with open(database_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["codes"], **params)
+
+    def term_ids(self, query):
+        """Distinct known term ids of a query"""
+        return sorted({self.terms[token] for token in tokenize(query) if token in self.terms})
+
+    def _postings(self, term_ids):
+        if len(term_ids) == 1:
+            start, end = self.term_ptr[term_ids[0]], self.term_ptr[term_ids[0] + 1]
+            return self.doc_ids[start:end], self.weights[start:end]
+        slices = [slice(self.term_ptr[t], self.term_ptr[t + 1]) for t in term_ids]
+        return (np.concatenate([self.doc_ids[s] for s in slices]),
+                np.concatenate([self.weights[s] for s in slices]))
+
+    def scores(self, query):
+        """BM25 score of every code for a query (zeros where nothing matches)"""
+        term_ids = self.term_ids(query)
+        if not term_ids:
+            return np.zeros(len(self.codes), dtype=np.float64)
+        doc_ids, weights = self._postings(term_ids)
+        return np.bincount(doc_ids, weights=weights, minlength=len(self.codes))
+
+    def top_k(self, scores, k):
+        """(code ids, scores) of the k best positive scores, best first"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        top = top[scores[top] > 0]
+        return top, scores[top]
+
+    def _results(self, top, top_scores):
+        return [{
+            "code": self.codes[i]["code"],
+            "description": self.codes[i]["description"],
+            "score": round(float(score), 4)
+        } for i, score in zip(top, top_scores)]
+
+    def search(self, query, k=10):
+        """Top-k codes for a query: [{"code", "description", "score"}]"""
+        return self._results(*self.top_k(self.scores(query), k))
+
+    def scores_batch(self, queries):
+        """(len(queries), codes) score matrix, accumulated in a single bincount"""
+        n_docs = len(self.codes)
+        doc_parts = []
+        weight_parts = []
+        for row, query in enumerate(queries):
+            term_ids = self.term_ids(query)
+            if term_ids:
+                doc_ids, weights = self._postings(term_ids)
+                doc_parts.append(doc_ids.astype(np.int64) + row * n_docs)
+                weight_parts.append(weights)
+        if not doc_parts:
+            return np.zeros((len(queries), n_docs))
+        flat = np.bincount(np.concatenate(doc_parts), weights=np.concatenate(weight_parts),
+                           minlength=len(queries) * n_docs)
+        return flat.reshape(len(queries), n_docs)
+
+    def search_batch(self, queries, k=10):
+        """search() for many queries at once, one result list per query"""
+        return [self._results(*self.top_k(row, k)) for row in self.scores_batch(queries)]
+
+def shortlist(index, query, n=20, hierarchy=None, siblings_per_code=3, sibling_sources=5):
+    """Candidate records for an LLM prompt: the top-n codes for the query plus
+    heading siblings of the best few, so the model can still pick a
+    neighbouring line the keyword match missed
+    """
+    candidates = index.search(query, n)
+    hierarchy = hierarchy or index.hierarchy
+
+    seen = {item["code"] for item in candidates}
+    shortlisted = [{"code": item["code"], "description": item["description"]} for item in candidates]
+    for item in candidates[:sibling_sources]:
+        for sibling in hierarchy.siblings(item["code"], siblings_per_code):
+            if sibling["code"] not in seen:
+                seen.add(sibling["code"])
+                shortlisted.append({"code": sibling["code"], "description": sibling["description"]})
+    return shortlisted
+
+def format_tariff_context(records):
+    """Prompt lines in the server's "code - description" form"""
+    return '\n'.join(f"{item['code']} - {item['description']}" for item in records)
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the HS code database with BM25")
+    parser.add_argument("query", help="product description")
+    parser.add_argument("-k", type=int, default=5, help="number of results (default: 5)")
+    parser.add_argument("--database", default="hs-codes-database.json", help="path to the JSON database")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = BM25Index.load(args.database)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    results = index.search(args.query, args.k)
+    query_ms = (time.perf_counter() - start) * 1000
+
+    print(f"📊 {len(index.codes)} codes indexed in {load_ms:.1f} ms, query took {query_ms:.3f} ms")
+    for result in results:
+        print(f"  {result['code']}  {result['score']:>7.3f}  {result['description'][:70]}")
+
+if __name__ == "__main__":
+    main()
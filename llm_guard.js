@@ -0,0 +1,128 @@
+// Guards around upstream LLM calls for server.js: single-flight coalescing of
+// identical in-flight queries, a bounded concurrency limiter with a waiting
+// queue, and a per-model circuit breaker
+
+// Concurrent calls for the same key share one in-flight promise
+export class SingleFlight {
+    constructor() {
+        this.inFlight = new Map();
+    }
+
+    // Run fn() for key unless a call for key is already running, in which
+    // case its promise is returned; onShared(key) is called for joiners
+    run(key, fn, onShared = null) {
+        const existing = this.inFlight.get(key);
+        if (existing) {
+            if (onShared) onShared(key);
+            return existing;
+        }
+        const promise = Promise.resolve()
+            .then(fn)
+            .finally(() => this.inFlight.delete(key));
+        this.inFlight.set(key, promise);
+        return promise;
+    }
+
+    get size() {
+        return this.inFlight.size;
+    }
+}
+
+export class QueueFullError extends Error {
+    constructor(maxQueue) {
+        super(`Rate limit: LLM queue is full (${maxQueue} waiting)`);
+        this.name = 'QueueFullError';
+        this.status = 429;
+    }
+}
+
+// At most maxConcurrent calls run at once; up to maxQueue more wait in FIFO
+// order and anything beyond that is rejected with QueueFullError
+export class ConcurrencyLimiter {
+    constructor(maxConcurrent, maxQueue) {
+        this.maxConcurrent = Math.max(1, maxConcurrent);
+        this.maxQueue = Math.max(0, maxQueue);
+        this.active = 0;
+        this.queue = [];
+    }
+
+    async run(fn) {
+        if (this.active >= this.maxConcurrent) {
+            if (this.queue.length >= this.maxQueue) {
+                throw new QueueFullError(this.maxQueue);
+            }
+            // The releasing call hands its slot over, so active stays counted
+            await new Promise(resolve => this.queue.push(resolve));
+        } else {
+            this.active++;
+        }
+        try {
+            return await fn();
+        } finally {
+            const next = this.queue.shift();
+            if (next) next();
+            else this.active--;
+        }
+    }
+
+    get waiting() {
+        return this.queue.length;
+    }
+}
+
+// closed: calls pass. After failureThreshold consecutive failures the
+// breaker opens and calls are skipped for cooldownMs; then one trial call is
+// let through (half_open) and its outcome closes or re-opens the breaker
+export class CircuitBreaker {
+    constructor(name, failureThreshold = 3, cooldownMs = 30000, now = Date.now) {
+        this.name = name;
+        this.failureThreshold = failureThreshold;
+        this.cooldownMs = cooldownMs;
+        this.now = now;
+        this.state = 'closed';
+        this.failures = 0;
+        this.openedAt = 0;
+        this.trialInFlight = false;
+    }
+
+    // Whether a call may be made now; claims the trial slot when half-open
+    allowRequest() {
+        if (this.state === 'closed') return true;
+        if (this.state === 'open') {
+            if (this.now() - this.openedAt < this.cooldownMs) return false;
+            this.state = 'half_open';
+        }
+        if (this.trialInFlight) return false;
+        this.trialInFlight = true;
+        return true;
+    }
+
+    // The allowed call was never made (e.g. rejected by the limiter)
+    cancelRequest() {
+        this.trialInFlight = false;
+    }
+
+    recordSuccess() {
+        this.state = 'closed';
+        this.failures = 0;
+        this.trialInFlight = false;
+    }
+
+    recordFailure() {
+        this.trialInFlight = false;
+        this.failures++;
+        if (this.state === 'half_open' || this.failures >= this.failureThreshold) {
+            this.state = 'open';
+            this.openedAt = this.now();
+        }
+    }
+
+    status() {
+        return {
+            state: this.state,
+            consecutiveFailures: this.failures,
+            retryInMs: this.state === 'open'
+                ? Math.max(0, this.cooldownMs - (this.now() - this.openedAt)) : 0
+        };
+    }
+}
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq chat completions API, for benchmarks and tests
+Answers OpenAI-style POST /openai/v1/chat/completions after a delay that
+grows with prompt size, picking the first HS code listed in the prompt (for
+batched prompts, the listed code sharing most words with each product).
+Point server.js at it with GROQ_BASE_URL=http://127.0.0.1:<port>.
+Models listed in fail_models answer 503, to exercise the server's fallback
+and circuit breakers
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROMPT_CODE_PATTERN = re.compile(r'^(\d{8}) - (.*)$', re.MULTILINE)
+BATCH_ITEM_PATTERN = re.compile(r'^\[(\d+)\] "(.*)"$', re.MULTILINE)
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+class StubSettings:
+    """Latency model of the stub: base delay plus a cost per 1k prompt chars"""
+
+    def __init__(self, base_delay_ms=50.0, per_kchar_ms=2.0, fail_models=()):
+        self.base_delay_ms = base_delay_ms
+        self.per_kchar_ms = per_kchar_ms
+        self.fail_models = set(fail_models)
+        self.requests = 0
+        self.prompt_chars = 0
+        self.model_requests = Counter()
+        self._lock = threading.Lock()
+
+    def delay_seconds(self, prompt):
+        return (self.base_delay_ms + self.per_kchar_ms * len(prompt) / 1000) / 1000
+
+    def record(self, prompt, model=None):
+        with self._lock:
+            self.requests += 1
+            self.prompt_chars += len(prompt)
+            self.model_requests[model or "stub"] += 1
+
+def stub_answer(prompt):
+    """Classification JSON naming the first code listed in the prompt"""
+    match = PROMPT_CODE_PATTERN.search(prompt)
+    if not match:
+        return {"hsCode": None, "description": None, "confidence": 40, "reasons": [],
+                "relatedCodes": [], "clarificationQuestions": ["What is the product made of?"]}
+    return {
+        "hsCode": match.group(1),
+        "description": match.group(2),
+        "confidence": 85,
+        "reasons": ["Matches the tariff description", "Stub classifier", "First listed candidate"],
+        "relatedCodes": [],
+        "clarificationQuestions": None
+    }
+
+def stub_batch_answer(prompt):
+    """One classification per [n] "product" line of a batched prompt"""
+    codes = [(code, description, set(WORD_PATTERN.findall(description.lower())))
+             for code, description in PROMPT_CODE_PATTERN.findall(prompt)]
+    answers = []
+    for item_id, product in BATCH_ITEM_PATTERN.findall(prompt):
+        words = set(WORD_PATTERN.findall(product.lower()))
+        best = max(codes, key=lambda entry: len(words & entry[2]), default=None)
+        answer = stub_answer(f"{best[0]} - {best[1]}" if best else "")
+        answers.append({"id": int(item_id), **answer})
+    return answers
+
+def make_handler(settings):
+    class StubHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/stats'):
+                return self._send(200, {"requests": settings.requests,
+                                        "prompt_chars": settings.prompt_chars,
+                                        "models": dict(settings.model_requests)})
+            self._send(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                return self._send(404, {"error": {"message": "not found"}})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                prompt = '\n'.join(m.get("content", "") for m in request.get("messages", []))
+            except (ValueError, AttributeError) as e:
+                return self._send(400, {"error": {"message": f"invalid request: {e}"}})
+
+            model = request.get("model", "stub")
+            settings.record(prompt, model)
+            time.sleep(settings.delay_seconds(prompt))
+            if model in settings.fail_models:
+                return self._send(503, {"error": {"message": f"{model} is unavailable (stub)",
+                                                  "type": "service_unavailable"}})
+            self._send(200, {
+                "id": f"stub-{settings.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(
+                        stub_batch_answer(prompt) if BATCH_ITEM_PATTERN.search(prompt)
+                        else stub_answer(prompt))},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 60,
+                          "total_tokens": len(prompt) // 4 + 60}
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+def start_stub_server(host="127.0.0.1", port=0, settings=None):
+    """Start the stub in a background thread; returns (server, base URL)"""
+    settings = settings or StubSettings()
+    server = ThreadingHTTPServer((host, port), make_handler(settings))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Groq API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--base-delay-ms", type=float, default=50.0, help="fixed delay per request")
+    parser.add_argument("--per-kchar-ms", type=float, default=2.0, help="extra delay per 1000 prompt chars")
+    parser.add_argument("--fail-models", default="", help="comma-separated models that answer 503")
+    args = parser.parse_args()
+
+    settings = StubSettings(args.base_delay_ms, args.per_kchar_ms,
+                            [model for model in args.fail_models.split(',') if model])
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(settings))
+    print(f"✅ LLM stub on http://{args.host}:{args.port} "
+          f"(delay {args.base_delay_ms} ms + {args.per_kchar_ms} ms/1k chars)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+// In-process metrics registry (counters, gauges, histograms) rendered in the
+// Prometheus text exposition format, for GET /metrics in server.js
+
+// Request latency buckets in seconds: sub-millisecond local hits up to slow LLM calls
+export const LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30];
+
+function escapeLabel(value) {
+    return String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(names, values, extra = '') {
+    const parts = names.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+    if (extra) parts.push(extra);
+    return parts.length ? `{${parts.join(',')}}` : '';
+}
+
+// Base for one metric family: a map from label values to that series' state
+class Metric {
+    constructor(name, help, labelNames = []) {
+        this.name = name;
+        this.help = help;
+        this.labelNames = labelNames;
+        this.series = new Map();
+    }
+
+    // Series state for a { label: value } object, created on first use
+    seriesFor(labels = {}) {
+        const values = this.labelNames.map(name => labels[name] ?? '');
+        const key = values.join('\u0001');
+        let series = this.series.get(key);
+        if (!series) {
+            series = { values, ...this.initialState() };
+            this.series.set(key, series);
+        }
+        return series;
+    }
+
+    header(type) {
+        return `# HELP ${this.name} ${this.help}\n# TYPE ${this.name} ${type}\n`;
+    }
+}
+
+export class Counter extends Metric {
+    initialState() {
+        return { value: 0 };
+    }
+
+    inc(labels, amount = 1) {
+        this.seriesFor(labels).value += amount;
+    }
+
+    get(labels) {
+        return this.seriesFor(labels).value;
+    }
+
+    render() {
+        let text = this.header('counter');
+        for (const series of this.series.values()) {
+            text += `${this.name}${formatLabels(this.labelNames, series.values)} ${series.value}\n`;
+        }
+        return text;
+    }
+}
+
+// Gauge whose value is set directly, or read from a callback at scrape time
+export class Gauge extends Metric {
+    constructor(name, help, labelNames = [], collect = null) {
+        super(name, help, labelNames);
+        this.collect = collect;
+    }
+
+    initialState() {
+        return { value: 0 };
+    }
+
+    set(labels, value) {
+        this.seriesFor(labels).value = value;
+    }
+
+    render() {
+        if (this.collect) this.set({}, this.collect());
+        let text = this.header('gauge');
+        for (const series of this.series.values()) {
+            text += `${this.name}${formatLabels(this.labelNames, series.values)} ${series.value}\n`;
+        }
+        return text;
+    }
+}
+
+export class Histogram extends Metric {
+    constructor(name, help, labelNames = [], buckets = LATENCY_BUCKETS) {
+        super(name, help, labelNames);
+        this.buckets = [...buckets].sort((a, b) => a - b);
+    }
+
+    initialState() {
+        // Per-bucket (not cumulative) counts; the last slot is +Inf
+        return { counts: new Array(this.buckets.length + 1).fill(0), sum: 0, count: 0 };
+    }
+
+    observe(labels, value) {
+        const series = this.seriesFor(labels);
+        let i = 0;
+        while (i < this.buckets.length && value > this.buckets[i]) i++;
+        series.counts[i]++;
+        series.sum += value;
+        series.count++;
+    }
+
+    // Start a timer; calling the returned function observes the elapsed seconds
+    startTimer(labels) {
+        const start = process.hrtime.bigint();
+        return (finalLabels = labels) => {
+            const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+            this.observe(finalLabels, seconds);
+            return seconds;
+        };
+    }
+
+    render() {
+        let text = this.header('histogram');
+        for (const series of this.series.values()) {
+            let cumulative = 0;
+            this.buckets.forEach((bound, i) => {
+                cumulative += series.counts[i];
+                text += `${this.name}_bucket${formatLabels(this.labelNames, series.values, `le="${bound}"`)} ${cumulative}\n`;
+            });
+            cumulative += series.counts[this.buckets.length];
+            text += `${this.name}_bucket${formatLabels(this.labelNames, series.values, 'le="+Inf"')} ${cumulative}\n`;
+            text += `${this.name}_sum${formatLabels(this.labelNames, series.values)} ${series.sum}\n`;
+            text += `${this.name}_count${formatLabels(this.labelNames, series.values)} ${series.count}\n`;
+        }
+        return text;
+    }
+}
+
+export class MetricsRegistry {
+    constructor() {
+        this.metrics = new Map();
+    }
+
+    register(metric) {
+        if (this.metrics.has(metric.name)) {
+            throw new Error(`Metric already registered: ${metric.name}`);
+        }
+        this.metrics.set(metric.name, metric);
+        return metric;
+    }
+
+    counter(name, help, labelNames) {
+        return this.register(new Counter(name, help, labelNames));
+    }
+
+    gauge(name, help, labelNames, collect) {
+        return this.register(new Gauge(name, help, labelNames, collect));
+    }
+
+    histogram(name, help, labelNames, buckets) {
+        return this.register(new Histogram(name, help, labelNames, buckets));
+    }
+
+    // Prometheus text exposition format (version 0.0.4)
+    render() {
+        return [...this.metrics.values()].map(metric => metric.render()).join('');
+    }
+}
+
+export const PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
@@ -0,0 +1,53 @@
+// Micro-batching for server.js: items submitted within a short window (or
+// until maxItems are waiting) are handed to one flush call together
+
+export class MicroBatcher {
+    // flush(items) resolves to one result per item, in order; a result that
+    // is an Error rejects only that item's promise
+    constructor(flush, windowMs = 20, maxItems = 8, onBatch = null) {
+        this.flushFn = flush;
+        this.windowMs = windowMs;
+        this.maxItems = Math.max(1, maxItems);
+        this.onBatch = onBatch;
+        this.pending = [];
+        this.timer = null;
+    }
+
+    submit(item) {
+        return new Promise((resolve, reject) => {
+            this.pending.push({ item, resolve, reject });
+            if (this.pending.length >= this.maxItems) {
+                this.flush();
+            } else if (!this.timer) {
+                this.timer = setTimeout(() => this.flush(), this.windowMs);
+            }
+        });
+    }
+
+    flush() {
+        if (this.timer) {
+            clearTimeout(this.timer);
+            this.timer = null;
+        }
+        const batch = this.pending;
+        this.pending = [];
+        if (batch.length === 0) return;
+        if (this.onBatch) this.onBatch(batch.length);
+
+        Promise.resolve()
+            .then(() => this.flushFn(batch.map(entry => entry.item)))
+            .then(results => {
+                batch.forEach((entry, i) => {
+                    const result = results[i];
+                    if (result instanceof Error) entry.reject(result);
+                    else if (result === undefined) entry.reject(new Error('Batch returned no result for item'));
+                    else entry.resolve(result);
+                });
+            })
+            .catch(error => batch.forEach(entry => entry.reject(error)));
+    }
+
+    get waiting() {
+        return this.pending.length;
+    }
+}
@@ -0,0 +1,101 @@
+// Quantity lookups in the numeric interval index of hs-codes-index.json
+// ("buffalo 120 kg" -> "Buffalo, over 100 kg but not over 160 kg"), with the
+// same units and matching rules as numeric_intervals.py
+
+// unit -> [attribute, base unit, factor to the base unit]
+const UNITS = {
+    kg: ['weight', 'kg', 1], g: ['weight', 'kg', 1e-3], mg: ['weight', 'kg', 1e-6],
+    t: ['weight', 'kg', 1e3], tonne: ['weight', 'kg', 1e3], tonnes: ['weight', 'kg', 1e3],
+    l: ['volume', 'l', 1], litre: ['volume', 'l', 1], litres: ['volume', 'l', 1],
+    ml: ['volume', 'l', 1e-3],
+    m: ['length', 'm', 1], cm: ['length', 'm', 1e-2], mm: ['length', 'm', 1e-3],
+    '%': ['content', '%', 1]
+};
+
+const QUANTITY_PATTERN = /(\d+(?:,\d{3})*(?:\.\d+)?)\s*(kg|g|mg|tonnes?|t|litres?|l|ml|cm|mm|m|%)(?![a-z])(?:\s*(?:per|\/)\s*(kg|g|litres?|l)(?![a-z]))?/g;
+
+// Query words that say nothing about the product (QUERY_STOPWORDS)
+const QUERY_STOPWORDS = new Set(['the', 'and', 'with', 'from', 'other',
+    'over', 'not', 'but', 'exceeding', 'more', 'than', 'less', 'least', 'per', 'each', 'net', 'gross',
+    'weight', 'weighing']);
+const MIN_WORD_LENGTH = 3;
+
+// Words of a query (its quantity cut out) that can name a product
+export function productWords(text) {
+    return new Set((text.toLowerCase().match(/[a-z0-9]+/g) || [])
+        .filter(word => word.length >= MIN_WORD_LENGTH && !QUERY_STOPWORDS.has(word) && !(word in UNITS)));
+}
+
+// Whole-token or plural match: "horse" matches "horses", "pack" not "packages"
+export function wordMatches(word, token) {
+    return token === word || token === word + 's' || token === word + 'es' ||
+        word === token + 's' || word === token + 'es';
+}
+
+function round12(value) {
+    return Number(value.toFixed(12));
+}
+
+// [attribute, base unit, value in base units]; per makes it a content ratio
+export function normalizeQuantity(number, unit, per) {
+    const [attribute, base, factor] = UNITS[unit];
+    const value = parseFloat(number.replace(/,/g, '')) * factor;
+    if (per) {
+        const [, perBase, perFactor] = UNITS[per];
+        return ['content', `${base}/${perBase}`, round12(value / perFactor)];
+    }
+    return [attribute, base, round12(value)];
+}
+
+// { attribute, unit, value, start, end } of every quantity in a query
+export function parseQuantities(query) {
+    return [...query.toLowerCase().matchAll(QUANTITY_PATTERN)].map(match => {
+        const [attribute, unit, value] = normalizeQuantity(match[1], match[2], match[3]);
+        return { attribute, unit, value, start: match.index, end: match.index + match[0].length };
+    });
+}
+
+export class IntervalIndex {
+    constructor(intervalIndex) {
+        this.keys = intervalIndex.keys;
+        this.codeTokens = new Map(Object.entries(intervalIndex.code_tokens)
+            .map(([codeId, tokens]) => [Number(codeId), tokens]));
+    }
+
+    // Code ids whose interval for attribute/unit contains value, O(log n)
+    stab(attribute, unit, value) {
+        const entry = this.keys[`${attribute}|${unit}`];
+        if (!entry) return [];
+        const { points, segments } = entry;
+        let lo = 0;
+        let hi = points.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (points[mid] < value) lo = mid + 1; else hi = mid;
+        }
+        return segments[lo < points.length && points[lo] === value ? 2 * lo + 1 : 2 * lo];
+    }
+
+    // { codeId, quantity } of the code whose range holds a quantity of the
+    // query and that matches most of its other product words (whole tokens
+    // or plurals), or null
+    resolve(query, descriptionLength) {
+        let best = null;
+        for (const quantity of parseQuantities(query)) {
+            const words = productWords(`${query.slice(0, quantity.start)} ${query.slice(quantity.end)}`);
+            for (const codeId of this.stab(quantity.attribute, quantity.unit, quantity.value)) {
+                const tokens = this.codeTokens.get(codeId) || [];
+                let overlap = 0;
+                words.forEach(word => {
+                    if (tokens.some(token => wordMatches(word, token))) overlap++;
+                });
+                const length = descriptionLength(codeId);
+                if (overlap && (!best || overlap > best.overlap ||
+                        (overlap === best.overlap && length < best.length))) {
+                    best = { codeId, quantity, overlap, length };
+                }
+            }
+        }
+        return best && { codeId: best.codeId, quantity: best.quantity };
+    }
+}
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Numeric thresholds of tariff descriptions as an interval index
+Lines such as "Buffalo, over 100 kg but not over 160 kg" or "Chocolate
+containing cocoa 2000mg or less per kg" differ only by a numeric range. The
+generator parses them into (attribute, unit, lower, upper) intervals in
+base units and stores, per attribute and unit, the sorted interval end
+points with the codes covering each elementary segment between them, so
+the codes whose range holds a quantity from a query ("buffalo 120 kg") are
+found with one binary search. server.js reads the same structure from
+hs-codes-index.json
+"""
+
+import argparse
+import bisect
+import json
+import re
+import time
+from extraction_core import KEYWORD_STOPWORDS, tokenize
+
+INTERVAL_VERSION = 1
+
+# unit -> (attribute, base unit, factor to the base unit)
+UNITS = {
+    "kg": ("weight", "kg", 1.0), "g": ("weight", "kg", 1e-3), "mg": ("weight", "kg", 1e-6),
+    "t": ("weight", "kg", 1e3), "tonne": ("weight", "kg", 1e3), "tonnes": ("weight", "kg", 1e3),
+    "l": ("volume", "l", 1.0), "litre": ("volume", "l", 1.0), "litres": ("volume", "l", 1.0),
+    "ml": ("volume", "l", 1e-3),
+    "m": ("length", "m", 1.0), "cm": ("length", "m", 1e-2), "mm": ("length", "m", 1e-3),
+    "%": ("content", "%", 1.0)
+}
+
+_QUANTITY = r"\d+(?:,\d{3})*(?:\.\d+)?\s*(?:kg|g|mg|tonnes?|t|litres?|l|ml|cm|mm|m|%)(?![a-z])"
+# "per kg" after a quantity makes it a content ratio; "per unit" does not
+_PER = r"(?:\s*(?:per|/)\s*(?:kg|g|litres?|l)(?![a-z]))?"
+
+QUANTITY_PATTERN = re.compile(
+    r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*(kg|g|mg|tonnes?|t|litres?|l|ml|cm|mm|m|%)(?![a-z])"
+    r"(?:\s*(?:per|/)\s*(kg|g|litres?|l)(?![a-z]))?")
+PER_PATTERN = re.compile(r"(?:per|/)\s*(kg|g|litres?|l)$")
+
+# Query words that say nothing about the product: threshold phrasing and
+# stopwords ("laptop over 3 kg" must not match "over" in a Swine range)
+QUERY_STOPWORDS = KEYWORD_STOPWORDS | {"over", "not", "but", "exceeding", "more", "than", "less",
+                                       "least", "per", "each", "net", "gross", "weight", "weighing"}
+MIN_WORD_LENGTH = 3
+
+# Threshold phrasings; at each position a range is tried before its halves
+THRESHOLD_PATTERN = re.compile(
+    rf"(?P<range>(?:over|exceeding|more than)\s+{_QUANTITY}{_PER}\s*,?\s*"
+    rf"but\s+not\s+(?:over|exceeding|more than)\s+{_QUANTITY}{_PER})"
+    rf"|(?P<at_most>not over|not exceeding|not more than|up to)\s+{_QUANTITY}{_PER}"
+    rf"|{_QUANTITY}\s+or\s+(?P<suffix>less|more){_PER}"
+    rf"|(?P<bound>over|exceeding|more than|less than|at least)\s+{_QUANTITY}{_PER}")
+
+def normalize_quantity(number, unit, per=None):
+    """(attribute, base unit, value in base units); per makes it a content ratio"""
+    attribute, base, factor = UNITS[unit]
+    value = float(number.replace(",", "")) * factor
+    if per:
+        _, per_base, per_factor = UNITS[per]
+        return "content", f"{base}/{per_base}", round(value / per_factor, 12)
+    return attribute, base, round(value, 12)
+
+def parse_thresholds(description):
+    """Intervals [attribute, unit, lower, upper, lower_closed, upper_closed] of a
+    description, in base units; a None bound is open-ended"""
+    intervals = []
+    for match in THRESHOLD_PATTERN.finditer(description.lower()):
+        text = match.group(0)
+        quantities = list(QUANTITY_PATTERN.finditer(text))
+        trailing_per = PER_PATTERN.search(text)
+        per = next((q.group(3) for q in quantities if q.group(3)),
+                   trailing_per.group(1) if trailing_per else None)
+        first = normalize_quantity(quantities[0].group(1), quantities[0].group(2), per)
+        attribute, unit, value = first
+
+        if match.group("range"):
+            last = normalize_quantity(quantities[-1].group(1), quantities[-1].group(2), per)
+            if last[:2] == first[:2]:
+                intervals.append([attribute, unit, value, last[2], False, True])
+        elif match.group("at_most") or match.group("suffix") == "less":
+            intervals.append([attribute, unit, None, value, False, True])
+        elif match.group("suffix") == "more":
+            intervals.append([attribute, unit, value, None, True, False])
+        elif match.group("bound") == "less than":
+            intervals.append([attribute, unit, None, value, False, False])
+        else:
+            intervals.append([attribute, unit, value, None, match.group("bound") == "at least", False])
+    return intervals
+
+def parse_quantities(query):
+    """(attribute, unit, value, (start, end)) of every quantity in a query"""
+    return [(*normalize_quantity(m.group(1), m.group(2), m.group(3)), m.span())
+            for m in QUANTITY_PATTERN.finditer(query.lower())]
+
+def product_words(text):
+    """Words of a query (its quantity cut out) that can name a product"""
+    return {word for word in tokenize(text)
+            if len(word) >= MIN_WORD_LENGTH and word not in QUERY_STOPWORDS and word not in UNITS}
+
+def word_matches(word, token):
+    """Whole-token or plural match: "horse" matches "horses", "pack" not "packages" """
+    return token == word or token in (word + "s", word + "es") or word in (token + "s", token + "es")
+
+def _contains(interval, value):
+    _, _, lower, upper, lower_closed, upper_closed = interval
+    if lower is not None and (value < lower or (value == lower and not lower_closed)):
+        return False
+    if upper is not None and (value > upper or (value == upper and not upper_closed)):
+        return False
+    return True
+
+def build_interval_index(codes):
+    """Serializable interval index over the "codes" array of a database.
+
+    For every "attribute|unit" key, points are the sorted distinct interval
+    end points and segments[s] the code ids covering elementary segment s:
+    even s is the open range below points[s // 2] (above the last point for
+    the final one), odd s the point points[s // 2] itself. code_tokens holds
+    the description and keyword tokens of the codes with an interval, for
+    matching the rest of the query.
+    """
+    intervals = []
+    by_key = {}
+    for code_id, item in enumerate(codes):
+        for interval in parse_thresholds(item["description"]):
+            intervals.append([code_id, *interval])
+            by_key.setdefault(f"{interval[0]}|{interval[1]}", []).append((code_id, interval))
+
+    keys = {}
+    for key, entries in sorted(by_key.items()):
+        points = sorted({bound for _, interval in entries for bound in interval[2:4] if bound is not None})
+        samples = []
+        for i, point in enumerate(points):
+            below = points[i - 1] if i else point - 1
+            samples += [(below + point) / 2, point]
+        samples.append(points[-1] + 1 if points else 0)
+        keys[key] = {
+            "points": points,
+            "segments": [sorted({code_id for code_id, interval in entries if _contains(interval, sample)})
+                         for sample in samples]
+        }
+    code_tokens = {str(code_id): sorted(set(tokenize(codes[code_id]["description"])) |
+                                        {token for keyword in codes[code_id].get("keywords", [])
+                                         for token in tokenize(keyword)})
+                   for code_id in sorted({entry[0] for entry in intervals})}
+    return {"version": INTERVAL_VERSION, "intervals": intervals, "keys": keys, "code_tokens": code_tokens}
+
+class IntervalIndex:
+    """Stabbing queries over an interval index: codes whose range holds a value"""
+
+    def __init__(self, interval_index, codes):
+        self.keys = interval_index["keys"]
+        self.codes = codes
+        self.code_tokens = {int(code_id): tokens for code_id, tokens in interval_index["code_tokens"].items()}
+
+    @classmethod
+    def from_codes(cls, codes):
+        return cls(build_interval_index(codes), codes)
+
+    def stab(self, attribute, unit, value):
+        """Code ids whose interval for attribute/unit contains value, O(log n)"""
+        entry = self.keys.get(f"{attribute}|{unit}")
+        if not entry:
+            return []
+        points = entry["points"]
+        i = bisect.bisect_left(points, value)
+        segment = 2 * i + 1 if i < len(points) and points[i] == value else 2 * i
+        return entry["segments"][segment]
+
+    def resolve(self, query):
+        """(code record, quantity) for a query naming a product and a quantity, or None.
+
+        Among the codes whose range holds the quantity, the one matching most
+        product words of the rest of the query (whole tokens or plurals, so
+        "horse" matches "horses") wins; at least one word must match.
+        Threshold words, stopwords and words under MIN_WORD_LENGTH letters
+        never count.
+        """
+        best = None
+        for attribute, unit, value, (start, end) in parse_quantities(query):
+            words = product_words(query[:start] + " " + query[end:])
+            for code_id in self.stab(attribute, unit, value):
+                tokens = self.code_tokens[code_id]
+                overlap = sum(1 for word in words if any(word_matches(word, token) for token in tokens))
+                rank = (overlap, -len(self.codes[code_id]["description"]))
+                if overlap and (best is None or rank > best[0]):
+                    best = (rank, self.codes[code_id], (attribute, unit, value))
+        return best[1:] if best else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve a product description with a quantity to its subheading")
+    parser.add_argument("query", help='product description with a quantity, e.g. "buffalo 120 kg"')
+    parser.add_argument("--database", default="hs-codes-database.json")
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        codes = json.load(f)["codes"]
+    index = IntervalIndex.from_codes(codes)
+    print(f"🔧 {sum(len(entry['segments']) for entry in index.keys.values())} segments over "
+          f"{len(index.keys)} attribute/unit keys")
+
+    start = time.perf_counter()
+    resolved = index.resolve(args.query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if not resolved:
+        print(f"❌ No quantity range matches {args.query!r} ({elapsed_ms:.3f} ms)")
+        return
+    item, (attribute, unit, value) = resolved
+    print(f"✅ {item['code']}  {item['description']}  ({attribute} {value:g} {unit}, {elapsed_ms:.3f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of per-page extraction results for the PDF extractors
+Pages are keyed by a hash of their raw content stream, so a rebuild after a
+tariff amendment only re-extracts the pages that actually changed
+"""
+
+import hashlib
+import json
+import os
+
+class PageCache:
+    """Per-page parse results stored in a JSON file.
+
+    Keys hash the extractor name/version together with the page's content
+    stream, so a parser change invalidates every entry. The records of the
+    last run are kept alongside to report what changed between runs.
+    """
+
+    def __init__(self, path, extractor):
+        self.path = str(path)
+        self.extractor = extractor
+        self.entries = {}
+        self.previous_codes = {}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("extractor") == extractor:
+                    self.entries = data.get("pages", {})
+                    self.previous_codes = data.get("codes", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable page cache {self.path}: {e}")
+
+    def page_key(self, content):
+        """Cache key for a page's raw content stream bytes"""
+        digest = hashlib.sha256(self.extractor.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Cached result for a page key, or None"""
+        self.used.add(key)
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self.used.add(key)
+        self.entries[key] = result
+
+    def save(self, hs_codes):
+        """Write entries seen in this run plus the final records, atomically"""
+        data = {
+            "extractor": self.extractor,
+            "pages": {key: self.entries[key] for key in self.used if key in self.entries},
+            "codes": {item["code"]: item for item in hs_codes}
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+def diff_records(previous_codes, hs_codes):
+    """Compare the previous run's records ({code: record}) with this run's"""
+    current = {item["code"]: item for item in hs_codes}
+    return {
+        "added": sorted(code for code in current if code not in previous_codes),
+        "removed": sorted(code for code in previous_codes if code not in current),
+        "changed": sorted(code for code, item in current.items()
+                          if code in previous_codes and previous_codes[code] != item)
+    }
+
+def print_change_report(cache, report, report_path=None):
+    """Print cache statistics and code changes, optionally saving them as JSON"""
+    print(f"♻️  Page cache: {cache.hits} reused, {cache.misses} re-extracted")
+    if not cache.previous_codes:
+        print("📋 No previous run recorded - change report skipped")
+    else:
+        print(f"📋 Changes since last run: {len(report['added'])} added, "
+              f"{len(report['removed'])} removed, {len(report['changed'])} changed")
+        for label in ("added", "removed", "changed"):
+            if report[label]:
+                print(f"  {label}: {', '.join(report[label][:10])}"
+                      f"{' ...' if len(report[label]) > 10 else ''}")
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({"pages_reused": cache.hits, "pages_extracted": cache.misses, **report},
+                      f, indent=2)
+        print(f"📝 Change report written: {report_path}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Parity check of the matchers server.js duplicates from Python
+fuzzy_match.js, phrase_matcher.js and numeric_intervals.js reimplement
+fuzzy_match.py, phrase_matcher.py and numeric_intervals.py over the same
+hs-codes-index.json sections. This builds those sections from a database,
+runs a seeded set of generated queries through both implementations (the
+JavaScript side under node) and reports every query they disagree on.
+Exits non-zero on any disagreement, so it can gate a change to either side
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from extraction_core import tokenize
+from fuzzy_match import FuzzyMatcher, build_trigram_index
+from numeric_intervals import UNITS, IntervalIndex, build_interval_index
+from phrase_matcher import PhraseMatcher, build_phrase_table
+from search_index import build_inverted_index
+
+ROOT = Path(__file__).resolve().parent
+
+NODE_SCRIPT = '''
+import fs from 'fs';
+import { FuzzyMatcher } from './fuzzy_match.js';
+import { PhraseMatcher } from './phrase_matcher.js';
+import { IntervalIndex } from './numeric_intervals.js';
+
+const input = JSON.parse(fs.readFileSync(process.argv[1], 'utf8'));
+const fuzzy = new FuzzyMatcher(input.trigram_index);
+const phrases = new PhraseMatcher(input.phrase_index);
+const intervals = new IntervalIndex(input.interval_index);
+const descriptionLength = codeId => input.description_lengths[codeId];
+
+console.log(JSON.stringify({
+    fuzzy: input.queries.fuzzy.map(query => fuzzy.correct(query)),
+    phrase: input.queries.phrase.map(query => Object.fromEntries(phrases.features(query))),
+    interval: input.queries.interval.map(query => {
+        const resolved = intervals.resolve(query, descriptionLength);
+        return resolved && [resolved.codeId, resolved.quantity.attribute, resolved.quantity.unit,
+                            resolved.quantity.value];
+    })
+}));
+'''
+
+SHOWCASE_QUERIES = ["choc powdr", "frzn veg", "horse feed", "tomatoe juce", "bonless beef",
+                    "fresh aples", "buffalo 120 kg", "chocolate 1500 mg per kg"]
+
+def misspell(word, rng):
+    """A typo or abbreviation of a word: dropped, swapped or doubled letter, or a prefix"""
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.randrange(4)
+    if edit == 0:
+        return word[:i] + word[i + 1:]
+    if edit == 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if edit == 2:
+        return word[:i] + word[i] + word[i:]
+    return word[:rng.randrange(3, len(word))]
+
+def fuzzy_queries(codes, count, rng):
+    queries = []
+    for _ in range(count):
+        words = tokenize(rng.choice(codes)["description"])
+        start = rng.randrange(len(words))
+        queries.append(' '.join(misspell(word, rng) for word in words[start:start + rng.randint(1, 3)]))
+    return queries
+
+def phrase_queries(codes, count, rng):
+    vocabulary = sorted({token for item in codes for token in tokenize(item["description"])})
+    queries = []
+    for _ in range(count):
+        item = rng.choice(codes)
+        words = tokenize(item["description"]) + [token for keyword in item.get("keywords", [])
+                                                 for token in tokenize(keyword)]
+        start = rng.randrange(len(words))
+        picked = words[start:start + rng.randint(1, 4)] + rng.sample(vocabulary, rng.randint(0, 2))
+        if rng.random() < 0.3:
+            rng.shuffle(picked)
+        queries.append(' '.join(picked))
+    return queries
+
+def _number(value):
+    """Plain decimal form of a quantity (no exponent, which queries do not use)"""
+    return f"{value:.6f}".rstrip("0").rstrip(".")
+
+def interval_queries(codes, interval_index, count, rng):
+    """Product words of a code with a range plus a quantity near one of its bounds, in any unit"""
+    units_by_base = {}
+    for unit, (attribute, base, factor) in UNITS.items():
+        units_by_base.setdefault((attribute, base), []).append((unit, factor))
+    intervals = interval_index["intervals"]
+    queries = []
+    for _ in range(count):
+        code_id, attribute, base, lower, upper, *_ = rng.choice(intervals)
+        bounds = [bound for bound in (lower, upper) if bound is not None]
+        value = rng.choice(bounds) * rng.choice([0.5, 0.999, 1, 1.001, 1.5, 2])
+        if attribute == "content" and "/" in base:
+            quantity = f"{_number(value)} {base.split('/')[0]} per {base.split('/')[1]}"
+        else:
+            unit, factor = rng.choice(units_by_base.get((attribute, base), [(base, 1.0)]))
+            quantity = f"{_number(value / factor)} {unit}"
+        words = tokenize(codes[code_id]["description"])
+        picked = rng.sample(words, min(len(words), rng.randint(1, 3)))
+        picked.insert(rng.randrange(len(picked) + 1), quantity)
+        queries.append(' '.join(picked))
+    return queries
+
+def run_node(payload):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+        json.dump(payload, f)
+    try:
+        out = subprocess.run(["node", "--input-type=module", "-e", NODE_SCRIPT, f.name],
+                             capture_output=True, text=True, check=True, cwd=ROOT)
+    finally:
+        Path(f.name).unlink()
+    return json.loads(out.stdout)
+
+def report(name, queries, expected, actual):
+    mismatches = [(query, want, got) for query, want, got in zip(queries, expected, actual) if want != got]
+    print(f"  {name:<10}{len(queries) - len(mismatches):>6}/{len(queries)} agree")
+    for query, want, got in mismatches[:10]:
+        print(f"    ❌ {query!r}\n       python:     {want}\n       javascript: {got}")
+    return len(mismatches)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the JavaScript matchers agree with the Python ones")
+    parser.add_argument("--database", default="hs-codes-database.json")
+    parser.add_argument("--fuzzy", type=int, default=300, help="generated fuzzy queries")
+    parser.add_argument("--phrase", type=int, default=2000, help="generated phrase queries")
+    parser.add_argument("--interval", type=int, default=1500, help="generated quantity queries")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        codes = json.load(f)["codes"]
+    rng = random.Random(args.seed)
+    trigram_index = build_trigram_index(build_inverted_index(codes)["postings"])
+    phrase_index = build_phrase_table(codes)
+    interval_index = build_interval_index(codes)
+    queries = {
+        "fuzzy": SHOWCASE_QUERIES + fuzzy_queries(codes, args.fuzzy, rng),
+        "phrase": SHOWCASE_QUERIES + phrase_queries(codes, args.phrase, rng),
+        "interval": SHOWCASE_QUERIES + interval_queries(codes, interval_index, args.interval, rng)
+    }
+
+    fuzzy = FuzzyMatcher(trigram_index)
+    phrases = PhraseMatcher(phrase_index)
+    intervals = IntervalIndex(interval_index, codes)
+    code_ids = {item["code"]: code_id for code_id, item in enumerate(codes)}
+    expected = {
+        "fuzzy": [fuzzy.correct(query) for query in queries["fuzzy"]],
+        # JSON object keys: code ids as strings
+        "phrase": [{str(code_id): weight for code_id, weight in phrases.features(query).items()}
+                   for query in queries["phrase"]],
+        "interval": [resolved and [code_ids[resolved[0]["code"]], *resolved[1]]
+                     for resolved in map(intervals.resolve, queries["interval"])]
+    }
+    actual = run_node({
+        "trigram_index": trigram_index,
+        "phrase_index": phrase_index,
+        "interval_index": interval_index,
+        "description_lengths": [len(item["description"]) for item in codes],
+        "queries": queries
+    })
+
+    print(f"🔁 Python vs JavaScript matchers over {len(codes)} codes ({args.database})")
+    mismatches = sum(report(name, queries[name], expected[name], actual[name]) for name in queries)
+    if mismatches:
+        print(f"❌ {mismatches} queries disagree")
+        sys.exit(1)
+    print("✅ Every query agrees")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+// Aho-Corasick matcher over the keyword phrase table of hs-codes-index.json,
+// the same automaton and weights as phrase_matcher.py
+
+export const KEYWORD_WEIGHT = 3;
+export const PHRASE_WORD_WEIGHT = 15;
+
+// Tokens joined by single spaces, padded so patterns match whole words
+export function normalizeText(text) {
+    return ` ${(String(text).toLowerCase().match(/[a-z0-9]+/g) || []).join(' ')} `;
+}
+
+export function phraseWeight(phrase) {
+    const words = phrase.split(' ').length;
+    return words === 1 ? KEYWORD_WEIGHT : PHRASE_WORD_WEIGHT * words;
+}
+
+export class PhraseMatcher {
+    // phraseTable: { phrases: { "peanut butter": [code ids], ... } }
+    constructor(phraseTable) {
+        this.phrases = Object.keys(phraseTable.phrases);
+        this.codeIds = this.phrases.map(phrase => phraseTable.phrases[phrase]);
+        this.weights = this.phrases.map(phraseWeight);
+
+        const goto = [new Map()];
+        const out = [[]];
+        this.phrases.forEach((phrase, patternId) => {
+            let state = 0;
+            for (const char of ` ${phrase} `) {
+                let next = goto[state].get(char);
+                if (next === undefined) {
+                    next = goto.length;
+                    goto[state].set(char, next);
+                    goto.push(new Map());
+                    out.push([]);
+                }
+                state = next;
+            }
+            out[state].push(patternId);
+        });
+
+        // Breadth-first failure links; outputs are merged along them
+        const fail = new Array(goto.length).fill(0);
+        const queue = [...goto[0].values()];
+        for (let head = 0; head < queue.length; head++) {
+            const state = queue[head];
+            for (const [char, next] of goto[state]) {
+                queue.push(next);
+                let link = fail[state];
+                while (link && !goto[link].has(char)) link = fail[link];
+                fail[next] = goto[link].get(char) ?? 0;
+                if (out[fail[next]].length) out[next] = out[next].concat(out[fail[next]]);
+            }
+        }
+
+        this.goto = goto;
+        this.fail = fail;
+        this.out = out;
+    }
+
+    // Pattern ids found in text, in the order their matches end
+    matchIds(text) {
+        const { goto, fail, out } = this;
+        const hits = [];
+        let state = 0;
+        for (const char of normalizeText(text)) {
+            while (state && !goto[state].has(char)) state = fail[state];
+            state = goto[state].get(char) ?? 0;
+            if (out[state].length) hits.push(...out[state]);
+        }
+        return hits;
+    }
+
+    find(text) {
+        return this.matchIds(text).map(patternId => this.phrases[patternId]);
+    }
+
+    // code id -> summed weight of the distinct phrases of text it carries
+    features(text) {
+        const scores = new Map();
+        for (const patternId of new Set(this.matchIds(text))) {
+            for (const codeId of this.codeIds[patternId]) {
+                scores.set(codeId, (scores.get(codeId) || 0) + this.weights[patternId]);
+            }
+        }
+        return scores;
+    }
+}
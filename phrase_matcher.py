@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick matcher over the database's keyword phrases
+Keywords such as "peanut butter" or "cocoa powder" are compiled into one
+automaton, so every phrase and single-word keyword in a query is found in a
+single pass over its normalized text. Hits become weighted ranking
+features per code; the generator stores the phrase table in
+hs-codes-index.json and server.js builds the same automaton from it
+(phrase_matcher.js)
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from extraction_core import tokenize
+
+PHRASE_VERSION = 1
+# A single-word keyword hit stays below the local confidence threshold on its
+# own; each word of a multi-word phrase hit counts like an exact word match
+KEYWORD_WEIGHT = 3
+PHRASE_WORD_WEIGHT = 15
+
+def normalize_text(text):
+    """Tokens joined by single spaces, padded so patterns match whole words"""
+    return " " + " ".join(tokenize(text)) + " "
+
+def phrase_weight(phrase):
+    words = phrase.count(" ") + 1
+    return KEYWORD_WEIGHT if words == 1 else PHRASE_WORD_WEIGHT * words
+
+def build_phrase_table(codes):
+    """Serializable normalized keyword phrase -> [code ids] map"""
+    phrases = {}
+    for code_id, item in enumerate(codes):
+        for keyword in item.get("keywords", []):
+            phrase = " ".join(tokenize(keyword))
+            if phrase:
+                ids = phrases.setdefault(phrase, [])
+                if not ids or ids[-1] != code_id:
+                    ids.append(code_id)
+    return {"version": PHRASE_VERSION, "phrases": {phrase: phrases[phrase] for phrase in sorted(phrases)}}
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over " phrase " patterns.
+
+    States are list indices; goto[s] maps a character to the next state and
+    out[s] lists the pattern ids ending at s, already merged along the
+    failure links, so matching never follows more than one link per step.
+    """
+
+    def __init__(self, phrase_table):
+        self.phrases = list(phrase_table["phrases"])
+        self.code_ids = [phrase_table["phrases"][phrase] for phrase in self.phrases]
+        self.weights = [phrase_weight(phrase) for phrase in self.phrases]
+
+        goto = [{}]
+        out = [[]]
+        for pattern_id, phrase in enumerate(self.phrases):
+            state = 0
+            for char in " " + phrase + " ":
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    out.append([])
+                state = next_state
+            out[state].append(pattern_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[next_state] = goto[link].get(char, 0)
+                out[next_state] = out[next_state] + out[fail[next_state]]
+
+        self.goto = goto
+        self.fail = fail
+        self.out = out
+
+    @classmethod
+    def from_codes(cls, codes):
+        return cls(build_phrase_table(codes))
+
+    @classmethod
+    def load(cls, artifact_path):
+        with open(artifact_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["phrase_index"])
+
+    def match_ids(self, text):
+        """Pattern ids found in text, in the order their matches end (repeats included)"""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        hits = []
+        for char in normalize_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                hits.extend(out[state])
+        return hits
+
+    def find(self, text):
+        return [self.phrases[pattern_id] for pattern_id in self.match_ids(text)]
+
+    def features(self, text):
+        """code id -> summed weight of the distinct phrases of text it carries"""
+        scores = {}
+        for pattern_id in dict.fromkeys(self.match_ids(text)):
+            for code_id in self.code_ids[pattern_id]:
+                scores[code_id] = scores.get(code_id, 0) + self.weights[pattern_id]
+        return scores
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the keyword phrases found in a product description")
+    parser.add_argument("query", help="product description")
+    parser.add_argument("-k", type=int, default=5, help="codes to show")
+    parser.add_argument("--database", default="hs-codes-database.json")
+    args = parser.parse_args()
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        codes = json.load(f)["codes"]
+    matcher = PhraseMatcher.from_codes(codes)
+
+    start = time.perf_counter()
+    phrases = matcher.find(args.query)
+    scores = matcher.features(args.query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🔎 Phrases: {phrases} ({elapsed_ms:.3f} ms)")
+    for code_id, weight in sorted(scores.items(), key=lambda entry: -entry[1])[:args.k]:
+        print(f"  {codes[code_id]['code']}  {weight:>4}  {codes[code_id]['description'][:70]}")
+
+if __name__ == "__main__":
+    main()
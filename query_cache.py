@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Normalized-query result cache with LRU eviction and TTL expiry
+Entries are tied to the database version (metadata version + extraction
+date + a hash of the file), so a rebuilt hs-codes-database.json invalidates
+them. Run as a script to serve the cache over HTTP as a local sidecar for
+server.js, whose entries are also keyed on the tariff version it serves
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from extraction_core import tokenize
+
+def normalize_query(text):
+    """Cache key form of a query: lowercase tokens joined by single spaces"""
+    return ' '.join(tokenize(text))
+
+def database_version(metadata):
+    """Version tag of a database from its metadata block"""
+    return f"{metadata.get('version', '')}@{metadata.get('extraction_date', '')}"
+
+def read_database_version(database_path):
+    """Version tag of a database file; the content hash changes with any rebuild"""
+    with open(database_path, 'rb') as f:
+        data = f.read()
+    metadata = json.loads(data).get("metadata", {})
+    return f"{database_version(metadata)}#{hashlib.sha256(data).hexdigest()[:12]}"
+
+class QueryCache:
+    """Bounded LRU cache of query results with a per-entry TTL.
+
+    Keys are normalized queries; every entry belongs to the database version
+    current when it was stored and set_version() drops entries of older ones.
+    A client serving its own data version (server.js and its tariff snapshot)
+    passes it as data_version, and only sees entries stored under the same one.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600, version=""):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = version
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def set_version(self, version):
+        """Switch database version, dropping every entry of the previous one"""
+        with self._lock:
+            if version != self.version:
+                if self.version:
+                    self.invalidations += 1
+                self.version = version
+                self._entries.clear()
+
+    def get(self, query, default=None, data_version=""):
+        key = (data_version, normalize_query(query))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, query, value, data_version=""):
+        key = (data_version, normalize_query(query))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+class DatabaseVersionWatcher:
+    """Keeps a cache's version in step with the database file on disk"""
+
+    def __init__(self, cache, database_path, interval=1.0):
+        self.cache = cache
+        self.database_path = database_path
+        self.interval = interval
+        self._checked = 0.0
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked < self.interval:
+                return
+            self._checked = now
+            try:
+                mtime = os.stat(self.database_path).st_mtime
+                if mtime != self._mtime:
+                    self._mtime = mtime
+                    self.cache.set_version(read_database_version(self.database_path))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read database version: {e}")
+
+def make_sidecar_handler(cache, watcher):
+    """HTTP handler class serving one cache.
+
+    GET  /cache?q=...&v=...  -> 200 {"value": ...} or 404
+    PUT  /cache              <- {"query": ..., "value": ..., "version": ...}
+    v / version is the client's data version (optional)
+    GET  /stats         -> hit/miss counters
+    """
+
+    class CacheHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            watcher.check()
+            if url.path == "/stats":
+                return self._send(200, cache.stats())
+            if url.path != "/cache":
+                return self._send(404, {"error": "not found"})
+            params = parse_qs(url.query)
+            value = cache.get(params.get("q", [""])[0], data_version=params.get("v", [""])[0])
+            if value is None:
+                return self._send(404, {"hit": False, "version": cache.version})
+            self._send(200, {"hit": True, "version": cache.version, "value": value})
+
+        def do_PUT(self):
+            if urlparse(self.path).path != "/cache":
+                return self._send(404, {"error": "not found"})
+            watcher.check()
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                cache.put(body["query"], body["value"], str(body.get("version") or ""))
+            except (KeyError, ValueError) as e:
+                return self._send(400, {"error": f"invalid body: {e}"})
+            self._send(200, {"stored": True, "version": cache.version})
+
+        do_POST = do_PUT
+
+        def log_message(self, format, *args):
+            pass
+
+    return CacheHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the query cache as a local sidecar")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", default="hs-codes-database.json",
+                        help="database whose version keys the cache")
+    parser.add_argument("--max-entries", type=int, default=10000)
+    parser.add_argument("--ttl", type=float, default=3600, help="entry lifetime in seconds")
+    args = parser.parse_args()
+
+    cache = QueryCache(args.max_entries, args.ttl)
+    watcher = DatabaseVersionWatcher(cache, args.database)
+    watcher.check()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_sidecar_handler(cache, watcher))
+    print(f"✅ Query cache sidecar on http://{args.host}:{args.port} (database {cache.version})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Prebuilt search artifact for fast server startup
+hs-codes-index.json holds everything server.js needs to serve requests: the
+code records, inverted index, code hierarchy, trigram index, keyword phrase
+table and numeric interval index, plus the SHA-256 of the tariff PDF they
+were extracted from. server.js loads it at boot and only parses the PDF
+itself when the artifact is missing, of an unsupported version, or built
+from a different PDF
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+from extraction_core import validate_codes
+from fuzzy_match import build_trigram_index
+from hs_hierarchy import build_hierarchy
+from numeric_intervals import build_interval_index
+from phrase_matcher import build_phrase_table
+from search_index import document_tokens, index_path_for, write_index
+
+# Bump together with SEARCH_ARTIFACT_VERSION in server.js when the layout changes
+ARTIFACT_VERSION = 1
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hex SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_search_artifact(database, output_path, pdf_path=None, chapter_titles=None):
+    """Write the artifact for a {"metadata", "codes"} database.
+
+    pdf_path, when given, is hashed into the metadata so the server can tell
+    whether the artifact still matches the PDF it ships with.
+    """
+    codes = database["codes"]
+    metadata = {
+        **database.get("metadata", {}),
+        "artifact_version": ARTIFACT_VERSION,
+        "artifact_built": datetime.now().isoformat(timespec="seconds"),
+        "pdf_sha256": file_sha256(pdf_path) if pdf_path else None,
+        "pdf_name": os.path.basename(pdf_path) if pdf_path else None
+    }
+    return write_index({"metadata": metadata, "codes": codes}, output_path, {
+        "codes": [{"code": item["code"], "description": item["description"]} for item in codes],
+        "hierarchy": build_hierarchy(codes, chapter_titles),
+        "trigram_index": build_trigram_index({token for item in codes
+                                              for token in document_tokens(item)}),
+        "phrase_index": build_phrase_table(codes),
+        "interval_index": build_interval_index(codes)
+    })
+
+def artifact_status(artifact_path, pdf_path):
+    """"fresh", "missing", "unsupported" or "stale" for an artifact and PDF"""
+    if not os.path.exists(artifact_path):
+        return "missing"
+    with open(artifact_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f).get("metadata", {})
+    if metadata.get("artifact_version") != ARTIFACT_VERSION:
+        return "unsupported"
+    if os.path.exists(pdf_path) and metadata.get("pdf_sha256") != file_sha256(pdf_path):
+        return "stale"
+    return "fresh"
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check the prebuilt search artifact")
+    parser.add_argument("--database", default="hs-codes-database.json",
+                        help="extracted JSON database to build the artifact from")
+    parser.add_argument("--pdf", default="Customs Tariff of India.pdf",
+                        help="tariff PDF the database was extracted from")
+    parser.add_argument("--check", action="store_true",
+                        help="only report whether the artifact matches the PDF")
+    args = parser.parse_args()
+
+    artifact_path = index_path_for(args.database)
+    if args.check:
+        status = artifact_status(artifact_path, args.pdf)
+        print(f"{'✅' if status == 'fresh' else '⚠️'} {artifact_path}: {status}")
+        raise SystemExit(0 if status == "fresh" else 1)
+
+    with open(args.database, 'r', encoding='utf-8') as f:
+        database = json.load(f)
+    problems = validate_codes(database["codes"])
+    if problems:
+        print(f"❌ {len(problems)} invalid entries, first: {problems[0]}")
+        raise SystemExit(1)
+
+    write_search_artifact(database, artifact_path, args.pdf if os.path.exists(args.pdf) else None)
+    print(f"✅ Search artifact written: {artifact_path} ({len(database['codes'])} codes)")
+
+if __name__ == "__main__":
+    main()
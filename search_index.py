@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Inverted keyword index over the HS code database
+Built at database-generation time and written to hs-codes-index.json, so
+lookups only touch codes that share a token with the query
+"""
+
+import bisect
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from extraction_core import tokenize
+
+INDEX_VERSION = 1
+
+def document_tokens(item):
+    """Search tokens of a database record: its description plus its keywords"""
+    tokens = tokenize(item["description"])
+    for keyword in item.get("keywords", []):
+        tokens.extend(tokenize(keyword))
+    return tokens
+
+def build_inverted_index(codes):
+    """Map normalized token -> posting list of [code id, term frequency]"""
+    postings = {}
+    doc_lengths = []
+    for code_id, item in enumerate(codes):
+        counts = Counter(document_tokens(item))
+        doc_lengths.append(sum(counts.values()))
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append([code_id, tf])
+
+    return {
+        "version": INDEX_VERSION,
+        "codes": [item["code"] for item in codes],
+        "doc_lengths": doc_lengths,
+        "postings": {token: postings[token] for token in sorted(postings)}
+    }
+
+def index_path_for(output_path):
+    """Path of the search index artifact written next to the JSON database"""
+    path = Path(output_path)
+    return str(path.with_name(path.stem.replace("-database", "") + "-index.json"))
+
+def write_index(database, output_path, sections=None):
+    """Write the search index artifact for a {"metadata", "codes"} database.
+
+    sections holds further prebuilt structures (e.g. the code hierarchy)
+    stored in the artifact next to the inverted index.
+    """
+    artifact = {
+        "metadata": database.get("metadata", {}),
+        "inverted_index": build_inverted_index(database["codes"]),
+        **(sections or {})
+    }
+    # Written beside the target and renamed over it, so a server watching the
+    # file for hot reload never reads a half-written artifact
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, output_path)
+    return artifact
+
+class InvertedIndex:
+    """Query-side view of a built inverted index"""
+
+    def __init__(self, index):
+        self.codes = index["codes"]
+        self.doc_lengths = index["doc_lengths"]
+        self.postings = index["postings"]
+        self.vocabulary = sorted(self.postings)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["inverted_index"])
+
+    def expand(self, token):
+        """Indexed tokens starting with a query token ("horse" -> "horses")"""
+        start = bisect.bisect_left(self.vocabulary, token)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(token):
+            end += 1
+        return self.vocabulary[start:end]
+
+    def candidates(self, query, prefix=True):
+        """{code id: number of query tokens it matches} for codes sharing a token"""
+        matches = {}
+        for token in set(tokenize(query)):
+            terms = self.expand(token) if prefix else [token] if token in self.postings else []
+            hit = set()
+            for term in terms:
+                for code_id, _ in self.postings[term]:
+                    hit.add(code_id)
+            for code_id in hit:
+                matches[code_id] = matches.get(code_id, 0) + 1
+        return matches
+
+    def lookup(self, query, prefix=True):
+        """Candidate codes for a query, most matched tokens first"""
+        matches = self.candidates(query, prefix)
+        ranked = sorted(matches, key=lambda code_id: (-matches[code_id], code_id))
+        return [self.codes[code_id] for code_id in ranked]
@@ -1,11 +1,17 @@
 import express from 'express';
 import cors from 'cors';
-import pdfParse from 'pdf-parse';
 import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import Groq from 'groq-sdk';
 import fetch from 'node-fetch';
+import { MetricsRegistry, PROMETHEUS_CONTENT_TYPE } from './metrics.js';
+import { CircuitBreaker, ConcurrencyLimiter, SingleFlight } from './llm_guard.js';
+import { MicroBatcher } from './micro_batcher.js';
+import { FuzzyMatcher } from './fuzzy_match.js';
+import { PhraseMatcher } from './phrase_matcher.js';
+import { IntervalIndex } from './numeric_intervals.js';
+import { loadTariffInWorker } from './tariff_loader.js';
 
 // Ensure fetch is available globally
 if (!globalThis.fetch) {
@@ -43,97 +49,373 @@ const BACKUP_MODELS = [
     'groq/compound-mini'
 ];
 
-let tariffContext = '';
-let tariffLoaded = false;
-let hsCodeList = []; // Store structured codes
-let hsCodeMap = {}; // Map for fast lookup
+// Upstream call guards: at most LLM_MAX_CONCURRENCY Groq calls run at once
+// with up to LLM_MAX_QUEUE waiting, and a model whose breaker has seen
+// LLM_BREAKER_FAILURES consecutive failures is skipped for LLM_BREAKER_COOLDOWN_MS
+const LLM_MAX_CONCURRENCY = parseInt(process.env.LLM_MAX_CONCURRENCY, 10) || 4;
+const LLM_MAX_QUEUE = parseInt(process.env.LLM_MAX_QUEUE, 10) || 100;
+const LLM_BREAKER_FAILURES = parseInt(process.env.LLM_BREAKER_FAILURES, 10) || 3;
+const LLM_BREAKER_COOLDOWN_MS = parseInt(process.env.LLM_BREAKER_COOLDOWN_MS, 10) || 30000;
+
+// Distinct low-confidence queries arriving within LLM_BATCH_WINDOW_MS (up to
+// LLM_BATCH_MAX_ITEMS) are classified with one prompt; a window of 0 sends
+// every query on its own
+const LLM_BATCH_WINDOW_MS = parseInt(process.env.LLM_BATCH_WINDOW_MS ?? '20', 10) || 0;
+const LLM_BATCH_MAX_ITEMS = parseInt(process.env.LLM_BATCH_MAX_ITEMS, 10) || 8;
+
+const llmFlights = new SingleFlight();
+const llmLimiter = new ConcurrencyLimiter(LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE);
+const llmBreakers = new Map([SELECTED_MODEL, ...BACKUP_MODELS].map(model =>
+    [model, new CircuitBreaker(model, LLM_BREAKER_FAILURES, LLM_BREAKER_COOLDOWN_MS)]));
+
+// Optional query cache sidecar (python query_cache.py), e.g. http://127.0.0.1:8765
+const CACHE_URL = process.env.HS_CACHE_URL || '';
+const CACHE_TIMEOUT_MS = 50;
+
+// A quantity match is only answered when its code is among this many of the
+// best local matches (numeric_intervals.js)
+const INTERVAL_AGREEMENT_TOP_N = 10;
+
+// Number of best local matches sent to the LLM (plus their heading siblings)
+const LLM_SHORTLIST_SIZE = parseInt(process.env.LLM_SHORTLIST_SIZE, 10) || 25;
+
+// Per-request logging is synchronous stdout work on the hot path, so it is
+// only written with LOG_LEVEL=debug; errors are always logged
+const DEBUG_LOGGING = (process.env.LOG_LEVEL || '').toLowerCase() === 'debug';
+
+function debugLog(...args) {
+    if (DEBUG_LOGGING) console.log(...args);
+}
+
+// Request metrics, served in Prometheus text format at GET /metrics.
+// "path" is how a classification was answered: cache, interval (numeric
+// range), local, fuzzy (local after typo correction), llm,
+// llm_clarification, no_llm, invalid, unavailable or error
+const metrics = new MetricsRegistry();
+const requestCounter = metrics.counter('hs_requests_total',
+    'Classification requests by answer path and HTTP status', ['path', 'status']);
+const requestDuration = metrics.histogram('hs_request_duration_seconds',
+    'Classification request latency by answer path', ['path']);
+const localSearchDuration = metrics.histogram('hs_local_search_duration_seconds',
+    'Local ranking time per request, including the fuzzy retry');
+const llmCalls = metrics.counter('hs_llm_calls_total',
+    'Groq chat completion calls by model, role (primary/backup) and outcome', ['model', 'role', 'outcome']);
+const llmDuration = metrics.histogram('hs_llm_call_duration_seconds',
+    'Groq chat completion latency by model and outcome', ['model', 'outcome']);
+const cacheLookups = metrics.counter('hs_cache_lookups_total',
+    'Query cache sidecar lookups by result (hit/miss/error)', ['result']);
+const llmCoalesced = metrics.counter('hs_llm_coalesced_total',
+    'LLM requests that joined an identical in-flight query instead of calling Groq');
+const llmSkipped = metrics.counter('hs_llm_skipped_total',
+    'Groq calls not made, by model and reason (circuit_open/queue_full)', ['model', 'reason']);
+metrics.gauge('hs_llm_active_calls', 'Groq calls currently running', [], () => llmLimiter.active);
+metrics.gauge('hs_llm_queued_calls', 'Groq calls waiting for a concurrency slot', [], () => llmLimiter.waiting);
+const breakerOpen = metrics.gauge('hs_llm_circuit_open',
+    'Whether a model\'s circuit breaker is open (1) or half-open/closed (0)', ['model']);
+const llmBatchSize = metrics.histogram('hs_llm_batch_size',
+    'Queries per micro-batched LLM call', [], [1, 2, 4, 8, 16, 32]);
+const llmBatchMisses = metrics.counter('hs_llm_batch_misses_total',
+    'Batched queries missing from the batch answer and classified on their own');
+metrics.gauge('hs_codes_loaded', 'HS codes extracted from the tariff', [], () => tariff.codes.length);
+const tariffReloads = metrics.counter('hs_tariff_reloads_total',
+    'Tariff reloads by result (swapped/unchanged/failed)', ['result']);
+const tariffReloadDuration = metrics.histogram('hs_tariff_reload_duration_seconds',
+    'Time to load, build and validate a tariff snapshot', [], [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120]);
+
+const PDF_PATH = path.join(__dirname, 'Customs Tariff of India.pdf');
+const INDEX_PATH = path.join(__dirname, 'hs-codes-index.json');
+// Layout version of hs-codes-index.json (ARTIFACT_VERSION in search_artifact.py)
+const SEARCH_ARTIFACT_VERSION = 1;
+// How often the artifact and PDF are polled for changes (0 disables hot reload),
+// and how long they must stay unchanged before a reload starts
+const TARIFF_WATCH_INTERVAL_MS = parseInt(process.env.TARIFF_WATCH_INTERVAL_MS ?? '2000', 10) || 0;
+const TARIFF_RELOAD_DEBOUNCE_MS = parseInt(process.env.TARIFF_RELOAD_DEBOUNCE_MS, 10) || 1000;
+// A reload is rejected unless each probe code ranks within this many results for its own description
+const SELF_CHECK_TOP_N = 3;
+
+// The searchable tariff: codes, lookup maps, indexes and LLM context built
+// together into one frozen snapshot. A request reads `tariff` once and uses
+// only that snapshot, so a reload swapping in the next one never mixes two
+// tariffs within a request; requests already running finish on the old one.
+const EMPTY_TARIFF = Object.freeze({
+    loaded: false,
+    version: null,
+    source: null,
+    codes: [],
+    codeMap: {},
+    prefixGroups: new Map(),
+    searchIndex: null, // Prebuilt inverted index (hs-codes-index.json), if present
+    fuzzyMatcher: null, // Trigram matcher over the vocabulary, for misspelled/abbreviated queries
+    phraseIndex: null, // Aho-Corasick automaton over keyword phrases ("peanut butter")
+    intervalIndex: null, // Numeric ranges of descriptions ("over 100 kg but not over 160 kg")
+    indexProblem: null, // Why the artifact's index could not be used, if it was not
+    context: '',
+    loadedAt: null
+});
+let tariff = EMPTY_TARIFF;
+
+const tariffReload = {
+    inProgress: false,
+    pending: null, // Trigger of a change seen while a reload was running
+    generation: 0, // Snapshots swapped in so far
+    failures: 0,
+    activeLoadMs: null, // Reload time of the snapshot being served
+    last: null // { trigger, result, version, durationMs, loadMs, buildMs, error, finishedAt }
+};
+
+// Lets requests queued behind a reload run between its steps
+function yieldToRequests() {
+    return new Promise(resolve => setImmediate(resolve));
+}
+
+// Snapshot of the tariff data read by tariff_loader.js. Each section is parsed
+// and each index built in its own step, so no single step holds up requests
+// for long; the snapshot is invisible to them until it is swapped in
+async function buildTariffSnapshot({ source, version, sections, rawText }) {
+    const parsed = {};
+    for (const [name, text] of Object.entries(sections)) {
+        parsed[name] = JSON.parse(text);
+        await yieldToRequests();
+    }
+    const codes = parsed.codes;
+    const codeMap = {};
+    codes.forEach(item => {
+        (codeMap[item.code] = codeMap[item.code] || []).push(item);
+    });
+    const prefixGroups = buildPrefixGroups(codeMap);
+    await yieldToRequests();
+    const indexes = await buildSearchIndexes(parsed.inverted_index ? parsed : null, codes, codeMap);
+    return Object.freeze({
+        loaded: true,
+        version,
+        source,
+        codes,
+        codeMap,
+        prefixGroups,
+        ...indexes,
+        context: codes.length ? codes.map(item => `${item.code} - ${item.description}`).join('\n') : rawText || '',
+        loadedAt: new Date().toISOString()
+    });
+}
+
+// Use the inverted index of the search artifact (search_artifact.py), so local
+// search only scores codes sharing a token with the query
+async function buildSearchIndexes(artifact, codes, codeMap) {
+    const indexes = { searchIndex: null, fuzzyMatcher: null, phraseIndex: null, intervalIndex: null, indexProblem: null };
+
+    if (!artifact) {
+        console.log('ℹ️ No prebuilt search index, local search will scan all codes');
+        return indexes;
+    }
 
-// Load and parse PDF on startup
-async function loadPDF() {
     try {
-        console.log('📄 Loading Customs Tariff PDF...');
-        const pdfPath = path.join(__dirname, 'Customs Tariff of India.pdf');
-        
-        if (!fs.existsSync(pdfPath)) {
-            console.error('❌ PDF file not found at:', pdfPath);
-            console.error('Current directory:', __dirname);
-            console.error('Files in directory:', fs.readdirSync(__dirname).slice(0, 10));
-            return;
+        const index = artifact.inverted_index;
+        const indexedCodes = new Set(index.codes);
+        const unindexed = codes.filter(item => !indexedCodes.has(item.code)).length;
+
+        // An index built from a different tariff would hide codes from search
+        if (unindexed > 0) {
+            indexes.indexProblem = `search index does not cover ${unindexed} extracted codes`;
+            console.warn(`⚠️ Search index does not cover ${unindexed} extracted codes, ignoring it`);
+            return indexes;
         }
 
-        const pdfBuffer = fs.readFileSync(pdfPath);
-        console.log('📦 PDF size:', (pdfBuffer.length / 1024 / 1024).toFixed(2) + 'MB');
-        
-        const data = await pdfParse(pdfBuffer);
-        console.log('✅ PDF parsed, pages:', data.numpages);
-        
-        // Extract structured HS codes from PDF
-        const lines = data.text.split('\n');
-        console.log('📄 Total lines in PDF:', lines.length);
-        
-        let currentCode = null;
-        let currentDescription = '';
-        
-        for (let line of lines) {
-            const trimmed = line.trim();
-            
-            // Look for 8-digit HS codes at the start of a line
-            const codeMatch = trimmed.match(/^(\d{8})[\s\-–](.+)/);
-            
-            if (codeMatch) {
-                // Save previous code if exists
-                if (currentCode && currentDescription.trim()) {
-                    hsCodeList.push({
-                        code: currentCode,
-                        description: currentDescription.trim()
-                    });
-                }
-                
-                // Start new code
-                currentCode = codeMatch[1];
-                currentDescription = codeMatch[2].trim();
-            } else if (currentCode && trimmed && !trimmed.match(/^\d+$/) && trimmed.length > 2) {
-                // Continue description if not empty
-                if (currentDescription.length < 500) { // Limit description length
-                    currentDescription += ' ' + trimmed;
-                }
-            }
+        const searchIndex = {
+            items: index.codes.map(code => codeMap[code] || []),
+            postings: index.postings,
+            vocabulary: Object.keys(index.postings).sort()
+        };
+        indexes.searchIndex = searchIndex;
+        console.log('✅ Search index loaded:', searchIndex.vocabulary.length, 'tokens');
+        await yieldToRequests();
+
+        if (artifact.trigram_index) {
+            indexes.fuzzyMatcher = new FuzzyMatcher(artifact.trigram_index);
+            await yieldToRequests();
         }
 
-        // Save last code
-        if (currentCode && currentDescription.trim()) {
-            hsCodeList.push({
-                code: currentCode,
-                description: currentDescription.trim()
-            });
+        if (artifact.phrase_index) {
+            // Phrase table code ids are positions in the inverted index's code list
+            indexes.phraseIndex = { matcher: new PhraseMatcher(artifact.phrase_index), codes: index.codes };
+            console.log('✅ Phrase matcher loaded:', indexes.phraseIndex.matcher.phrases.length, 'keyword phrases');
+            await yieldToRequests();
         }
 
-        console.log('🔍 Found', hsCodeList.length, 'HS codes');
-        
-        if (hsCodeList.length > 0) {
-            console.log('📋 Sample codes:');
-            hsCodeList.slice(0, 5).forEach(item => {
-                console.log(`  ${item.code}: ${item.description.substring(0, 60)}`);
-            });
-            
-            // Create tariff context from structured codes
-            tariffContext = hsCodeList.map(item => `${item.code} - ${item.description}`).join('\n');
+        if (artifact.interval_index) {
+            indexes.intervalIndex = { index: new IntervalIndex(artifact.interval_index), items: searchIndex.items };
+            console.log('✅ Interval index loaded:', artifact.interval_index.intervals.length, 'numeric ranges');
+        }
+    } catch (error) {
+        indexes.indexProblem = `could not load search index: ${error.message}`;
+        console.warn('⚠️ Could not load search index:', error.message);
+    }
+    return indexes;
+}
+
+// Why a built snapshot must not replace the current one, or null if it may.
+// Beyond having codes, a few of its own descriptions must rank themselves
+// first, which catches an index that does not line up with the codes
+function snapshotProblem(next, current) {
+    if (!next.codes.length && !next.context) return 'tariff has no codes';
+    if (!current.loaded) return null; // Anything beats serving nothing
+    if (current.codes.length && !next.codes.length) {
+        return `no structured codes (serving ${current.codes.length})`;
+    }
+    if (next.indexProblem && current.searchIndex) return next.indexProblem;
+
+    // Phrase bonuses can rank a longer description above the probe's own, so
+    // it passes anywhere in the top few or tied with the best score
+    const probes = [0, next.codes.length >> 1, next.codes.length - 1]
+        .map(i => next.codes[i])
+        .filter(item => item && /[a-z0-9]/i.test(item.description));
+    for (const probe of probes) {
+        const ranked = rankCodes(next, probe.description);
+        const found = ranked.slice(0, SELF_CHECK_TOP_N).some(item => item.code === probe.code) ||
+            ranked.some(item => item.code === probe.code && item.score === ranked[0].score);
+        if (!found) {
+            return `self-check failed: "${probe.description.substring(0, 40)}" does not find ${probe.code}`;
+        }
+    }
+    return null;
+}
+
+// Load the tariff in a worker, build and validate the next snapshot and swap
+// it in with one assignment. On failure the current snapshot keeps serving.
+// Changes arriving mid-reload trigger one more reload afterwards
+async function reloadTariff(trigger) {
+    if (tariffReload.inProgress) {
+        tariffReload.pending = trigger;
+        return;
+    }
+    tariffReload.inProgress = true;
+    const start = Date.now();
+    const endTimer = tariffReloadDuration.startTimer();
+    const last = { trigger, result: 'failed', version: tariff.version, loadMs: null, buildMs: null, error: null };
+
+    try {
+        const data = await loadTariffInWorker({
+            indexPath: INDEX_PATH,
+            pdfPath: PDF_PATH,
+            artifactVersion: SEARCH_ARTIFACT_VERSION
+        });
+        last.loadMs = Date.now() - start;
+
+        if (data.version === tariff.version) {
+            last.result = 'unchanged';
         } else {
-            // Fallback: use raw PDF text
-            console.log('⚠️ No structured HS codes found, using raw PDF text');
-            tariffContext = data.text.substring(0, 50000);
+            const buildStart = Date.now();
+            const next = await buildTariffSnapshot(data);
+            const problem = snapshotProblem(next, tariff);
+            last.buildMs = Date.now() - buildStart;
+            if (problem) throw new Error(problem);
+
+            tariff = next;
+            tariffReload.generation++;
+            tariffReload.activeLoadMs = Date.now() - start;
+            last.result = 'swapped';
+            last.version = next.version;
+            console.log(`✅ ${next.codes.length} HS codes ready from ${next.source} (${next.version}) ` +
+                `in ${tariffReload.activeLoadMs} ms [${trigger}]`);
         }
-        
-        console.log('📊 Context size:', tariffContext.length, 'chars');
-        tariffLoaded = true;
-        console.log('✅ PDF ready for HS code search');
-        
     } catch (error) {
-        console.error('❌ Error loading PDF:', error.message);
-        tariffLoaded = false;
+        tariffReload.failures++;
+        last.error = error.message;
+        console.error(`❌ Tariff reload failed [${trigger}], still serving ${tariff.version || 'nothing'}:`,
+            error.message);
+    } finally {
+        endTimer();
+        tariffReloads.inc({ result: last.result });
+        tariffReload.last = { ...last, durationMs: Date.now() - start, finishedAt: new Date().toISOString() };
+        tariffReload.inProgress = false;
+    }
+
+    if (tariffReload.pending) {
+        const pendingTrigger = tariffReload.pending;
+        tariffReload.pending = null;
+        await reloadTariff(pendingTrigger);
     }
 }
 
+// Reload once the artifact or PDF has been rewritten and left alone for the
+// debounce interval (builders write them in several steps)
+function watchTariffFiles() {
+    if (!TARIFF_WATCH_INTERVAL_MS) return;
+    let timer = null;
+    for (const file of [INDEX_PATH, PDF_PATH]) {
+        fs.watchFile(file, { interval: TARIFF_WATCH_INTERVAL_MS, persistent: false }, (current, previous) => {
+            if (current.mtimeMs === previous.mtimeMs && current.size === previous.size) return;
+            clearTimeout(timer);
+            timer = setTimeout(() => reloadTariff(`${path.basename(file)} changed`), TARIFF_RELOAD_DEBOUNCE_MS);
+        });
+    }
+    console.log(`👀 Watching ${path.basename(INDEX_PATH)} and the tariff PDF for changes ` +
+        `(every ${TARIFF_WATCH_INTERVAL_MS} ms)`);
+}
+
+// Group codes by subheading and heading so related codes are real siblings
+function buildPrefixGroups(codeMap) {
+    const prefixGroups = new Map();
+    const sorted = Object.keys(codeMap).sort();
+    for (const code of sorted) {
+        for (const prefix of [code.substring(0, 6), code.substring(0, 4)]) {
+            if (!prefixGroups.has(prefix)) prefixGroups.set(prefix, []);
+            prefixGroups.get(prefix).push(codeMap[code][0]);
+        }
+    }
+    return prefixGroups;
+}
+
+// Codes under the nearest subheading/heading that has other codes in it
+function siblingCodes(snapshot, code, limit) {
+    for (const prefix of [code.substring(0, 6), code.substring(0, 4)]) {
+        const siblings = (snapshot.prefixGroups.get(prefix) || []).filter(item => item.code !== code);
+        if (siblings.length > 0) {
+            return siblings.slice(0, limit);
+        }
+    }
+    return [];
+}
+
+// Vocabulary tokens containing token anywhere ("nuts" -> "coconuts"). A token
+// containing it has every trigram of it, so the rarest trigram's tokens of the
+// fuzzy matcher are the only ones to check; short tokens scan the vocabulary
+function vocabularyContaining(snapshot, token) {
+    const { fuzzyMatcher, searchIndex } = snapshot;
+    if (!fuzzyMatcher || token.length < 3) {
+        return searchIndex.vocabulary.filter(word => word.includes(token));
+    }
+    let rarest = null;
+    for (let i = 0; i + 3 <= token.length; i++) {
+        const tokenIds = fuzzyMatcher.trigrams[token.substring(i, i + 3)] || [];
+        if (!rarest || tokenIds.length < rarest.length) rarest = tokenIds;
+    }
+    return rarest.map(tokenId => fuzzyMatcher.vocabulary[tokenId]).filter(word => word.includes(token));
+}
+
+// Codes with a token containing a query token, i.e. every code the substring
+// scoring of rankCodes can give a keyword match. A query word without any
+// letter or digit could match any description, so it scores all codes
+function indexCandidates(snapshot, productDescription) {
+    const words = productDescription.toLowerCase().split(/\s+/).filter(Boolean);
+    if (words.some(word => !/[a-z0-9]/.test(word))) {
+        return snapshot.codes;
+    }
+    const tokens = new Set(productDescription.toLowerCase().match(/[a-z0-9]+/g) || []);
+    const { postings, items } = snapshot.searchIndex;
+    const codeIds = new Set();
+
+    for (const token of tokens) {
+        for (const word of vocabularyContaining(snapshot, token)) {
+            (postings[word] || []).forEach(([codeId]) => codeIds.add(codeId));
+        }
+    }
+
+    // In database order, so equal scores rank as in a scan of every code
+    const candidates = [];
+    [...codeIds].sort((a, b) => a - b).forEach(codeId => candidates.push(...items[codeId]));
+    return candidates;
+}
+
 // Serve home page
 app.get('/', (req, res) => {
     res.sendFile(path.join(__dirname, 'index.html'));
@@ -144,22 +426,40 @@ app.get('/api/health', (req, res) => {
     res.json({
         status: 'OK',
         model: SELECTED_MODEL,
-        pdfLoaded: tariffLoaded,
-        hsCodesExtracted: hsCodeList.length,
-        contextLength: tariffContext.length,
+        pdfLoaded: tariff.loaded,
+        tariffSource: tariff.source,
+        tariffLoadMs: tariffReload.activeLoadMs,
+        hsCodesExtracted: tariff.codes.length,
+        tariff: {
+            version: tariff.version,
+            generation: tariffReload.generation,
+            loadedAt: tariff.loadedAt,
+            reloadInProgress: tariffReload.inProgress,
+            reloadFailures: tariffReload.failures,
+            lastReload: tariffReload.last
+        },
+        llm: {
+            activeCalls: llmLimiter.active,
+            queuedCalls: llmLimiter.waiting,
+            coalescedQueries: llmFlights.size,
+            breakers: Object.fromEntries([...llmBreakers].map(([model, breaker]) => [model, breaker.status()]))
+        },
+        contextLength: tariff.context.length,
         timestamp: new Date().toISOString()
     });
 });
 
 // Get HS codes list (for debugging)
 app.get('/api/hs-codes', (req, res) => {
-    if (!tariffLoaded) {
+    const snapshot = tariff;
+    if (!snapshot.loaded) {
         return res.status(503).json({ error: 'PDF not loaded yet' });
     }
     res.json({
-        total: hsCodeList.length,
-        sample: hsCodeList.slice(0, 20),
-        allCodes: hsCodeList.map(item => item.code)
+        total: snapshot.codes.length,
+        version: snapshot.version,
+        sample: snapshot.codes.slice(0, 20),
+        allCodes: snapshot.codes.map(item => item.code)
     });
 });
 
@@ -192,14 +492,25 @@ app.get('/api/groq-models', async (req, res) => {
 });
 
 // SMART LOCAL SEARCH - Works instantly without API
-function findHSCodeLocally(productDescription) {
-    if (!hsCodeList.length) {
-        return null;
-    }
-    
+// Score candidate codes for a description, best first
+// code -> weight of the keyword phrases found in the query, in one pass
+function phraseScores(snapshot, productDescription) {
+    const scores = new Map();
+    const { phraseIndex } = snapshot;
+    if (!phraseIndex) return scores;
+    phraseIndex.matcher.features(productDescription).forEach((weight, codeId) => {
+        scores.set(phraseIndex.codes[codeId], weight);
+    });
+    return scores;
+}
+
+function rankCodes(snapshot, productDescription) {
     const keywords = productDescription.toLowerCase().split(/\s+/);
-    const scored = hsCodeList.map(item => {
-        let score = 0;
+    const pool = snapshot.searchIndex ? indexCandidates(snapshot, productDescription) : snapshot.codes;
+    const phrases = phraseScores(snapshot, productDescription);
+    const scored = pool.map(item => {
+        // Keyword phrases of the code found in the query, as whole units
+        let score = phrases.get(item.code) || 0;
         const descLower = item.description.toLowerCase();
         
         // Exact phrase match = highest score
@@ -220,8 +531,16 @@ function findHSCodeLocally(productDescription) {
         return { ...item, score };
     });
     
-    const best = scored.sort((a, b) => b.score - a.score)[0];
-    const top3 = scored.sort((a, b) => b.score - a.score).slice(1, 4);
+    return scored.sort((a, b) => b.score - a.score);
+}
+
+function findHSCodeLocally(snapshot, productDescription, scored = rankCodes(snapshot, productDescription)) {
+    if (!snapshot.codes.length) {
+        return null;
+    }
+    
+    const keywords = productDescription.toLowerCase().split(/\s+/);
+    const best = scored[0];
     
     if (!best || best.score < 5) {
         return null; // Not confident
@@ -236,22 +555,335 @@ function findHSCodeLocally(productDescription) {
             `Related to ${best.description.split(' ').slice(0, 3).join(' ')}`,
             `Classification: 8-digit HS code from Indian Customs Tariff`
         ],
-        relatedCodes: top3.map(item => ({
-            code: item.code,
-            description: item.description
-        }))
+        relatedCodes: relatedCodesFor(snapshot, best, scored)
+    };
+}
+
+// A query with a quantity ("buffalo 120 kg") answered from the interval index:
+// the code whose numeric range holds it and that matches the other words.
+// Only used when the ranking agrees, i.e. the code is among its top
+// candidates, and scored like a local match of that candidate
+function findHSCodeByQuantity(snapshot, productDescription, scored) {
+    if (!snapshot.intervalIndex || !/\d/.test(productDescription)) {
+        return null;
+    }
+    const { index, items } = snapshot.intervalIndex;
+    const resolved = index.resolve(productDescription, codeId => (items[codeId][0]?.description || '').length);
+    const best = resolved && items[resolved.codeId][0];
+    const ranked = best && scored.slice(0, INTERVAL_AGREEMENT_TOP_N).find(item => item.code === best.code);
+    if (!ranked || ranked.score < 5) {
+        return null;
+    }
+
+    const { attribute, start, end } = resolved.quantity;
+    return {
+        hsCode: best.code,
+        description: best.description,
+        confidence: Math.min(100, Math.max(50, ranked.score * 5)),
+        reasons: [
+            `Stated ${attribute} (${productDescription.slice(start, end)}) falls within the range of this subheading`,
+            `Related to ${best.description.split(' ').slice(0, 3).join(' ')}`,
+            `Classification: 8-digit HS code from Indian Customs Tariff`
+        ],
+        relatedCodes: relatedCodesFor(snapshot, best, [])
     };
 }
 
+// Siblings from the code hierarchy first, topped up with the next best scores
+function relatedCodesFor(snapshot, best, scored) {
+    const related = siblingCodes(snapshot, best.code, 3);
+    const seen = new Set([best.code, ...related.map(item => item.code)]);
+    for (const item of scored) {
+        if (related.length >= 3) break;
+        if (!seen.has(item.code)) {
+            seen.add(item.code);
+            related.push(item);
+        }
+    }
+    return related.map(item => ({
+        code: item.code,
+        description: item.description
+    }));
+}
+
+// fetch() that gives up after a few milliseconds (AbortSignal.timeout needs Node 17.3+)
+async function fetchWithTimeout(url, options, timeoutMs) {
+    const controller = new AbortController();
+    const timer = setTimeout(() => controller.abort(), timeoutMs);
+    try {
+        return await fetch(url, { ...options, signal: controller.signal });
+    } finally {
+        clearTimeout(timer);
+    }
+}
+
+// Cached response for a query from the sidecar, or null (misses and errors
+// alike). Entries are keyed on the snapshot's tariff version, so answers from
+// a tariff a reload has replaced are never served
+async function cacheGet(snapshot, query) {
+    if (!CACHE_URL) return null;
+    try {
+        const url = `${CACHE_URL}/cache?q=${encodeURIComponent(query)}&v=${encodeURIComponent(snapshot.version)}`;
+        const response = await fetchWithTimeout(url, {}, CACHE_TIMEOUT_MS);
+        const value = response.ok ? (await response.json()).value || null : null;
+        cacheLookups.inc({ result: value ? 'hit' : 'miss' });
+        return value;
+    } catch (error) {
+        cacheLookups.inc({ result: 'error' });
+        return null;
+    }
+}
+
+// Store a response in the sidecar without holding up the request; an answer
+// from a snapshot that has since been replaced is not stored
+function cachePut(snapshot, query, value) {
+    if (!CACHE_URL || snapshot !== tariff) return;
+    fetchWithTimeout(`${CACHE_URL}/cache`, {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ query, value, version: snapshot.version })
+    }, CACHE_TIMEOUT_MS).catch(() => {});
+}
+
+// Tariff lines for the LLM prompt: the best local matches plus heading
+// siblings of the top few, instead of the whole tariff. Falls back to the
+// full context only when no code shares a keyword with the query.
+function buildPromptContext(snapshot, scored) {
+    const matched = scored.filter(item => item.score > 0).slice(0, LLM_SHORTLIST_SIZE);
+    if (matched.length === 0) {
+        return snapshot.context;
+    }
+
+    const seen = new Set();
+    const lines = [];
+    const add = item => {
+        if (!seen.has(item.code)) {
+            seen.add(item.code);
+            lines.push(`${item.code} - ${item.description}`);
+        }
+    };
+    matched.forEach(add);
+    matched.slice(0, 5).forEach(item => siblingCodes(snapshot, item.code, 3).forEach(add));
+    return lines.join('\n');
+}
+
+// One Groq chat completion, timed and counted per model
+async function createCompletion(model, role, prompt) {
+    const endTimer = llmDuration.startTimer();
+    try {
+        const response = await groq.chat.completions.create({
+            messages: [{ role: 'user', content: prompt }],
+            model,
+            temperature: 0.2,
+            max_tokens: 1200,
+        });
+        endTimer({ model, outcome: 'success' });
+        llmCalls.inc({ model, role, outcome: 'success' });
+        return response;
+    } catch (error) {
+        endTimer({ model, outcome: 'error' });
+        llmCalls.inc({ model, role, outcome: 'error' });
+        throw error;
+    }
+}
+
+// The primary model, then each backup in turn, skipping models whose circuit
+// breaker is open; every call waits for a slot in the concurrency limiter
+async function completeWithFallback(prompt) {
+    let lastError = null;
+    for (const model of [SELECTED_MODEL, ...BACKUP_MODELS]) {
+        const role = model === SELECTED_MODEL ? 'primary' : 'backup';
+        const breaker = llmBreakers.get(model);
+        if (!breaker.allowRequest()) {
+            debugLog('⏭️ Circuit open, skipping model:', model);
+            llmSkipped.inc({ model, reason: 'circuit_open' });
+            continue;
+        }
+        try {
+            const response = await llmLimiter.run(() => createCompletion(model, role, prompt));
+            breaker.recordSuccess();
+            breakerOpen.set({ model }, 0);
+            if (role === 'backup') debugLog('✅ Backup model worked:', model);
+            return { response, usedModel: model };
+        } catch (error) {
+            if (error.name === 'QueueFullError') {
+                // Not the model's fault, so it does not count as a failure
+                breaker.cancelRequest();
+                llmSkipped.inc({ model, reason: 'queue_full' });
+                throw error;
+            }
+            breaker.recordFailure();
+            breakerOpen.set({ model }, breaker.state === 'open' ? 1 : 0);
+            console.error(`❌ ${role === 'primary' ? 'Primary' : 'Backup'} model failed:`, model, error.status || '', error.message);
+            lastError = error;
+        }
+    }
+    const error = new Error('All Groq models failed: ' +
+        (lastError ? lastError.message : 'every circuit breaker is open'));
+    error.status = 503;
+    throw error;
+}
+
+const CLASSIFICATION_RULES = `TASK (STRICT RULES):
+1. Find the BEST matching 8-digit HS code
+2. Provide 3 reasons (reference the tariff code descriptions)
+3. List 2 related codes
+4. Rate confidence (0-100)
+
+CONFIDENCE DECISION:
+- 75-100: Clear product → Return HS code
+- Below 75: Need more info → Return clarification questions`;
+
+const CLASSIFICATION_FIELDS = `"hsCode": "12345678" or null,
+  "description": "product name" or null,
+  "confidence": 85,
+  "reasons": ["reason1", "reason2", "reason3"] or [],
+  "relatedCodes": [{"code": "12345678", "description": "name"}] or [],
+  "clarificationQuestions": null or ["question1?", "question2?"]`;
+
+function buildClassificationPrompt(description, promptContext) {
+    return `You are an expert customs classifier with 50+ years of experience.
+
+PRODUCT: "${description}"
+
+HS CODES TO SEARCH FROM:
+${promptContext}
+
+${CLASSIFICATION_RULES}
+
+FORMAT (ONLY this JSON, nothing else):
+{
+  ${CLASSIFICATION_FIELDS}
+}`;
+}
+
+// One prompt for several products over the union of their shortlists
+function buildBatchPrompt(items) {
+    const lines = new Set();
+    for (const item of items) {
+        buildPromptContext(item.snapshot, item.ranked).split('\n').forEach(line => lines.add(line));
+    }
+    const products = items.map((item, i) => `[${i + 1}] "${item.description}"`).join('\n');
+    return `You are an expert customs classifier with 50+ years of experience.
+
+Classify each of the ${items.length} PRODUCTS below independently.
+
+PRODUCTS:
+${products}
+
+HS CODES TO SEARCH FROM:
+${[...lines].join('\n')}
+
+${CLASSIFICATION_RULES}
+Apply these rules to every product.
+
+FORMAT (ONLY this JSON array with one object per product, nothing else):
+[
+  {
+  "id": 1,
+  ${CLASSIFICATION_FIELDS}
+  }
+]`;
+}
+
+function responseContent(response) {
+    const responseText = response.choices[0]?.message?.content;
+    if (!responseText) {
+        console.error('❌ Empty response from Groq');
+        throw new Error('Empty response from AI');
+    }
+    debugLog('📝 Raw response (first 300 chars):', responseText.substring(0, 300));
+    return responseText;
+}
+
+// Extract the classification JSON object from a model answer
+function parseClassification(responseText) {
+    // Extract JSON from response - be more flexible
+    const jsonMatch = responseText.match(/\{[\s\S]*\}/);
+    if (!jsonMatch) {
+        console.error('❌ No JSON found in response. Full response:', responseText);
+        throw new Error('AI response format invalid');
+    }
+    try {
+        const parsed = JSON.parse(jsonMatch[0]);
+        debugLog('✅ Successfully parsed JSON');
+        return parsed;
+    } catch (parseError) {
+        console.error('❌ JSON parse failed:', parseError.message);
+        console.error('❌ Attempted to parse:', jsonMatch[0].substring(0, 200));
+        throw new Error('Could not parse AI response: ' + parseError.message);
+    }
+}
+
+// Per-item classifications of a batch answer, undefined where an item is missing
+function parseBatchClassification(responseText, count) {
+    const jsonMatch = responseText.match(/\[[\s\S]*\]/);
+    let answers = [];
+    try {
+        answers = jsonMatch ? JSON.parse(jsonMatch[0]) : [];
+    } catch (parseError) {
+        console.error('❌ Batch JSON parse failed:', parseError.message);
+    }
+    const results = new Array(count);
+    if (Array.isArray(answers)) {
+        for (const answer of answers) {
+            const id = parseInt(answer?.id, 10);
+            if (id >= 1 && id <= count && !results[id - 1]) results[id - 1] = answer;
+        }
+    }
+    return results;
+}
+
+async function classifySingle(item) {
+    const promptContext = buildPromptContext(item.snapshot, item.ranked);
+    debugLog('📊 Prompt context:', promptContext.length, 'chars (full tariff:', item.snapshot.context.length + ')');
+    const { response, usedModel } = await completeWithFallback(
+        buildClassificationPrompt(item.description, promptContext));
+    debugLog('📡 Using model:', usedModel);
+    return parseClassification(responseContent(response));
+}
+
+// Flush of the micro-batcher: one Groq call for the whole batch; products the
+// answer leaves out (or mangles) are classified on their own
+async function classifyBatch(items) {
+    if (items.length === 1) {
+        return [await classifySingle(items[0])];
+    }
+    const { response, usedModel } = await completeWithFallback(buildBatchPrompt(items));
+    debugLog(`📡 Using model: ${usedModel} (batch of ${items.length})`);
+    const answers = parseBatchClassification(responseContent(response), items.length);
+    return Promise.all(items.map((item, i) => {
+        if (answers[i]) return answers[i];
+        llmBatchMisses.inc();
+        return classifySingle(item).catch(error => error);
+    }));
+}
+
+const llmBatcher = LLM_BATCH_WINDOW_MS > 0
+    ? new MicroBatcher(classifyBatch, LLM_BATCH_WINDOW_MS, LLM_BATCH_MAX_ITEMS, size => llmBatchSize.observe({}, size))
+    : null;
+
 // Search HS Code - TRY LOCAL FIRST, then API if available
 app.post('/api/search-hs-code', async (req, res) => {
     const startTime = Date.now();
+    const endRequestTimer = requestDuration.startTimer();
+    res.locals.answeredBy = 'error';
+    res.on('finish', () => {
+        const answeredBy = res.locals.answeredBy;
+        endRequestTimer({ path: answeredBy });
+        requestCounter.inc({ path: answeredBy, status: res.statusCode });
+    });
     
+    // The tariff snapshot this request is answered from, even if a reload
+    // swaps in a new one while it waits on the cache or the LLM
+    const snapshot = tariff;
+
     try {
         const { description, isFollowUp } = req.body;
 
         // STEP 1: Validate input
         if (!description || typeof description !== 'string' || description.trim().length === 0) {
+            res.locals.answeredBy = 'invalid';
             return res.status(400).json({ 
                 error: 'Product description is required',
                 needsClarification: false,
@@ -263,7 +895,8 @@ app.post('/api/search-hs-code', async (req, res) => {
             });
         }
 
-        if (!tariffLoaded || !tariffContext) {
+        if (!snapshot.loaded || !snapshot.context) {
+            res.locals.answeredBy = 'unavailable';
             return res.status(503).json({ 
                 error: 'Service initializing. Please try again in a moment.',
                 needsClarification: false,
@@ -276,31 +909,76 @@ app.post('/api/search-hs-code', async (req, res) => {
         }
 
         const trimmedDescription = description.trim();
-        console.log('🔍 Processing:', trimmedDescription.substring(0, 100), isFollowUp ? '(Follow-up)' : '(Initial)');
+        debugLog('🔍 Processing:', trimmedDescription.substring(0, 100), isFollowUp ? '(Follow-up)' : '(Initial)');
+
+        // STEP 1b: Repeated queries are answered from the cache sidecar
+        const cached = isFollowUp ? null : await cacheGet(snapshot, trimmedDescription);
+        if (cached) {
+            debugLog(`♻️ Cache hit: ${cached.hsCode}`);
+            res.locals.answeredBy = 'cache';
+            return res.json(cached);
+        }
         // STEP 2: TRY LOCAL SEARCH FIRST (instant, no API calls)
-        console.log('🔎 Searching locally in extracted HS codes...');
-        const localResult = findHSCodeLocally(trimmedDescription);
+        debugLog('🔎 Searching locally in extracted HS codes...');
+        const endLocalTimer = localSearchDuration.startTimer();
+
+        let ranked = rankCodes(snapshot, trimmedDescription);
+
+        // STEP 2a: A stated weight/content picks the subheading whose range holds it
+        const quantityResult = findHSCodeByQuantity(snapshot, trimmedDescription, ranked);
+        if (quantityResult && quantityResult.confidence >= 70) {
+            endLocalTimer();
+            debugLog(`📏 Quantity match: ${quantityResult.hsCode}`);
+            const quantityResponse = { needsClarification: false, ...quantityResult };
+            if (!isFollowUp) cachePut(snapshot, trimmedDescription, quantityResponse);
+            res.locals.answeredBy = 'interval';
+            return res.json(quantityResponse);
+        }
+
+        let localResult = findHSCodeLocally(snapshot, trimmedDescription, ranked);
+        let corrected = false;
+
+        // STEP 2b: Typos and abbreviations ("choc powdr") are corrected against
+        // the tariff vocabulary and searched again before escalating to the LLM
+        if ((!localResult || localResult.confidence < 70) && snapshot.fuzzyMatcher) {
+            const correctedQuery = snapshot.fuzzyMatcher.correct(trimmedDescription);
+            if (correctedQuery !== (trimmedDescription.toLowerCase().match(/[a-z0-9]+/g) || []).join(' ')) {
+                const correctedRanked = rankCodes(snapshot, correctedQuery);
+                const correctedResult = findHSCodeLocally(snapshot, correctedQuery, correctedRanked);
+                if (correctedResult && (!localResult || correctedResult.confidence > localResult.confidence)) {
+                    debugLog(`🔤 Corrected query: "${correctedQuery}"`);
+                    ranked = correctedRanked;
+                    localResult = correctedResult;
+                    corrected = true;
+                }
+            }
+        }
+        endLocalTimer();
         
         if (localResult && localResult.confidence >= 70) {
-            console.log(`✅ Local match found: ${localResult.hsCode} (confidence: ${localResult.confidence}%)`);
+            debugLog(`✅ Local match found: ${localResult.hsCode} (confidence: ${localResult.confidence}%)`);
             const processingTime = ((Date.now() - startTime) / 1000).toFixed(2);
-            console.log(`⚡ Instant result in ${processingTime}s (no API needed)`);
+            debugLog(`⚡ Instant result in ${processingTime}s (no API needed)`);
             
-            return res.json({
+            const localResponse = {
                 needsClarification: false,
                 hsCode: localResult.hsCode,
                 description: localResult.description,
                 confidence: localResult.confidence,
                 reasons: localResult.reasons,
                 relatedCodes: localResult.relatedCodes
-            });
+            };
+            if (!isFollowUp) cachePut(snapshot, trimmedDescription, localResponse);
+            res.locals.answeredBy = corrected ? 'fuzzy' : 'local';
+            return res.json(localResponse);
         }
 
         // STEP 3: If local search not confident enough AND Groq available, try API
         if (!groq) {
+            res.locals.answeredBy = 'no_llm';
             // No Groq, return local result with lower confidence or ask for clarification
             if (localResult) {
-                console.log('⚠️ Low confidence local match, Groq not available');
+                debugLog('⚠️ Low confidence local match, Groq not available');
                 return res.json({
                     needsClarification: true,
                     clarificationQuestions: [
@@ -327,110 +1005,25 @@ app.post('/api/search-hs-code', async (req, res) => {
             });
         }
 
-        console.log('🚀 Confidence low, trying Groq API for detailed analysis...');
+        debugLog('🚀 Confidence low, trying Groq API for detailed analysis...');
         
-        const prompt = `You are an expert customs classifier with 50+ years of experience.
-
-PRODUCT: "${trimmedDescription}"
-
-HS CODES TO SEARCH FROM:
-${tariffContext}
-
-TASK (STRICT RULES):
-1. Find the BEST matching 8-digit HS code
-2. Provide 3 reasons (reference the tariff code descriptions)
-3. List 2 related codes
-4. Rate confidence (0-100)
-
-CONFIDENCE DECISION:
-- 75-100: Clear product → Return HS code
-- Below 75: Need more info → Return clarification questions
-
-FORMAT (ONLY this JSON, nothing else):
-{
-  "hsCode": "12345678" or null,
-  "description": "product name" or null,
-  "confidence": 85,
-  "reasons": ["reason1", "reason2", "reason3"] or [],
-  "relatedCodes": [{"code": "12345678", "description": "name"}] or [],
-  "clarificationQuestions": null or ["question1?", "question2?"]
-}`;
-
-        let response;
-        let usedModel = SELECTED_MODEL;
-        
-        try {
-            response = await groq.chat.completions.create({
-                messages: [{ role: 'user', content: prompt }],
-                model: SELECTED_MODEL,
-                temperature: 0.2,
-                max_tokens: 1200,
+        // Identical queries already waiting on Groq share that call; distinct
+        // ones arriving within LLM_BATCH_WINDOW_MS share one batched prompt
+        const flightKey = (trimmedDescription.toLowerCase().match(/[a-z0-9]+/g) || []).join(' ');
+        const llmItem = { description: trimmedDescription, ranked, snapshot };
+        const parsedResponse = await llmFlights.run(flightKey,
+            () => llmBatcher ? llmBatcher.submit(llmItem) : classifySingle(llmItem),
+            () => {
+                llmCoalesced.inc();
+                debugLog('🔗 Joined in-flight LLM call for:', flightKey);
             });
-        } catch (apiError) {
-            console.error('❌ Primary model failed:', SELECTED_MODEL);
-            console.error('❌ Error message:', apiError.message);
-            console.error('❌ Error status:', apiError.status);
-            if (apiError.response?.data) {
-                console.error('❌ Groq response:', JSON.stringify(apiError.response.data));
-            }
-            
-            // Try backup models
-            for (let backupModel of BACKUP_MODELS) {
-                try {
-                    console.log('🔄 Trying backup model:', backupModel);
-                    response = await groq.chat.completions.create({
-                        messages: [{ role: 'user', content: prompt }],
-                        model: backupModel,
-                        temperature: 0.2,
-                        max_tokens: 1200,
-                    });
-                    usedModel = backupModel;
-                    console.log('✅ Backup model worked:', backupModel);
-                    break;
-                } catch (backupError) {
-                    console.warn('⚠️ Backup model failed:', backupModel);
-                    continue;
-                }
-            }
-            
-            if (!response) {
-                throw new Error('All Groq models failed: ' + apiError.message);
-            }
-        }
-
-        console.log('📡 Using model:', usedModel);
-        
-        if (!responseText) {
-            console.error('❌ Empty response from Groq');
-            throw new Error('Empty response from AI');
-        }
-
-        console.log('📝 Raw response (first 300 chars):', responseText.substring(0, 300));
-
-        // Extract JSON from response - be more flexible
-        let jsonMatch = responseText.match(/\{[\s\S]*\}/);
-        
-        if (!jsonMatch) {
-            // Try to find JSON between other text
-            console.error('❌ No JSON found in response. Full response:', responseText);
-            throw new Error('AI response format invalid');
-        }
-
-        let parsedResponse;
-        try {
-            parsedResponse = JSON.parse(jsonMatch[0]);
-            console.log('✅ Successfully parsed JSON');
-        } catch (parseError) {
-            console.error('❌ JSON parse failed:', parseError.message);
-            console.error('❌ Attempted to parse:', jsonMatch[0].substring(0, 200));
-            throw new Error('Could not parse AI response: ' + parseError.message);
-        }
 
-        console.log('📊 Parsed response confidence:', parsedResponse.confidence);
+        debugLog('📊 Parsed response confidence:', parsedResponse.confidence);
 
         // If AI is asking clarification questions (confidence < 70)
         if (parsedResponse.clarificationQuestions && Array.isArray(parsedResponse.clarificationQuestions) && parsedResponse.clarificationQuestions.length > 0) {
-            console.log('⚠️ AI needs clarifications (confidence:', parsedResponse.confidence + '%)');
+            debugLog('⚠️ AI needs clarifications (confidence:', parsedResponse.confidence + '%)');
+            res.locals.answeredBy = 'llm_clarification';
             return res.json({
                 needsClarification: true,
                 message: `I need specific details to find the perfect HS code`,
@@ -450,7 +1043,7 @@ FORMAT (ONLY this JSON, nothing else):
         }
 
         const processingTime = ((Date.now() - startTime) / 1000).toFixed(2);
-        console.log(`✅ Found HS Code: ${parsedResponse.hsCode} (confidence: ${parsedResponse.confidence}%, time: ${processingTime}s)`);
+        debugLog(`✅ Found HS Code: ${parsedResponse.hsCode} (confidence: ${parsedResponse.confidence}%, time: ${processingTime}s)`);
 
         // Build safe response
         const finalResponse = {
@@ -462,7 +1055,9 @@ FORMAT (ONLY this JSON, nothing else):
             relatedCodes: Array.isArray(parsedResponse.relatedCodes) ? parsedResponse.relatedCodes.slice(0, 2) : []
         };
 
-        console.log('✅ Sending response - HS Code:', finalResponse.hsCode);
+        debugLog('✅ Sending response - HS Code:', finalResponse.hsCode);
+        if (!isFollowUp) cachePut(snapshot, trimmedDescription, finalResponse);
+        res.locals.answeredBy = 'llm';
         res.json(finalResponse);
 
     } catch (error) {
@@ -476,6 +1071,18 @@ FORMAT (ONLY this JSON, nothing else):
             console.error('❌ API Response Body:', JSON.stringify(error.response.data));
         }
         
+        if (error.message?.startsWith('All Groq models failed')) {
+            return res.status(503).json({
+                error: 'AI service temporarily unavailable. Please try again shortly.',
+                needsClarification: false,
+                hsCode: null,
+                description: null,
+                confidence: 0,
+                reasons: [],
+                relatedCodes: []
+            });
+        }
+
         if (error.status === 401) {
             return res.status(401).json({
                 error: 'Invalid API key. Please check GROQ_API_KEY environment variable.',
@@ -535,71 +1142,20 @@ FORMAT (ONLY this JSON, nothing else):
     }
 });
 
-// Debug endpoint: Check PDF and extracted codes
-app.get('/api/health', (req, res) => {
-    const health = {
-        status: 'ok',
-        timestamp: new Date().toISOString(),
-        environment: {
-            nodeVersion: process.version,
-            apiKey: process.env.GROQ_API_KEY ? 'SET' : 'NOT SET',
-            pdfLoaded: tariffLoaded,
-            hsCodesExtracted: hsCodeList.length,
-            contextLength: tariffContext?.length || 0,
-            selectedModel: SELECTED_MODEL,
-            backupModels: BACKUP_MODELS
-        }
-    };
-    res.json(health);
-});
-
-// Debug: Show sample of extracted HS codes
-app.get('/api/hs-codes', (req, res) => {
-    const sampleSize = 20;
-    const sample = hsCodeList.slice(0, sampleSize);
-    const allCodes = hsCodeList.map(item => item.code);
-    
-    res.json({
-        totalExtracted: hsCodeList.length,
-        sampleSize: sample.length,
-        sample: sample,
-        allCodes: allCodes,
-        contextPreview: tariffContext?.substring(0, 500) + '...'
-    });
-});
-
-// Debug: List available Groq models
-app.get('/api/groq-models', async (req, res) => {
-    try {
-        const models = await groq.models.list();
-        const modelList = models.data.map(m => ({
-            id: m.id,
-            created: m.created,
-            owned_by: m.owned_by
-        }));
-        
-        res.json({
-            availableModels: modelList,
-            totalModels: modelList.length,
-            selectedPrimary: SELECTED_MODEL,
-            backups: BACKUP_MODELS,
-            message: 'Use any of these model IDs in the application'
-        });
-    } catch (error) {
-        console.error('❌ Failed to list Groq models:', error.message);
-        res.status(500).json({
-            error: 'Could not fetch model list: ' + error.message,
-            message: 'Check if GROQ_API_KEY is valid'
-        });
-    }
+// Prometheus scrape endpoint
+app.get('/metrics', (req, res) => {
+    res.set('Content-Type', PROMETHEUS_CONTENT_TYPE);
+    res.send(metrics.render());
 });
 
-// Start server and load PDF
+// Start server, load the tariff and watch it for changes
 app.listen(PORT, async () => {
-    await loadPDF();
+    await reloadTariff('startup');
+    watchTariffFiles();
     console.log(`\n✓ Server running on port ${PORT}`);
     console.log(`✓ Using model: ${SELECTED_MODEL}`);
     console.log(`✓ Frontend: http://localhost:${PORT}/`);
     console.log(`✓ Health: http://localhost:${PORT}/api/health`);
-    console.log(`✓ API: POST http://localhost:${PORT}/api/search-hs-code\n`);
+    console.log(`✓ API: POST http://localhost:${PORT}/api/search-hs-code`);
+    console.log(`✓ Metrics: http://localhost:${PORT}/metrics\n`);
 });
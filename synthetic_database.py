@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Synthetic full-tariff databases for scaling benchmarks
+Grows the real seed catalogue (hs_codes_data.tsv) into 1k/10k/100k-code databases with
+the same shape: 8-digit codes grouped under chapters and headings, a head
+noun per heading, qualifier words drawn with a Zipf skew from a
+vocabulary that grows with size, and 1-4 lowercase keywords per line.
+Written with generate_hs_database.create_database, so every size gets the
+JSON, binary and search index artifacts
+"""
+
+import argparse
+import itertools
+import random
+from collections import Counter
+from pathlib import Path
+from extraction_core import KEYWORD_STOPWORDS, validate_codes
+from generate_hs_database import create_database, load_hs_codes
+
+SYLLABLES = ["ba", "ca", "da", "fe", "ga", "ki", "la", "lo", "ma", "mi", "na", "no", "pa", "pi",
+             "ra", "ri", "sa", "se", "ta", "to", "va", "ve", "ze", "zo", "ran", "ton", "lin", "mel"]
+UNITS = ["kg", "g", "l", "ml", "cm", "%"]
+CHAPTERS = [chapter for chapter in range(1, 98) if chapter != 77]
+
+def _pseudo_word(rng, syllables=(2, 4)):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(*syllables)))
+
+def _unique_words(rng, count, taken):
+    words = []
+    while len(words) < count:
+        word = _pseudo_word(rng)
+        if word not in taken:
+            taken.add(word)
+            words.append(word)
+    return words
+
+class CatalogueModel:
+    """Word and length statistics of a seed catalogue"""
+
+    def __init__(self, codes):
+        self.heads = []
+        qualifiers = Counter()
+        categories = Counter()
+        for item in codes:
+            words = item["description"].replace(',', ' ').split()
+            if words[0].lower() not in self.heads:
+                self.heads.append(words[0].lower())
+            qualifiers.update(w.lower() for w in words[1:])
+            in_description = {w.lower() for w in words}
+            categories.update(k for k in item.get("keywords", []) if k not in in_description)
+        self.qualifiers = [word for word, _ in qualifiers.most_common()]
+        self.categories = [word for word, _ in categories.most_common()]
+        self.lengths = [len(item["description"].split()) for item in codes]
+
+def _chapter_sizes(count, rng):
+    """Codes per chapter, unevenly spread like the real tariff"""
+    weights = [rng.uniform(0.3, 1.7) for _ in CHAPTERS]
+    total = sum(weights)
+    sizes = [int(count * weight / total) for weight in weights]
+    for i in rng.sample(range(len(CHAPTERS)), count - sum(sizes)):
+        sizes[i] += 1
+    return sizes
+
+def synthesize_codes(count, seed=0, seed_codes=None):
+    """count sorted, unique synthetic records modelled on seed_codes (default: the seed catalogue)"""
+    rng = random.Random(seed)
+    model = CatalogueModel(seed_codes if seed_codes is not None else load_hs_codes())
+    sizes = _chapter_sizes(count, rng)
+    headings_per_chapter = [min(99, max(1, round(size / 10))) if size else 0 for size in sizes]
+    taken = set(model.heads) | set(model.qualifiers)
+
+    # Vocabulary grows sublinearly with catalogue size (Heaps' law)
+    qualifiers = model.qualifiers + _unique_words(rng, int(3 * count ** 0.75), taken)
+    # Zipf weights: the seed's own words keep the top ranks, invented ones form the tail
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(qualifiers))))
+    heads = model.heads + _unique_words(rng, max(0, sum(headings_per_chapter) - len(model.heads)), taken)
+    rng.shuffle(heads)
+
+    codes = []
+    for chapter, size, headings in zip(CHAPTERS, sizes, headings_per_chapter):
+        if not size:
+            continue
+        category = rng.choice(model.categories)
+        for heading in range(1, headings + 1):
+            lines = size // headings + (1 if heading <= size % headings else 0)
+            head = heads.pop() if heads else _pseudo_word(rng)
+            for line in range(lines):
+                code = f"{chapter:02d}{heading:02d}{line // 9 + 1:02d}{(line % 9 + 1) * 10:02d}"
+                words = [head.capitalize()] + rng.choices(qualifiers, cum_weights=cum_weights,
+                                                          k=rng.choice(model.lengths) - 1)
+                if rng.random() < 0.1:
+                    words += ["not", "exceeding", f"{rng.choice([1, 2, 5, 10, 25, 50, 120])}"
+                              f"{rng.choice(UNITS)}"]
+                description = ' '.join(words)
+                keywords = [head] + [w for w in dict.fromkeys(words[1:])
+                                     if len(w) > 3 and w not in KEYWORD_STOPWORDS][:rng.randint(0, 2)]
+                if rng.random() < 0.5:
+                    keywords.append(category)
+                codes.append({"code": code, "description": description, "keywords": keywords})
+    return codes
+
+def database_path_for(output_dir, count):
+    return Path(output_dir) / f"hs-codes-{count}-database.json"
+
+def write_synthetic_database(output_dir, count, seed=0):
+    """Write a synthetic database (JSON, binary and index) of count codes; returns its path"""
+    codes = synthesize_codes(count, seed)
+    problems = validate_codes(codes)
+    if problems:
+        raise ValueError(f"invalid synthetic catalogue: {problems[0]}")
+    output_path = database_path_for(output_dir, count)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    create_database(str(output_path), codes, {
+        "source": f"Synthetic catalogue (seed {seed}) modelled on the seed catalogue",
+        "chapters_covered": f"{len({c['code'][:2] for c in codes})} synthetic chapters",
+        "production_ready": False
+    })
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic HS code databases")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated code counts")
+    parser.add_argument("--output-dir", default="synthetic")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for count in (int(size) for size in args.sizes.split(',')):
+        path = write_synthetic_database(args.output_dir, count, args.seed)
+        print(f"✅ {count:>7,} codes: {path}")
+
+if __name__ == "__main__":
+    main()
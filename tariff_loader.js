@@ -0,0 +1,135 @@
+// Reads the tariff for server.js off the main thread: the codes of the
+// prebuilt search artifact (hs-codes-index.json) when it matches the tariff
+// PDF, else the codes parsed from the PDF itself. Codes and the artifact
+// sections the server uses are handed over as separate JSON texts, which
+// server.js parses one at a time between requests and builds its snapshot from
+import fs from 'fs';
+import crypto from 'crypto';
+import { Worker, isMainThread, parentPort, workerData } from 'worker_threads';
+
+function sha256(buffer) {
+    return crypto.createHash('sha256').update(buffer).digest('hex');
+}
+
+// { artifact, sha256, error } of hs-codes-index.json; artifact is null if it is missing or unreadable
+export function readSearchArtifact(indexPath) {
+    if (!fs.existsSync(indexPath)) return { artifact: null, sha256: null, error: null };
+    try {
+        const buffer = fs.readFileSync(indexPath);
+        return { artifact: JSON.parse(buffer.toString('utf8')), sha256: sha256(buffer), error: null };
+    } catch (error) {
+        console.warn('⚠️ Could not read search artifact:', error.message);
+        return { artifact: null, sha256: null, error: error.message };
+    }
+}
+
+// Why the prebuilt artifact cannot replace parsing the PDF, or null if it can
+export function artifactStaleReason(artifact, artifactVersion, pdfSha256) {
+    if (!artifact) return 'no prebuilt search artifact';
+    const metadata = artifact.metadata || {};
+    if (metadata.artifact_version !== artifactVersion) {
+        return `artifact version ${metadata.artifact_version} is not ${artifactVersion}`;
+    }
+    if (!Array.isArray(artifact.codes) || artifact.codes.length === 0) {
+        return 'artifact has no code records';
+    }
+    if (pdfSha256) {
+        if (!metadata.pdf_sha256) return 'artifact was not built from the tariff PDF';
+        if (metadata.pdf_sha256 !== pdfSha256) return 'tariff PDF changed since the artifact was built';
+    }
+    return null;
+}
+
+// {code, description} records of the PDF text: an 8-digit code starts a
+// record, following lines continue its description
+export function parseTariffText(text) {
+    const codes = [];
+    let currentCode = null;
+    let currentDescription = '';
+
+    for (const line of text.split('\n')) {
+        const trimmed = line.trim();
+        const codeMatch = trimmed.match(/^(\d{8})[\s\-–](.+)/);
+
+        if (codeMatch) {
+            if (currentCode && currentDescription.trim()) {
+                codes.push({ code: currentCode, description: currentDescription.trim() });
+            }
+            currentCode = codeMatch[1];
+            currentDescription = codeMatch[2].trim();
+        } else if (currentCode && trimmed && !trimmed.match(/^\d+$/) && trimmed.length > 2) {
+            if (currentDescription.length < 500) { // Limit description length
+                currentDescription += ' ' + trimmed;
+            }
+        }
+    }
+
+    if (currentCode && currentDescription.trim()) {
+        codes.push({ code: currentCode, description: currentDescription.trim() });
+    }
+    return codes;
+}
+
+// Artifact sections server.js builds its indexes from (not e.g. the hierarchy)
+export const SERVED_SECTIONS = ['inverted_index', 'trigram_index', 'phrase_index', 'interval_index'];
+
+// { codes, ...served sections } of an artifact (null for none) as JSON texts
+function sectionTexts(codes, artifact) {
+    const sections = { codes: JSON.stringify(codes) };
+    for (const name of SERVED_SECTIONS) {
+        if (artifact && artifact[name]) sections[name] = JSON.stringify(artifact[name]);
+    }
+    return sections;
+}
+
+// { source, version, sections, rawText }: version names the file content it
+// came from, so an unchanged tariff is recognised on reload
+export async function loadTariffData({ indexPath, pdfPath, artifactVersion }) {
+    const { artifact, sha256: artifactSha256, error } = readSearchArtifact(indexPath);
+    const pdfSha256 = fs.existsSync(pdfPath) ? sha256(fs.readFileSync(pdfPath)) : null;
+    const staleReason = error ? `unreadable search artifact (${error})`
+        : artifactStaleReason(artifact, artifactVersion, pdfSha256);
+
+    if (!staleReason) {
+        return {
+            source: 'artifact',
+            version: `artifact:${artifactSha256.slice(0, 12)}`,
+            sections: sectionTexts(artifact.codes.map(({ code, description }) => ({ code, description })), artifact),
+            rawText: null
+        };
+    }
+    if (!pdfSha256) {
+        throw new Error(`${staleReason} and no tariff PDF at ${pdfPath}`);
+    }
+
+    console.log(`ℹ️ Parsing the PDF (${staleReason})`);
+    const { default: pdfParse } = await import('pdf-parse');
+    const data = await pdfParse(fs.readFileSync(pdfPath));
+    console.log('✅ PDF parsed, pages:', data.numpages);
+    const codes = parseTariffText(data.text);
+    console.log('🔍 Found', codes.length, 'HS codes');
+    return {
+        source: 'pdf',
+        version: `pdf:${pdfSha256.slice(0, 12)}`,
+        // A stale artifact's index is still used if it covers every parsed code
+        sections: sectionTexts(codes, artifact),
+        // Without structured codes the raw text is the LLM context
+        rawText: codes.length ? null : data.text.substring(0, 50000)
+    };
+}
+
+// loadTariffData() in a worker thread, so reading and parsing never block requests
+export function loadTariffInWorker(options) {
+    return new Promise((resolve, reject) => {
+        const worker = new Worker(new URL(import.meta.url), { workerData: { tariffLoader: options } });
+        worker.once('message', message => message.error ? reject(new Error(message.error)) : resolve(message.data));
+        worker.once('error', reject);
+        worker.once('exit', code => reject(new Error(`tariff loader exited with code ${code}`)));
+    });
+}
+
+if (!isMainThread && workerData?.tariffLoader) {
+    loadTariffData(workerData.tariffLoader).then(
+        data => parentPort.postMessage({ data }),
+        error => parentPort.postMessage({ error: error.message }));
+}
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Offline vector search over the HS code catalogue
+Descriptions and keywords are embedded with hashed features: each token
+contributes its word feature plus its character 3- and 4-grams (so
+"tomatoes" lands near "tomato" and "choclate" near "chocolate"), weighted
+by the token's IDF, and adjacent words add a bigram feature. Vectors are
+L2-normalized rows of one float32 NumPy matrix, grouped into IVF lists by
+spherical k-means; a query scores the list centroids and only scans the
+n_probe closest lists, with an exact brute-force scan for comparison
+"""
+
+import argparse
+import json
+import math
+import time
+import zlib
+import numpy as np
+from extraction_core import tokenize
+
+DEFAULT_DIM = 256
+DEFAULT_N_PROBE = 16
+# About 3 * sqrt(n) lists: finer lists raised recall more than extra k-means work did
+LISTS_PER_SQRT = 3
+CHAR_NGRAMS = (3, 4)
+BIGRAM_WEIGHT = 0.5
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 20000
+
+def _hashed(feature, dim):
+    """(bucket, sign) of a feature; crc32 is stable across processes, unlike hash()"""
+    h = zlib.crc32(feature.encode('utf-8'))
+    return h & (dim - 1), 1.0 if h & 0x80000000 else -1.0
+
+def document_text(item):
+    return " ".join([item["description"], *item.get("keywords", [])])
+
+class HashedVectorizer:
+    """Token-IDF weighted hashed word/char n-gram vectors of a fixed dimension"""
+
+    def __init__(self, dim=DEFAULT_DIM):
+        if dim & (dim - 1):
+            raise ValueError(f"dim must be a power of two, got {dim}")
+        self.dim = dim
+        self.idf = {}
+        self.default_idf = 1.0
+        self._token_features = {}
+
+    def fit(self, texts):
+        """Token IDF over the documents; unseen tokens get the mean weight"""
+        df = {}
+        n_docs = 0
+        for text in texts:
+            n_docs += 1
+            for token in set(tokenize(text)):
+                df[token] = df.get(token, 0) + 1
+        self.idf = {token: math.log(1 + n_docs / count) for token, count in df.items()}
+        self.default_idf = sum(self.idf.values()) / len(self.idf) if self.idf else 1.0
+        self._token_features = {}
+        return self
+
+    def token_features(self, token):
+        """(buckets, values) of one token: its word feature and char n-grams, unit norm.
+
+        A token unseen at fit time gets no word feature, which could only
+        collide with unrelated words; its n-grams still match spelling variants.
+        """
+        cached = self._token_features.get(token)
+        if cached is None:
+            padded = f" {token} "
+            grams = [padded[i:i + n] for n in CHAR_NGRAMS for i in range(len(padded) - n + 1)]
+            features = [(f"c:{gram}", 1.0 / math.sqrt(len(grams))) for gram in grams]
+            if token in self.idf or not self.idf:
+                features.append((f"w:{token}", 1.0))
+            vector = {}
+            for feature, weight in features:
+                bucket, sign = _hashed(feature, self.dim)
+                vector[bucket] = vector.get(bucket, 0.0) + sign * weight
+            buckets = np.fromiter(vector.keys(), dtype=np.int64, count=len(vector))
+            values = np.fromiter(vector.values(), dtype=np.float32, count=len(vector))
+            norm = float(np.linalg.norm(values))
+            cached = (buckets, values / norm if norm else values)
+            self._token_features[token] = cached
+        return cached
+
+    def _sparse(self, text):
+        """(buckets, values) of a text's unnormalized vector, duplicates allowed"""
+        tokens = tokenize(text)
+        buckets = []
+        values = []
+        for token in tokens:
+            token_buckets, token_values = self.token_features(token)
+            buckets.append(token_buckets)
+            values.append(token_values * self.idf.get(token, self.default_idf))
+        for left, right in zip(tokens, tokens[1:]):
+            bucket, sign = _hashed(f"b:{left} {right}", self.dim)
+            weight = BIGRAM_WEIGHT * min(self.idf.get(left, self.default_idf),
+                                         self.idf.get(right, self.default_idf))
+            buckets.append(np.array([bucket], dtype=np.int64))
+            values.append(np.array([sign * weight], dtype=np.float32))
+        if not buckets:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return np.concatenate(buckets), np.concatenate(values)
+
+    def transform_one(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        buckets, values = self._sparse(text)
+        np.add.at(vector, buckets, values)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def transform(self, texts, chunk_size=8192):
+        """(len(texts), dim) float32 matrix of L2-normalized rows"""
+        texts = list(texts)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), chunk_size):
+            chunk = texts[start:start + chunk_size]
+            flat_buckets = []
+            flat_values = []
+            for row, text in enumerate(chunk):
+                buckets, values = self._sparse(text)
+                flat_buckets.append(buckets + row * self.dim)
+                flat_values.append(values)
+            block = np.bincount(np.concatenate(flat_buckets), weights=np.concatenate(flat_values),
+                                minlength=len(chunk) * self.dim).reshape(len(chunk), self.dim)
+            matrix[start:start + len(chunk)] = block
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+def spherical_kmeans(vectors, n_lists, iterations=KMEANS_ITERATIONS, sample=KMEANS_SAMPLE, seed=0):
+    """Unit-norm centroids of a cosine k-means over (a sample of) the vectors"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample:
+        vectors = vectors[rng.choice(len(vectors), sample, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # An empty list is re-seeded with a random vector instead of being dropped
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+class VectorIndex:
+    """Hashed-vector index over the "codes" array of hs-codes-database.json.
+
+    Rows of the matrix are stored grouped by IVF list, so list l is the
+    contiguous slice list_ptr[l]:list_ptr[l + 1]; row_codes maps a row back
+    to its position in codes.
+    """
+
+    def __init__(self, codes, dim=DEFAULT_DIM, n_lists=None, seed=0):
+        self.codes = codes
+        texts = [document_text(item) for item in codes]
+        self.vectorizer = HashedVectorizer(dim).fit(texts)
+        vectors = self.vectorizer.transform(texts)
+
+        n_lists = n_lists or max(1, int(LISTS_PER_SQRT * math.sqrt(len(codes))))
+        n_lists = min(n_lists, len(codes)) if len(codes) else 1
+        if len(codes):
+            self.centroids = spherical_kmeans(vectors, n_lists, seed=seed)
+            assignment = np.argmax(vectors @ self.centroids.T, axis=1)
+        else:
+            self.centroids = np.zeros((1, dim), dtype=np.float32)
+            assignment = np.zeros(0, dtype=np.int64)
+        order = np.argsort(assignment, kind="stable")
+        self.matrix = np.ascontiguousarray(vectors[order])
+        self.row_codes = order
+        self.list_ptr = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=len(self.centroids)))])
+
+    @classmethod
+    def load(cls, database_path, **params):
+        with open(database_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["codes"], **params)
+
+    def _top(self, scores, rows, k):
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(self.row_codes[rows[i]] if rows is not None else self.row_codes[i]), float(scores[i]))
+                for i in top if scores[i] > 0]
+
+    def exact(self, query, k=10):
+        """[(code id, cosine)] of the k nearest codes by a full scan"""
+        return self._top(self.matrix @ self.vectorizer.transform_one(query), None, k)
+
+    def approximate(self, query, k=10, n_probe=DEFAULT_N_PROBE):
+        """[(code id, cosine)] of the k nearest codes within the n_probe closest lists"""
+        vector = self.vectorizer.transform_one(query)
+        n_probe = max(1, min(n_probe, len(self.centroids)))
+        lists = np.argpartition(-(self.centroids @ vector), n_probe - 1)[:n_probe]
+        ptr = self.list_ptr
+        # Each list is a contiguous slice, scored in place instead of gathered into a copy
+        scores = np.concatenate([self.matrix[ptr[l]:ptr[l + 1]] @ vector for l in lists])
+        rows = np.concatenate([np.arange(ptr[l], ptr[l + 1]) for l in lists])
+        return self._top(scores, rows, k)
+
+    def search(self, query, k=10, n_probe=DEFAULT_N_PROBE):
+        """Top-k codes for a query: [{"code", "description", "score"}]"""
+        return [{
+            "code": self.codes[code_id]["code"],
+            "description": self.codes[code_id]["description"],
+            "score": round(score, 4)
+        } for code_id, score in self.approximate(query, k, n_probe)]
+
+    def search_batch(self, queries, k=10, n_probe=DEFAULT_N_PROBE):
+        """search() for many queries, one result list per query"""
+        return [self.search(query, k, n_probe) for query in queries]
+
+def recall_at_k(index, queries, k=10, n_probe=DEFAULT_N_PROBE):
+    """Mean share of the exact top-k that the approximate search also returns"""
+    recalls = []
+    for query in queries:
+        exact = {code_id for code_id, _ in index.exact(query, k)}
+        if exact:
+            found = {code_id for code_id, _ in index.approximate(query, k, n_probe)}
+            recalls.append(len(exact & found) / len(exact))
+    return sum(recalls) / len(recalls) if recalls else 1.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the HS code database with hashed n-gram vectors")
+    parser.add_argument("query", help="product description")
+    parser.add_argument("-k", type=int, default=5, help="number of results (default: 5)")
+    parser.add_argument("--n-probe", type=int, default=DEFAULT_N_PROBE, help="IVF lists scanned per query")
+    parser.add_argument("--database", default="hs-codes-database.json", help="path to the JSON database")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = VectorIndex.load(args.database)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    results = index.search(args.query, args.k, args.n_probe)
+    query_ms = (time.perf_counter() - start) * 1000
+
+    print(f"📊 {len(index.codes)} codes embedded in {load_ms:.1f} ms "
+          f"({len(index.centroids)} lists), query took {query_ms:.3f} ms")
+    for result in results:
+        print(f"  {result['code']}  {result['score']:>7.3f}  {result['description'][:70]}")
+
+if __name__ == "__main__":
+    main()